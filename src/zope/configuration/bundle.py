@@ -0,0 +1,233 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Single-file bundles of configuration files
+
+A bundle stores the configuration files read by a configuration, and
+the answers to its ``files`` patterns, in one indexed file. Loading
+the configuration from a bundle reads no other file, which helps
+applications deployed as zip applications or wheels, whose
+configuration is otherwise opened file by file from many package
+directories.
+
+Create the bundle when building the application, with
+:func:`saveBundle`::
+
+    import myapp
+    from zope.configuration.bundle import saveBundle
+
+    saveBundle('myapp.bundle', 'configure.zcml', package=myapp)
+
+and load the configuration from it with
+:func:`zope.configuration.xmlconfig.file`::
+
+    file('configure.zcml', package=myapp, bundle='myapp.bundle')
+
+Files are stored by their path relative to the :data:`sys.path` entry
+they are found in, so the bundle keeps working when the packages are
+installed in another location. Files that aren't in a :data:`sys.path`
+entry are stored by their absolute path. Directive infos keep the
+paths computed by the configuration being loaded, and files that
+aren't in the bundle are read from disk.
+
+.. caution::
+   A bundle contains the files that were read when it was saved. Files
+   included by directives whose ``zcml:condition`` was false at that
+   time aren't in the bundle.
+
+.. versionadded:: 6.1
+"""
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+from zope.configuration.config import ConfigurationMachine
+from zope.configuration.exceptions import ConfigurationError
+from zope.configuration.fileaccess import FileAccess
+from zope.configuration.xmlconfig import include
+from zope.configuration.xmlconfig import registerCommonDirectives
+
+
+__all__ = [
+    'Bundle',
+    'saveBundle',
+]
+
+MAGIC = b'ZCMLBNDL'
+
+# Bump this whenever the format of stored bundles changes.
+FORMAT = 1
+
+# The magic, the format and the size of the index
+_HEADER = struct.Struct('<8sII')
+
+
+def _roots():
+    # The directories paths are stored relative to, longest first.
+    roots = {os.path.abspath(os.path.normpath(entry))
+             for entry in sys.path if isinstance(entry, str) and entry}
+    return sorted(roots, key=len, reverse=True)
+
+
+def _keys(path, roots):
+    # Yield the (root, key) pairs *path* may be stored under.
+    for root in roots:
+        if path.startswith(root + os.sep):
+            yield root, path[len(root) + 1:].replace(os.sep, '/')
+    yield None, path
+
+
+def _key(path, roots):
+    return next(_keys(path, roots))[1]
+
+
+def _path(root, key):
+    if root is None:
+        return key
+    return os.path.join(root, *key.split('/'))
+
+
+class _RecordingFileAccess(FileAccess):
+    # Remember the files opened and the patterns matched.
+
+    def __init__(self):
+        self.files = {}
+        self.globs = {}
+
+    def glob(self, pattern):
+        paths = super().glob(pattern)
+        self.globs[pattern] = paths
+        return paths
+
+    def open(self, filename):
+        f = super().open(filename)
+        if f.name not in self.files:
+            with open(f.name, 'rb') as data:
+                self.files[f.name] = data.read()
+        return f
+
+
+def saveBundle(path, name='configure.zcml', package=None, context=None):
+    """
+    Write the files read by including *name* from *package* to the
+    bundle *path*.
+
+    The files are included into *context*, by default a new
+    configuration machine with the common directives, without
+    executing the actions. The context is returned.
+    """
+    if context is None:
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        context.package = package
+
+    recorder = _RecordingFileAccess()
+    file_access = context.file_access
+    context.file_access = recorder
+    try:
+        include(context, name, package)
+    finally:
+        context.file_access = file_access
+
+    roots = _roots()
+    files = {}
+    data = io.BytesIO()
+    for filename, content in sorted(recorder.files.items()):
+        files[_key(filename, roots)] = [data.tell(), len(content)]
+        data.write(content)
+    globs = {}
+    for pattern, matches in recorder.globs.items():
+        root, key = next(_keys(pattern, roots))
+        # The matches are in the directory of the pattern, so they are
+        # stored relative to the same root.
+        within = [root] if root is not None else []
+        globs[key] = [_key(match, within) for match in matches]
+    index = json.dumps({'files': files, 'globs': globs}).encode('utf-8')
+
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT, len(index)))
+        f.write(index)
+        f.write(data.getvalue())
+    os.replace(tmp, path)
+    return context
+
+
+class Bundle(FileAccess):
+    """
+    Serve configuration files from the bundle at *path*.
+
+    Use an instance as the ``file_access`` of a configuration machine.
+    The bundle is memory-mapped until it is closed.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # An empty file
+                raise ConfigurationError("Not a configuration bundle", path)
+        try:
+            magic, format, size = _HEADER.unpack_from(self._map)
+            if magic != MAGIC or format != FORMAT:
+                raise ValueError(magic, format)
+            start = _HEADER.size
+            index = json.loads(self._map[start:start + size].decode('utf-8'))
+        except (struct.error, ValueError):
+            self._map.close()
+            raise ConfigurationError("Not a configuration bundle", path)
+        self._offset = start + size
+        self._files = index['files']
+        self._globs = index['globs']
+        self._roots = _roots()
+
+    def glob(self, pattern):
+        for root, key in _keys(pattern, self._roots):
+            matches = self._globs.get(key)
+            if matches is not None:
+                return [_path(root, match) for match in matches]
+        return super().glob(pattern)
+
+    def _read(self, filename):
+        for _, key in _keys(filename, self._roots):
+            entry = self._files.get(key)
+            if entry is not None:
+                start = self._offset + entry[0]
+                f = io.BytesIO(self._map[start:start + entry[1]])
+                f.name = filename
+                return f
+        return None
+
+    def open(self, filename):
+        f = self._read(filename)
+        if f is None:
+            f = self._read(filename + '.in')
+        if f is None:
+            return super().open(filename)
+        return f
+
+    def close(self):
+        """
+        Unmap the bundle.
+        """
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
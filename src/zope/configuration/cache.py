@@ -0,0 +1,256 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Caching of parsed configuration files
+
+Parsing a ZCML file produces a stream of parser events (element
+starts and ends with their attributes and positions, and character
+data). That stream only depends on the content of the file, so it can
+be recorded once and replayed into a
+:class:`~zope.configuration.xmlconfig.ConfigurationHandler` on later
+runs instead of parsing the file again.
+
+Conditions (``zcml:condition``) are part of the recorded attributes and
+are evaluated when the events are replayed, so a cached file can be
+used with different features or environments. Each recorded element
+start knows where the element ends, so when a condition is false the
+replay jumps over the element's content instead of feeding it to the
+handler only to have it ignored.
+
+To use the on-disk cache, set the ``parse_cache`` attribute of the
+configuration machine before including files::
+
+    from zope.configuration.cache import ParseCache
+    from zope.configuration.config import ConfigurationMachine
+    from zope.configuration.xmlconfig import file
+    from zope.configuration.xmlconfig import registerCommonDirectives
+
+    context = ConfigurationMachine()
+    registerCommonDirectives(context)
+    context.parse_cache = ParseCache('/var/cache/myapp/zcml')
+    file('site.zcml', context=context)
+
+.. caution::
+   Entries are unpickled, so only use a cache directory that is written
+   by trusted users.
+
+.. versionadded:: 6.1
+"""
+import hashlib
+import os
+import pickle
+from xml.sax.handler import ContentHandler
+
+
+__all__ = [
+    'ParseCache',
+    'EventRecorder',
+    'replay',
+]
+
+#: Event codes used in recorded event streams.
+START = 0
+END = 1
+CHARACTERS = 2
+
+# Bump this whenever the format of the stored event streams changes.
+FORMAT = 2
+
+
+class EventRecorder(ContentHandler):
+    """
+    A content handler that records parser events.
+
+    Every event is forwarded to *handler* after it has been recorded,
+    so a file can be processed and recorded in a single parse. The
+    recorded events are available as the ``events`` attribute once
+    parsing is done. The event of an element start ends with the
+    index of the event of the element's end.
+    """
+
+    locator = None
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.events = []
+        # The indexes of the start events of the open elements
+        self._open = []
+
+    def setDocumentLocator(self, locator):
+        self.locator = locator
+        self.handler.setDocumentLocator(locator)
+
+    def startElementNS(self, name, qname, attrs):
+        locator = self.locator
+        self._open.append(len(self.events))
+        self.events.append((START, name, tuple(attrs.items()),
+                            locator.getLineNumber(),
+                            locator.getColumnNumber()))
+        self.handler.startElementNS(name, qname, attrs)
+
+    def endElementNS(self, name, qname):
+        locator = self.locator
+        events = self.events
+        start = self._open.pop()
+        events[start] += (len(events),)
+        events.append((END, name,
+                       locator.getLineNumber(),
+                       locator.getColumnNumber()))
+        self.handler.endElementNS(name, qname)
+
+    def characters(self, text):
+        events = self.events
+        if events and events[-1][0] == CHARACTERS:
+            # Parsers may split character data arbitrarily; keep one
+            # event per run of text.
+            events[-1] = (CHARACTERS, events[-1][1] + text)
+        else:
+            events.append((CHARACTERS, text))
+        self.handler.characters(text)
+
+
+class _ReplayLocator:
+    """Locator reporting the positions stored in recorded events."""
+
+    line = column = None
+
+    def __init__(self, systemId):
+        self.systemId = systemId
+
+    def getSystemId(self):
+        return self.systemId
+
+    def getLineNumber(self):
+        return self.line
+
+    def getColumnNumber(self):
+        return self.column
+
+
+def replay(events, handler, systemId):
+    """
+    Feed recorded *events* to the content *handler*.
+
+    The handler sees the same calls, with the same locator positions,
+    that it would have seen while parsing the file named *systemId*,
+    except that when the handler starts ignoring an element (a
+    :class:`~zope.configuration.xmlconfig.ConfigurationHandler` whose
+    ``ignore_depth`` becomes true, because of a false condition), the
+    events inside the element are skipped. Only its end is replayed.
+    """
+    locator = _ReplayLocator(systemId)
+    handler.setDocumentLocator(locator)
+    skippable = hasattr(handler, 'ignore_depth')
+    i = 0
+    count = len(events)
+    while i < count:
+        event = events[i]
+        kind = event[0]
+        if kind == START:
+            name, attrs, locator.line, locator.column = event[1:5]
+            handler.startElementNS(name, None, dict(attrs))
+            if skippable and handler.ignore_depth and len(event) > 5:
+                # Jump to the end of the ignored element
+                i = event[5]
+                continue
+        elif kind == END:
+            _, name, locator.line, locator.column = event
+            handler.endElementNS(name, None)
+        else:
+            handler.characters(event[1])
+        i += 1
+
+
+def fingerprint(file):
+    """
+    Return the name, modification time and size of the open *file*.
+
+    `None` is returned for file objects that aren't backed by a named
+    file on disk.
+    """
+    name = getattr(file, 'name', None)
+    if not isinstance(name, str):
+        return None
+    try:
+        st = os.fstat(file.fileno())
+    except (AttributeError, OSError, ValueError):
+        # No real file behind this object.
+        return None
+    return name, st.st_mtime_ns, st.st_size
+
+
+class ParseCache:
+    """
+    Store recorded parser events in a directory.
+
+    Entries are keyed by the name of the parsed file and validated
+    against its modification time and size, so an edited file is
+    parsed again. Files without a name on disk (for example, strings)
+    are never cached.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def fingerprint(self, file):
+        """
+        Return the key identifying the current content of *file*.
+
+        `None` is returned for files that can't be cached. This must
+        be called before parsing, since parsers close the files they
+        read.
+        """
+        return fingerprint(file)
+
+    def _entry(self, name):
+        key = hashlib.sha1(name.encode('utf-8', 'surrogateescape'))
+        return os.path.join(self.directory, key.hexdigest() + '.events')
+
+    def load(self, fingerprint):
+        """
+        Return the events recorded for *fingerprint* or `None`.
+        """
+        try:
+            with open(self._entry(fingerprint[0]), 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # A damaged entry is just a miss; it will be overwritten.
+            return None
+        if not isinstance(data, tuple) or data[:2] != (FORMAT, fingerprint):
+            return None
+        return data[2]
+
+    def store(self, fingerprint, events):
+        """
+        Record *events* as the parse result for *fingerprint*.
+
+        Entries that can't be written are skipped; the file is parsed
+        again next time.
+        """
+        entry = self._entry(fingerprint[0])
+        # Write to a temporary name first so that concurrent readers
+        # never see a partially written entry.
+        tmp = '%s.%d.tmp' % (entry, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump((FORMAT, fingerprint, events), f,
+                            pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, entry)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
@@ -14,9 +14,18 @@
 """Configuration processor
 """
 import builtins
+import functools
+import importlib.machinery
+import importlib.util
+import itertools
 import operator
 import os.path
 import sys
+import weakref
+from collections.abc import Mapping
+from collections.abc import MutableMapping
+from concurrent.futures import FIRST_EXCEPTION
+from concurrent.futures import wait
 from keyword import iskeyword
 
 from zope.interface import Interface
@@ -24,6 +33,7 @@ from zope.interface import implementer
 from zope.interface import providedBy
 from zope.interface.adapter import AdapterRegistry
 from zope.schema import URI
+from zope.schema import Field
 from zope.schema import TextLine
 from zope.schema import ValidationError
 
@@ -33,6 +43,7 @@ from zope.configuration.exceptions import ConfigurationWrapperError
 from zope.configuration.fields import GlobalInterface
 from zope.configuration.fields import GlobalObject
 from zope.configuration.fields import PathProcessor
+from zope.configuration.fields import resolveDeferred
 from zope.configuration.interfaces import IConfigurationContext
 from zope.configuration.interfaces import IGroupingContext
 
@@ -40,6 +51,7 @@ from zope.configuration.interfaces import IGroupingContext
 __all__ = [
     'ConfigurationContext',
     'ConfigurationAdapterRegistry',
+    'IncludePath',
     'ConfigurationMachine',
     'IStackItem',
     'SimpleStackItem',
@@ -62,9 +74,14 @@ __all__ = [
     'IProvidesDirectiveInfo',
     'provides',
     'toargs',
+    'Action',
     'expand_action',
     'resolveConflicts',
+    'ConflictIndex',
     'ConfigurationConflictError',
+    'batchable',
+    'resolveCacheInfo',
+    'clearResolveCache',
 ]
 
 zopens = 'http://namespaces.zope.org/zope'
@@ -72,6 +89,293 @@ metans = 'http://namespaces.zope.org/meta'
 testns = 'http://namespaces.zope.org/test'
 
 
+_marker = object()
+
+# Maps absolute dotted names to the module they were found in, the
+# name of the global in it, and the resolved object.
+_resolved = {}
+_resolve_stats = {'hits': 0, 'misses': 0}
+
+# The events that can be subscribed to with
+# ConfigurationMachine.subscribe
+_EVENTS = frozenset([
+    'directiveStarted',
+    'directiveFinished',
+    'includeStarted',
+    'includeFinished',
+    'actionAdded',
+    'conflictsResolved',
+    'actionExecuted',
+])
+
+
+@functools.lru_cache(maxsize=None)
+def _absoluteName(package, name):
+    # Convert the relative dotted *name* to an absolute one.
+    names = name.split('.')
+    pnames = package.split(".")
+    pnames.append('')
+    while names and not names[0]:
+        names.pop(0)
+        try:
+            pnames.pop()
+        except IndexError:
+            raise ConfigurationError("Invalid global name", name)
+    return '.'.join(pnames + names)
+
+
+def _isInstalled(name):
+    # Whether the module *name* can be found. Unlike importing it, this
+    # doesn't execute the module, though the packages containing it
+    # are imported.
+    if name in sys.modules:
+        return sys.modules[name] is not None
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _listedInstalled(names, path=None):
+    """
+    Return the *names* of modules that are found by listing the
+    directories on *path* (by default, :data:`sys.path`).
+
+    Each directory is listed at most once. Only the module files and
+    package directories the path based import system would find are
+    considered, so a name that isn't returned may still be found by
+    other import hooks.
+    """
+    suffixes = tuple(importlib.machinery.all_suffixes())
+    listings = {}
+
+    def listing(directory):
+        entries = listings.get(directory)
+        if entries is None:
+            try:
+                entries = set(os.listdir(directory))
+            except OSError:
+                entries = set()
+            listings[directory] = entries
+        return entries
+
+    def isModule(directory, name):
+        entries = listing(directory)
+        return any(name + suffix in entries for suffix in suffixes)
+
+    def isPackage(directory, name):
+        if name not in listing(directory):
+            return False
+        package = os.path.join(directory, name)
+        return os.path.isdir(package) and isModule(package, '__init__')
+
+    def isDirectory(directory, name):
+        return (name in listing(directory)
+                and os.path.isdir(os.path.join(directory, name)))
+
+    directories = [entry or os.getcwd()
+                   for entry in (sys.path if path is None else path)
+                   if isinstance(entry, str)]
+    found = []
+    for name in names:
+        parts = name.split('.')
+        candidates = directories
+        for part in parts[:-1]:
+            # Find the package like the path based finder does: a
+            # regular package or module hides the directories of a
+            # namespace package.
+            portions = []
+            for directory in candidates:
+                if isPackage(directory, part):
+                    portions = [os.path.join(directory, part)]
+                    break
+                if isModule(directory, part):
+                    break
+                if isDirectory(directory, part):
+                    portions.append(os.path.join(directory, part))
+            candidates = portions
+        if any(isModule(directory, parts[-1])
+               or isDirectory(directory, parts[-1])
+               for directory in candidates):
+            found.append(name)
+    return found
+
+
+def resolveCacheInfo():
+    """
+    Return statistics about the cache used by
+    :meth:`ConfigurationContext.resolve`.
+
+    The result is a dictionary with the number of ``hits``, ``misses``
+    and cached names (``size``).
+
+    .. versionadded:: 6.1
+    """
+    return dict(_resolve_stats, size=len(_resolved))
+
+
+def clearResolveCache():
+    """
+    Clear the cache used by :meth:`ConfigurationContext.resolve` and
+    reset its statistics.
+
+    .. versionadded:: 6.1
+    """
+    _resolved.clear()
+    _resolve_stats.update(hits=0, misses=0)
+
+
+class IncludePath:
+    """
+    A path of included files, as a node in the tree of includes.
+
+    Paths are interned: there is a single node for each sequence of
+    file names, starting from the empty path `IncludePath.root`. Each
+    node knows its ``parent``, its ``name`` and its ``depth``, and the
+    ``children`` included from it, so deep include chains take little
+    memory, and testing whether a path is a prefix of another is an
+    ancestor check. Children are held weakly: a path is only kept
+    while it, or a path included from it, is used.
+
+    For backwards compatibility, paths behave like the tuples of names
+    that they replace:
+
+        >>> from zope.configuration.config import IncludePath
+        >>> path = IncludePath.root + ('a.zcml', 'b.zcml')
+        >>> path
+        ('a.zcml', 'b.zcml')
+        >>> path == ('a.zcml', 'b.zcml') and path[-1] == path.name
+        True
+        >>> path.parent is IncludePath.root + ('a.zcml',)
+        True
+        >>> path.parent.isPrefixOf(path)
+        True
+
+    The tree can be inspected by tools, for example to find the files
+    that actions come from (grouping actions by their include path) or
+    the files included by a file:
+
+        >>> [child.name for child in path.parent.children.values()]
+        ['b.zcml']
+
+    .. versionadded:: 6.1
+    """
+
+    __slots__ = ('parent', 'name', 'depth', 'children', '_hash',
+                 '__weakref__')
+
+    #: The empty path
+    root = None
+
+    def __init__(self, parent=None, name=None):
+        self.parent = parent
+        self.name = name
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.children = weakref.WeakValueDictionary()
+        self._hash = hash(tuple(self))
+
+    def child(self, name):
+        """
+        Return the path of *name* included from this path.
+        """
+        child = self.children.get(name)
+        if child is None:
+            child = self.children.setdefault(name, IncludePath(self, name))
+        return child
+
+    def isPrefixOf(self, other):
+        """
+        Is this path a prefix of, or equal to, the path *other*?
+        """
+        depth = self.depth
+        if other.depth < depth:
+            return False
+        while other.depth > depth:
+            other = other.parent
+        return other is self
+
+    def walk(self):
+        """
+        Iterate over this path and all the paths included from it.
+        """
+        yield self
+        for child in list(self.children.values()):
+            yield from child.walk()
+
+    def __iter__(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return reversed(names)
+
+    def __len__(self):
+        return self.depth
+
+    def __getitem__(self, key):
+        return tuple(self)[key]
+
+    def __add__(self, other):
+        if not isinstance(other, (tuple, IncludePath)):
+            return NotImplemented
+        node = self
+        for name in other:
+            node = node.child(name)
+        return node
+
+    def __radd__(self, other):
+        if not isinstance(other, tuple):
+            return NotImplemented
+        return IncludePath.root + other + self
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, IncludePath):
+            return self is other
+        if isinstance(other, tuple):
+            return tuple(self) == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        if not isinstance(other, (tuple, IncludePath)):
+            return NotImplemented
+        return tuple(self) < tuple(other)
+
+    def __le__(self, other):
+        if not isinstance(other, (tuple, IncludePath)):
+            return NotImplemented
+        return tuple(self) <= tuple(other)
+
+    def __gt__(self, other):
+        if not isinstance(other, (tuple, IncludePath)):
+            return NotImplemented
+        return tuple(self) > tuple(other)
+
+    def __ge__(self, other):
+        if not isinstance(other, (tuple, IncludePath)):
+            return NotImplemented
+        return tuple(self) >= tuple(other)
+
+    def __reduce__(self):
+        return _includePath, (tuple(self),)
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+IncludePath.root = IncludePath()
+
+
+def _includePath(names):
+    # Return the interned path for a sequence of names.
+    if isinstance(names, IncludePath):
+        return names
+    return IncludePath.root + tuple(names)
+
+
 class ConfigurationContext:
     """
     Mix-in for implementing.
@@ -97,8 +401,9 @@ class ConfigurationContext:
     resolving conflicts among actions. Normally, only the a
     ConfigurationMachine provides the actions attribute. Decorators
     simply use the actions of the context they decorate. The
-    ``includepath`` attribute is a tuple of names. Each name is
-    typically the name of an included configuration file.
+    ``includepath`` attribute is an `IncludePath`, a tuple-like sequence
+    of names. Each name is typically the name of an included
+    configuration file.
 
     The ``info`` attribute contains descriptive information helpful
     when reporting errors. If not set, it defaults to an empty string.
@@ -117,8 +422,8 @@ class ConfigurationContext:
 
         - ``kw``, keyword arguments for the action
 
-        - ``includepath``, a tuple of include file names (defaults to
-          ())
+        - ``includepath``, an `IncludePath` or tuple of include file
+          names (defaults to ())
 
         - ``info``, an object that has descriptive information about
           the action (defaults to '')
@@ -130,6 +435,15 @@ class ConfigurationContext:
         super().__init__()
         self._seen_files = set()
         self._features = set()
+        # Answers to conditions that depend on the outside world, recorded
+        # so that cached configurations can be checked against them.
+        self._consulted_environ = {}
+        self._consulted_installed = {}
+        self._consulted_patterns = {}
+        # The results of the ZCML conditions evaluated, by expression
+        self._consulted_conditions = {}
+        # Whether modules are installed, by name
+        self._installed = {}
 
     def resolve(self, dottedname):
         """
@@ -192,20 +506,22 @@ class ConfigurationContext:
                 raise ConfigurationError(
                     "Can't use leading dots in dotted names, "
                     "no package has been set.")
-            pnames = self.package.__name__.split(".")
-            pnames.append('')
-            while names and not names[0]:
-                names.pop(0)
-                try:
-                    pnames.pop()
-                except IndexError:
-                    raise ConfigurationError("Invalid global name", name)
-            names[0:0] = pnames
+            name = _absoluteName(self.package.__name__, name)
 
         # Now we should have an absolute dotted name
+        cached = _resolved.get(name)
+        if cached is not None:
+            mname, mod, oname, obj = cached
+            # Only use the cached object if neither the module nor the
+            # global were replaced since.
+            if (sys.modules.get(mname) is mod and
+                    (not oname or getattr(mod, oname, _marker) is obj)):
+                _resolve_stats['hits'] += 1
+                return obj
+        _resolve_stats['misses'] += 1
 
         # Split off object name:
-        oname, mname = names[-1], '.'.join(names[:-1])
+        mname, _, oname = name.rpartition('.')
 
         # Import the module
         if not mname:
@@ -228,23 +544,28 @@ class ConfigurationContext:
 
         if not oname:
             # see not mname case above
+            _resolved[name] = mname, mod, oname, mod
             return mod
 
         try:
             obj = getattr(mod, oname)
-            return obj
         except AttributeError:
             # No such name, maybe it's a module that we still need to import
             try:
                 moname = mname + '.' + oname
                 __import__(moname)
-                return sys.modules[moname]
+                obj = sys.modules[moname]
             except ImportError:
                 if sys.exc_info()[2].tb_next is not None:
                     # ImportError was caused deeper
                     raise
                 raise ConfigurationError(
                     f"ImportError: Module {mname} has no global {oname}")
+            _resolved[moname] = moname, obj, '', obj
+            return obj
+
+        _resolved[name] = mname, mod, oname, obj
+        return obj
 
     def path(self, filename):
         """
@@ -293,6 +614,9 @@ class ConfigurationContext:
                 basepath = os.path.abspath(os.path.normpath(basepath))
             self.basepath = basepath
 
+        access = getattr(self, 'file_access', None)
+        if access is not None:
+            return access.path(basepath, filename)
         return os.path.normpath(os.path.join(basepath, filename))
 
     def checkDuplicate(self, filename):
@@ -488,29 +812,22 @@ class ConfigurationContext:
               'order': 0}
 
         """
-        if kw is None:
-            kw = {}
-
-        action = extra
-
         if info is None:
             info = getattr(self, 'info', '')
 
         if includepath is None:
             includepath = getattr(self, 'includepath', ())
 
-        action.update(
-            dict(
-                discriminator=discriminator,
-                callable=callable,
-                args=args,
-                kw=kw,
-                includepath=includepath,
-                info=info,
-                order=order,
-            ))
+        self.actions.append(
+            Action(discriminator, callable, args, kw, includepath, info,
+                   order, **extra))
 
-        self.actions.append(action)
+        index = getattr(self, 'conflict_index', None)
+        if index is not None:
+            index.update(self.actions, includepath)
+
+        if getattr(self, '_subscribers', None):
+            self.notify('actionAdded', self.actions[-1])
 
     def hasFeature(self, feature):
         """
@@ -544,6 +861,53 @@ class ConfigurationContext:
         """
         self._features.add(feature)
 
+    def isInstalled(self, name):
+        """
+        Check whether a module or package is installed.
+
+        The module is looked up with :func:`importlib.util.find_spec`,
+        so it is not executed, though the packages containing it are
+        imported. The answer is remembered.
+
+        Examples:
+
+            >>> from zope.configuration.config import ConfigurationContext
+            >>> c = ConfigurationContext()
+            >>> c.isInstalled('zope.interface')
+            True
+            >>> c.isInstalled('zope.nonesuch')
+            False
+            >>> c.isInstalled('nonesuch.package')
+            False
+
+        .. versionadded:: 6.1
+        """
+        installed = self._installed.get(name)
+        if installed is None:
+            installed = self._installed[name] = _isInstalled(name)
+        self._consulted_installed[name] = installed
+        return installed
+
+    def scanInstalled(self, names, path=None):
+        """
+        Find out which of the modules *names* are installed at once.
+
+        The directories on *path* (by default, :data:`sys.path`) are
+        listed once each, and the modules found in them are noted as
+        installed. The remaining modules are looked up as by
+        :meth:`isInstalled`. The answers are remembered, but are only
+        recorded as consulted once :meth:`isInstalled` is called.
+
+        .. versionadded:: 6.1
+        """
+        names = [name for name in names if name not in self._installed]
+        for name in _listedInstalled(
+                [name for name in names if name not in sys.modules], path):
+            self._installed[name] = True
+        for name in names:
+            if name not in self._installed:
+                self._installed[name] = _isInstalled(name)
+
     def hasEnvironmentVariable(self, envvar):
         """
         Check whether an environment variable is set to a "truthy" value.
@@ -584,6 +948,7 @@ class ConfigurationContext:
 
         """
         value = os.getenv(envvar)
+        self._consulted_environ[envvar] = value
         if not value:
             return False
         return value.lower() not in ('0', 'false', 'no', 'f', 'n')
@@ -714,7 +1079,7 @@ class ConfigurationMachine(ConfigurationAdapterRegistry, ConfigurationContext):
     """
     package = None
     basepath = None
-    includepath = ()
+    includepath = IncludePath.root
     info = ''
 
     #: These `Exception` subclasses are allowed to be raised from
@@ -728,13 +1093,162 @@ class ConfigurationMachine(ConfigurationAdapterRegistry, ConfigurationContext):
     #: .. versionadded:: 4.2.0
     pass_through_exceptions = ()
 
+    #: An optional :class:`~zope.configuration.cache.ParseCache` used
+    #: by :func:`~zope.configuration.xmlconfig.processxmlfile` to
+    #: avoid parsing unchanged files again.
+    #:
+    #: .. versionadded:: 6.1
+    parse_cache = None
+
+    #: The XML parser used by
+    #: :func:`~zope.configuration.xmlconfig.processxmlfile`. Either
+    #: ``'sax'`` (the default) or ``'expat'``, which drives the
+    #: configuration handler directly from :mod:`pyexpat` callbacks and
+    #: is faster.
+    #:
+    #: .. versionadded:: 6.1
+    xml_parser = 'sax'
+
+    #: If true, lazy :class:`~zope.configuration.fields.GlobalObject`
+    #: fields produce :class:`~zope.configuration.fields.DeferredReference`
+    #: objects instead of importing globals while the configuration is
+    #: processed. The references in an action are resolved right before
+    #: the action is executed.
+    #:
+    #: .. versionadded:: 6.1
+    lazy_globals = False
+
+    #: An optional :class:`~zope.configuration.warmup.ImportWarmer` that
+    #: is told about the globals named by
+    #: :class:`~zope.configuration.fields.GlobalObject` fields and
+    #: imports them in the background.
+    #:
+    #: .. versionadded:: 6.1
+    import_warmer = None
+
+    #: An optional :class:`ConflictIndex` that groups the actions by
+    #: discriminator as they are added, and can report conflicts before
+    #: all the configuration is processed.
+    #:
+    #: .. versionadded:: 6.1
+    conflict_index = None
+
+    #: An optional :class:`concurrent.futures.Executor`, typically a
+    #: thread pool. If set, `execute_actions` runs consecutive actions
+    #: of the same order that were marked with a true ``threadsafe``
+    #: extra argument (``context.action(..., threadsafe=True)``)
+    #: concurrently in the executor. Other actions are executed
+    #: serially, after all the actions before them are done.
+    #:
+    #: .. versionadded:: 6.1
+    action_executor = None
+
+    #: An optional :class:`~zope.configuration.profiling.Profiler` that
+    #: records the time spent handling each directive and executing
+    #: each action.
+    #:
+    #: .. versionadded:: 6.1
+    profiler = None
+
+    #: An optional :class:`~zope.configuration.fileaccess.FileAccess`
+    #: used to find, normalize and open the files named by the
+    #: ``include`` and ``exclude`` directives, such as a
+    #: :class:`~zope.configuration.fileaccess.CachingFileAccess`.
+    #:
+    #: .. versionadded:: 6.1
+    file_access = None
+
     def __init__(self):
         super().__init__()
         self.actions = []
         self.stack = [RootStackItem(self)]
         self.i18n_strings = {}
+        # Event names mapped to lists of subscribers
+        self._subscribers = {}
+        # The answers to ZCML conditions that don't depend on features,
+        # by verb and argument
+        self._conditions = {}
         _bootstrap(self)
 
+    def subscribe(self, event, subscriber):
+        """
+        Call *subscriber* whenever *event* happens.
+
+        The events, and the arguments the subscribers are called with,
+        are:
+
+        ``directiveStarted(name, info)``
+            Handling a directive starts. *name* is the directive name,
+            usually a ``(namespace, name)`` tuple.
+
+        ``directiveFinished(info)``
+            Handling the innermost directive that was started is done,
+            or failed.
+
+        ``includeStarted(filename)``
+            Processing an included file starts.
+
+        ``includeFinished(filename)``
+            Processing an included file is done, or failed.
+
+        ``actionAdded(action)``
+            An `Action` was added.
+
+        ``conflictsResolved(actions)``
+            `execute_actions` resolved conflicts. *actions* is the list
+            of actions to execute.
+
+        ``actionExecuted(action)``
+            An action was executed. Actions executed concurrently (see
+            `action_executor`) are reported in the thread that executed
+            them.
+
+        For example:
+
+            >>> from zope.configuration.config import ConfigurationMachine
+            >>> context = ConfigurationMachine()
+            >>> def added(action):
+            ...     print('added', action.discriminator)
+            >>> context.subscribe('actionAdded', added)
+            >>> context.action('a')
+            added a
+            >>> context.unsubscribe('actionAdded', added)
+            >>> context.action('b')
+            >>> context.subscribe('nonesuch', added)
+            Traceback (most recent call last):
+            ...
+            ValueError: ('Unknown event', 'nonesuch')
+
+        When nothing is subscribed, the configuration machine only
+        checks for subscribers once for each directive and action.
+
+        .. versionadded:: 6.1
+        """
+        if event not in _EVENTS:
+            raise ValueError('Unknown event', event)
+        self._subscribers.setdefault(event, []).append(subscriber)
+
+    def unsubscribe(self, event, subscriber):
+        """
+        Stop calling *subscriber* for *event*.
+
+        .. versionadded:: 6.1
+        """
+        subscribers = self._subscribers.get(event, ())
+        if subscriber in subscribers:
+            subscribers.remove(subscriber)
+            if not subscribers:
+                del self._subscribers[event]
+
+    def notify(self, event, *args):
+        """
+        Call the subscribers to *event* with *args*.
+
+        .. versionadded:: 6.1
+        """
+        for subscriber in self._subscribers.get(event, ()):
+            subscriber(*args)
+
     def begin(self, __name, __data=None, __info=None, **kw):
         if __data:
             if kw:
@@ -742,10 +1256,41 @@ class ConfigurationMachine(ConfigurationAdapterRegistry, ConfigurationContext):
                                 "arguments")
         else:
             __data = kw
-        self.stack.append(self.stack[-1].contained(__name, __data, __info))
+        if self.profiler is not None:
+            self.profiler.begin(__name, __info)
+        if self._subscribers:
+            self.notify('directiveStarted', __name, __info)
+        try:
+            self.stack.append(self.stack[-1].contained(__name, __data, __info))
+        except BaseException:
+            # Balance the profiler and the notification above.
+            if self.profiler is not None:
+                self.profiler.end()
+            if self._subscribers:
+                self.notify('directiveFinished', __info)
+            raise
 
     def end(self):
-        self.stack.pop().finish()
+        item = self.stack.pop()
+        try:
+            item.finish()
+        finally:
+            if self.profiler is not None:
+                self.profiler.end()
+            if self._subscribers:
+                self.notify('directiveFinished', item.context.info)
+
+    def _abandon(self, depth):
+        # Drop the directives an error left open above *depth* in the
+        # stack without finishing them, ending them for the profiler
+        # and the subscribers.
+        stack = self.stack
+        while len(stack) > depth:
+            item = stack.pop()
+            if self.profiler is not None:
+                self.profiler.end()
+            if self._subscribers:
+                self.notify('directiveFinished', item.context.info)
 
     def __call__(self, __name, __info=None, **__kw):
         self.begin(__name, __kw, __info)
@@ -821,30 +1366,148 @@ class ConfigurationMachine(ConfigurationAdapterRegistry, ConfigurationContext):
                 oops
 
         """
-        pass_through_exceptions = self.pass_through_exceptions
-        if testing:
-            pass_through_exceptions = BaseException
+        profiler = self.profiler
         try:
-            for action in resolveConflicts(self.actions):
-                callable = action['callable']
-                if callable is None:
-                    continue
-                args = action['args']
-                kw = action['kw']
-                info = action['info']
-                try:
-                    callable(*args, **kw)
-                except ConfigurationError as ex:
-                    ex.add_details(info)
-                    raise
-                except pass_through_exceptions:
-                    raise
-                except Exception:
-                    # Wrap it up and raise.
-                    raise ConfigurationExecutionError(info, sys.exc_info()[1])
+            if profiler is not None:
+                start = profiler.clock()
+            actions = resolveConflicts(self.actions, self.conflict_index)
+            if profiler is not None:
+                profiler.resolved(profiler.clock() - start)
+            if self._subscribers:
+                self.notify('conflictsResolved', actions)
+            self._execute(actions, testing)
         finally:
             if clear:
                 del self.actions[:]
+                if self.conflict_index is not None:
+                    self.conflict_index.clear()
+
+    def _execute(self, actions, testing=False):
+        # Call the callables of already resolved actions.
+        pass_through_exceptions = self.pass_through_exceptions
+        if testing:
+            pass_through_exceptions = BaseException
+        lazy_globals = self.lazy_globals
+        executor = self.action_executor
+        profiler = self.profiler
+        subscribers = self._subscribers
+        # Actions with the same batchable callable, or thread-safe
+        # actions to be executed concurrently
+        group = []
+        parallel = False
+        previous = batch = order = None
+        for action in actions:
+            callable = action.callable
+            if callable is None:
+                continue
+            if (executor is not None and action._extra
+                    and action._extra.get('threadsafe')):
+                if group and not (parallel and action.order == order):
+                    self._executeGroup(group, testing, parallel)
+                    group = []
+                if not group:
+                    parallel = True
+                    order = action.order
+                group.append(action)
+                continue
+            if group:
+                if (not parallel and callable is previous
+                        and action.order == order):
+                    group.append(action)
+                    continue
+                self._executeGroup(group, testing, parallel)
+                group = []
+            if callable is not previous:
+                previous = callable
+                batch = getattr(callable, 'configuration_batch', None)
+            if batch is not None:
+                group.append(action)
+                parallel = False
+                order = action.order
+                continue
+            args = action.args
+            kw = action.kw
+            info = action.info
+            if profiler is not None:
+                start = profiler.clock()
+            try:
+                if lazy_globals:
+                    callable, args, kw = resolveDeferred((callable, args, kw))
+                callable(*args, **kw)
+            except ConfigurationError as ex:
+                ex.add_details(info)
+                raise
+            except pass_through_exceptions:
+                raise
+            except Exception:
+                # Wrap it up and raise.
+                raise ConfigurationExecutionError(info, sys.exc_info()[1])
+            if profiler is not None:
+                profiler.executed((action,), profiler.clock() - start)
+            if subscribers:
+                self.notify('actionExecuted', action)
+        if group:
+            self._executeGroup(group, testing, parallel)
+
+    def _executeGroup(self, actions, testing=False, parallel=False):
+        # Execute actions with the same batchable callable with a
+        # single call, unless there is only one. If *parallel* is true,
+        # execute each of the actions in the action executor instead.
+        if parallel and len(actions) > 1:
+            futures = [
+                self.action_executor.submit(
+                    self._executeGroup, [action], testing)
+                for action in actions]
+            wait(futures, return_when=FIRST_EXCEPTION)
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            # Report the first failed action
+            for future in futures:
+                if not future.cancelled():
+                    future.result()
+            return
+
+        pass_through_exceptions = self.pass_through_exceptions
+        if testing:
+            pass_through_exceptions = BaseException
+        lazy_globals = self.lazy_globals
+        profiler = self.profiler
+        current = actions[0]
+
+        def calls():
+            # The arguments of the actions, noting the action being
+            # executed.
+            nonlocal current
+            for current in actions:
+                if lazy_globals:
+                    yield resolveDeferred((current.args, current.kw))
+                else:
+                    yield current.args, current.kw
+
+        if profiler is not None:
+            start = profiler.clock()
+        try:
+            if len(actions) == 1:
+                callable, args, kw = current.callable, current.args, current.kw
+                if lazy_globals:
+                    callable, args, kw = resolveDeferred((callable, args, kw))
+                callable(*args, **kw)
+            else:
+                current.callable.configuration_batch(calls())
+        except ConfigurationError as ex:
+            ex.add_details(current.info)
+            raise
+        except pass_through_exceptions:
+            raise
+        except Exception:
+            # Wrap it up and raise.
+            raise ConfigurationExecutionError(current.info, sys.exc_info()[1])
+        if profiler is not None:
+            profiler.executed(actions, profiler.clock() - start)
+        if self._subscribers:
+            for action in actions:
+                self.notify('actionExecuted', action)
 
 
 class ConfigurationExecutionError(ConfigurationWrapperError):
@@ -919,7 +1582,7 @@ class SimpleStackItem:
         if actions:
             # we allow the handler to return nothing
             for action in actions:
-                if not isinstance(action, dict):
+                if not isinstance(action, Mapping):
                     action = expand_action(*action)  # b/c
                 context.action(**action)
 
@@ -1112,7 +1775,7 @@ class GroupingStackItem(RootStackItem):
         actions = self.context.before()
         if actions:
             for action in actions:
-                if not isinstance(action, dict):
+                if not isinstance(action, Mapping):
                     action = expand_action(*action)
                 self.context.action(**action)
         self.__callBefore = noop
@@ -1126,7 +1789,7 @@ class GroupingStackItem(RootStackItem):
         actions = self.context.after()
         if actions:
             for action in actions:
-                if not isinstance(action, dict):
+                if not isinstance(action, Mapping):
                     action = expand_action(*action)
                 self.context.action(**action)
 
@@ -1306,7 +1969,7 @@ class ComplexStackItem:
         if actions:
             # we allow the handler to return nothing
             for action in actions:
-                if not isinstance(action, dict):
+                if not isinstance(action, Mapping):
                     action = expand_action(*action)
                 self.context.action(**action)
 
@@ -1482,6 +2145,7 @@ def defineSimpleDirective(context,
         return SimpleStackItem(context, handler, info, schema, data)
 
     factory.schema = schema
+    _converter(schema)
 
     context.register(usedIn, name, factory)
     context.document(name, schema, usedIn, handler, context.info)
@@ -1552,6 +2216,7 @@ def defineGroupingDirective(context,
         return GroupingStackItem(newcontext)
 
     factory.schema = schema
+    _converter(schema)
 
     context.register(usedIn, name, factory)
     context.document(name, schema, usedIn, handler, context.info)
@@ -1574,6 +2239,7 @@ class ComplexDirectiveDefinition(GroupingContextDecorator, dict):
             return ComplexStackItem(self, context, data, info)
 
         factory.schema = self.schema
+        _converter(self.schema)
 
         self.register(self.usedIn, (self.namespace, self.name), factory)
         self.document((self.namespace, self.name), self.schema, self.usedIn,
@@ -1585,6 +2251,7 @@ def subdirective(context, name, schema):
                      getattr(context.handler, name, context.handler),
                      context.info, context.context)
     context.context[name] = schema, context.info
+    _converter(schema)
 
 
 ##############################################################################
@@ -1742,53 +2409,249 @@ def toargs(context, schema, data):
         ...
         ConfigurationError: ('Invalid value for', 'in', '0')
     """
-    data = dict(data)
-    args = {}
-    for name, field in schema.namesAndDescriptions(True):
-        field = field.bind(context)
-        n = name
-        if n.endswith('_') and iskeyword(n[:-1]):
-            n = n[:-1]
-
-        s = data.get(n, data)
-        if s is not data:
-            s = str(s)
-            del data[n]
+    return _converter(schema)(context, data)
 
-            try:
-                args[str(name)] = field.fromUnicode(s)
-            except ValidationError as v:
-                raise ConfigurationError("Invalid value for %r" %
-                                         (n)).add_details(v)
-        elif field.required:
-            # if the default is valid, we can use that:
-            default = field.default
-            try:
-                field.validate(default)
-            except ValidationError as v:
-                raise ConfigurationError(
-                    f"Missing parameter: {n!r}").add_details(v)
-            args[str(name)] = default
 
-    if data:
-        # we had data left over
+# Maps the ids of schemas to their schema and converter.
+_converters = {}
+
+
+def _converter(schema):
+    # Return the argument converter for *schema*, compiling it if needed.
+    found = _converters.get(id(schema))
+    if found is None or found[0] is not schema:
+        found = _converters[id(schema)] = schema, _ArgumentConverter(schema)
+    return found[1]
+
+
+class _ArgumentConverter:
+    """
+    Convert directive data to arguments for one schema.
+
+    The fields of the schema, the names their data is given under and
+    the validity of their defaults are computed once. Bound fields are
+    reused: a field that doesn't customize ``bind`` differs from its
+    bound clones only in its ``context``, so a pool of clones is kept
+    and their context is set for each conversion, and cleared after it.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.fields = []
+        self.plain = []
+        for name, field in schema.namesAndDescriptions(True):
+            n = name
+            if n.endswith('_') and iskeyword(n[:-1]):
+                n = n[:-1]
+            self.fields.append((str(name), n, field))
+            self.plain.append(type(field).bind is Field.bind)
+        # Free sets of bound clones. A set is taken out while it is in
+        # use, so reentrant and concurrent conversions don't share one.
+        self._pool = []
+        # Field name -> the ValidationError of its default, or None.
+        self._defaults = {}
+
+    def _bind(self, context):
         try:
-            keyword_arguments = schema.getTaggedValue('keyword_arguments')
-        except KeyError:
-            keyword_arguments = False
-        if not keyword_arguments:
-            raise ConfigurationError("Unrecognized parameters:", *data)
+            bound = self._pool.pop()
+        except IndexError:
+            return [field.bind(context) for _, _, field in self.fields]
+        for i, plain in enumerate(self.plain):
+            if plain:
+                bound[i].context = context
+            else:
+                bound[i] = self.fields[i][2].bind(context)
+        return bound
+
+    def __call__(self, context, data):
+        data = dict(data)
+        args = {}
+        bound = self._bind(context)
+        for (name, n, _), field in zip(self.fields, bound):
+            s = data.pop(n, data)
+            if s is not data:
+                try:
+                    args[name] = field.fromUnicode(str(s))
+                except ValidationError as v:
+                    # The error refers to the bound field; don't reuse it.
+                    raise ConfigurationError("Invalid value for %r" %
+                                             (n)).add_details(v)
+            elif field.required:
+                # if the default is valid, we can use that:
+                default = field.default
+                try:
+                    error = self._defaults[name]
+                except KeyError:
+                    try:
+                        field.validate(default)
+                    except ValidationError as v:
+                        error = v
+                    else:
+                        error = None
+                    self._defaults[name] = error
+                if error is not None:
+                    raise ConfigurationError(
+                        f"Missing parameter: {n!r}").add_details(error)
+                args[name] = default
+        for field in bound:
+            # Pooled clones mustn't keep the context, and with it the
+            # configuration machine, alive.
+            field.context = None
+        self._pool.append(bound)
+
+        if data:
+            # we had data left over
+            try:
+                keyword_arguments = self.schema.getTaggedValue(
+                    'keyword_arguments')
+            except KeyError:
+                keyword_arguments = False
+            if not keyword_arguments:
+                raise ConfigurationError("Unrecognized parameters:", *data)
+
+            for name in data:
+                args[str(name)] = data[name]
 
-        for name in data:
-            args[str(name)] = data[name]
+        return args
 
-    return args
+
+def batchable(batch):
+    """
+    Give an action callable a batch entry point.
+
+    Decorating a callable with ``batchable(batch)`` lets
+    :meth:`ConfigurationMachine.execute_actions` make a single call to
+    *batch* for consecutive actions with that callable and the same
+    order, instead of calling the callable for each action. *batch* is
+    called with an iterable of ``(args, kw)`` pairs, one for each
+    action, and must process all of them in order, as they are taken
+    from the iterable. An error raised by *batch* is reported for the action
+    whose arguments were taken last.
+
+        >>> from zope.configuration.config import batchable
+        >>> registry = []
+        >>> def registerBatch(calls):
+        ...     registry.extend(args for args, kw in calls)
+        >>> @batchable(registerBatch)
+        ... def register(*args):
+        ...     registry.append(args)
+        >>> register.configuration_batch is registerBatch
+        True
+
+    .. versionadded:: 6.1
+    """
+    def decorator(callable):
+        callable.configuration_batch = batch
+        return callable
+    return decorator
 
 
 ##############################################################################
 # Conflict resolution
 
 
+_ACTION_KEYS = ('discriminator', 'callable', 'args', 'kw', 'includepath',
+                'info', 'order')
+_ACTION_KEY_SET = frozenset(_ACTION_KEYS)
+
+
+class Action(MutableMapping):
+    """
+    A configuration action.
+
+    The standard parts of the action are attributes: ``discriminator``,
+    ``callable``, ``args``, ``kw``, ``includepath``, ``info`` and
+    ``order``. For backwards compatibility, actions are also mutable
+    mappings of these names and of any extra keyword arguments given
+    when the action was created:
+
+        >>> from zope.configuration.config import Action
+        >>> action = Action(('x', 1), print, order=1, extra='yes')
+        >>> action['callable'] is action.callable is print
+        True
+        >>> action['extra']
+        'yes'
+        >>> action == dict(discriminator=('x', 1), callable=print, args=(),
+        ...                kw={}, includepath=(), info=None, order=1,
+        ...                extra='yes')
+        True
+
+    Actions use much less memory than the dictionaries they replace.
+
+    .. versionadded:: 6.1
+    """
+
+    __slots__ = _ACTION_KEYS + ('_extra',)
+
+    def __init__(self,
+                 discriminator,
+                 callable=None,
+                 args=(),
+                 kw=None,
+                 includepath=(),
+                 info=None,
+                 order=0,
+                 **extra):
+        self.discriminator = discriminator
+        self.callable = callable
+        self.args = args
+        self.kw = {} if kw is None else kw
+        self.includepath = includepath
+        self.info = info
+        self.order = order
+        self._extra = extra or None
+
+    def __getitem__(self, key):
+        if key in _ACTION_KEY_SET:
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _ACTION_KEY_SET:
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _ACTION_KEY_SET:
+            raise TypeError("Can't remove the %r of an action" % (key,))
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+        if not self._extra:
+            self._extra = None
+
+    def __contains__(self, key):
+        return key in _ACTION_KEY_SET or (
+            self._extra is not None and key in self._extra)
+
+    def __iter__(self):
+        yield from _ACTION_KEYS
+        if self._extra is not None:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return len(_ACTION_KEYS) + len(self._extra or ())
+
+    def __getstate__(self):
+        return tuple(getattr(self, key) for key in self.__slots__)
+
+    def __setstate__(self, state):
+        for key, value in zip(self.__slots__, state):
+            setattr(self, key, value)
+
+    def copy(self):
+        return self.__class__(**self)
+
+    def __repr__(self):
+        # Like the dictionaries actions used to be
+        return repr(dict(sorted(self.items())))
+
+
 def expand_action(discriminator,
                   callable=None,
                   args=(),
@@ -1797,23 +2660,11 @@ def expand_action(discriminator,
                   info=None,
                   order=0,
                   **extra):
-    if kw is None:
-        kw = {}
-    action = extra
-    action.update(
-        dict(
-            discriminator=discriminator,
-            callable=callable,
-            args=args,
-            kw=kw,
-            includepath=includepath,
-            info=info,
-            order=order,
-        ))
-    return action
-
-
-def resolveConflicts(actions):
+    return Action(discriminator, callable, args, kw, includepath, info,
+                  order, **extra)
+
+
+def resolveConflicts(actions, index=None):
     """
     Resolve conflicting actions.
 
@@ -1823,75 +2674,119 @@ def resolveConflicts(actions):
     the actions is a prefix of the includepaths of the other
     conflicting actions and is unequal to the include paths in the
     other conflicting actions.
+
+    The resolved actions are returned as `Action` objects.
+
+    If a `ConflictIndex` of *actions* is given, its groups of actions
+    are used instead of grouping the actions again.
     """
 
-    # organize actions by discriminators
+    # Actions are referred to by their position "i" in the action list
+    # being resolved. Actions with the same non-None discriminator are
+    # grouped. A group is either the position of the only action with
+    # the discriminator, or a list of positions if there are several.
+    if index is not None and index.matches(actions):
+        expanded = actions
+        multiple = [ais for ais in index.groups.values()
+                    if isinstance(ais, list)]
+        actions = ()
+    else:
+        expanded = []
+        multiple = []
     unique = {}
-    output = []
+
+    # organize actions by discriminators
     for i, action in enumerate(actions):
-        if not isinstance(action, dict):
-            # old-style tuple action
-            action = expand_action(*action)
-
-        # "order" is an integer grouping. Actions in a lower order will be
-        # executed before actions in a higher order.  Within an order,
-        # actions are executed sequentially based on original action ordering
-        # ("i").
-        order = action['order'] or 0
-        discriminator = action['discriminator']
-
-        # "ainfo" is a tuple of (order, i, action) where "order" is a
-        # user-supplied grouping, "i" is an integer expressing the relative
-        # position of this action in the action list being resolved, and
-        # "action" is an action dictionary.  The purpose of an ainfo is to
-        # associate an "order" and an "i" with a particular action; "order"
-        # and "i" exist for sorting purposes after conflict resolution.
-        ainfo = (order, i, action)
+        if not isinstance(action, Action):
+            if isinstance(action, Mapping):
+                action = Action(**action)
+            else:
+                # old-style tuple action
+                action = expand_action(*action)
+        expanded.append(action)
 
+        discriminator = action.discriminator
         if discriminator is None:
             # The discriminator is None, so this action can never conflict.
-            # We can add it directly to the result.
-            output.append(ainfo)
             continue
 
-        L = unique.setdefault(discriminator, [])
-        L.append(ainfo)
+        L = unique.setdefault(discriminator, i)
+        if L == i:
+            continue
+        if isinstance(L, list):
+            L.append(i)
+        else:
+            L = unique[discriminator] = [L, i]
+            multiple.append(L)
 
-    # Check for conflicts
+    # Check for conflicts, dropping overridden actions from the result
     conflicts = {}
+    keep = bytearray(b'\x01') * len(expanded)
+
+    # The "first" action of a discriminator is the one with the
+    # shortest include path. The others can be overridden by it if its
+    # path is a prefix of theirs. We break ties using "order", then "i".
+    def bydepth(i):
+        action = expanded[i]
+        return len(action.includepath), action.order or 0, i
+
+    # If there is a conflict, we use (includepath, order, i) as a sort
+    # key for reporting, so that the first action is the lowest one with
+    # the shortest path with a given prefix.
+    def bypath(i):
+        action = expanded[i]
+        return tuple(action.includepath), action.order or 0, i
+
+    for ais in multiple:
+        ais = sorted(ais, key=bydepth)
+        first = expanded[ais[0]].includepath
+        for i in ais[1:]:
+            includepath = expanded[i].includepath
+            if includepath == first or not _isPrefix(first, includepath):
+                break
+            keep[i] = 0
+        else:
+            continue
 
-    for discriminator, ainfos in unique.items():
-
-        # We use (includepath, order, i) as a sort key because we need to
-        # sort the actions by the paths so that the shortest path with a
-        # given prefix comes first.  The "first" action is the one with the
-        # shortest include path.  We break sorting ties using "order", then
-        # "i".
-        def bypath(ainfo):
-            path, order, i = ainfo[2]['includepath'], ainfo[0], ainfo[1]
-            return path, order, i
-
-        ainfos.sort(key=bypath)
-        ainfo, rest = ainfos[0], ainfos[1:]
-        output.append(ainfo)
-        _, _, action = ainfo
-        basepath, baseinfo, discriminator = (action['includepath'],
-                                             action['info'],
-                                             action['discriminator'])
-
-        for _, _, action in rest:
-            includepath = action['includepath']
+        # There is a conflict
+        ais = sorted(ais, key=bypath)
+        action = expanded[ais[0]]
+        basepath = action.includepath
+        baseinfo, discriminator = action.info, action.discriminator
+
+        for i in ais[1:]:
+            action = expanded[i]
+            includepath = action.includepath
             # Test whether path is a prefix of opath
-            if (includepath[:len(basepath)] != basepath  # not a prefix
-                    or includepath == basepath):
+            if (includepath == basepath
+                    or not _isPrefix(basepath, includepath)):
                 L = conflicts.setdefault(discriminator, [baseinfo])
-                L.append(action['info'])
+                L.append(action.info)
 
     if conflicts:
         raise ConfigurationConflictError(conflicts)
 
-    # Sort conflict-resolved actions by (order, i) and return them.
-    return [x[2] for x in sorted(output, key=operator.itemgetter(0, 1))]
+    # Return the conflict-resolved actions in (order, i) order. "order"
+    # is an integer grouping: actions in a lower order will be executed
+    # before actions in a higher order. Within an order, actions are
+    # executed sequentially based on original action ordering ("i").
+    # Orders are few small integers, so the actions are put in buckets
+    # by order instead of being sorted.
+    resolved = list(itertools.compress(expanded, keep))
+    orders = list(map(_order, resolved))
+    kinds = set(orders)
+    if None in kinds:
+        orders = [order or 0 for order in orders]
+        kinds = set(orders)
+    if len(kinds) <= 1:
+        return resolved
+    buckets = {order: [] for order in sorted(kinds)}
+    for action, order in zip(resolved, orders):
+        buckets[order].append(action)
+    return list(itertools.chain.from_iterable(buckets.values()))
+
+
+_order = operator.attrgetter('order')
 
 
 class ConfigurationConflictError(ConfigurationError):
@@ -1912,6 +2807,188 @@ class ConfigurationConflictError(ConfigurationError):
         return super()._with_details(opening, detail_formatter)
 
 
+def _isPrefix(path, other):
+    # Is the include path *path* a prefix of, or equal to, *other*?
+    # Tuples are compared as tuples rather than interned.
+    if type(path) is IncludePath and type(other) is IncludePath:
+        return path.isPrefixOf(other)
+    return tuple(other[:len(path)]) == tuple(path)
+
+
+def _commonPath(path, other):
+    # Return the longest common prefix of two include paths.
+    while path.depth > other.depth:
+        path = path.parent
+    while other.depth > path.depth:
+        other = other.parent
+    while path is not other:
+        path, other = path.parent, other.parent
+    return path
+
+
+def _conflicting(paths):
+    # Do actions with these include paths conflict (unless more actions
+    # are added)?
+    first = min(paths, key=operator.attrgetter('depth'))
+    found = False
+    for path in paths:
+        if path is first:
+            if found:
+                return True
+            found = True
+        elif not first.isPrefixOf(path):
+            return True
+    return False
+
+
+class ConflictIndex:
+    """
+    An index of actions by discriminator.
+
+    Set an instance as the ``conflict_index`` of a configuration
+    machine to group actions as they are added by
+    :meth:`ConfigurationContext.action`. The groups are used by
+    :func:`resolveConflicts` when the actions are executed.
+
+    If *fail_fast* is true, :class:`ConfigurationConflictError` is
+    raised as soon as a conflict looks like it can no longer be
+    resolved, instead of after all the configuration has been
+    processed. A conflict can be resolved by an action whose include
+    path is a prefix of the paths of all the conflicting actions, for
+    example an action in a file that includes them or in an
+    ``includeOverrides`` of such a file. The index assumes that these
+    actions come from files that are still being processed; conflicts
+    are therefore found early when the conflicting actions come from
+    different top-level files, or from the same file, and otherwise
+    when the file including them is done.
+
+    This is a heuristic. Actions added outside of any file can resolve
+    any conflict, and so can the actions of files included by calling
+    :func:`~zope.configuration.xmlconfig.includeOverrides` on the
+    machine, because their include path is reset to the machine's. The
+    index doesn't anticipate them, so only enable *fail_fast* for
+    configurations that are loaded without overriding anything from
+    Python.
+
+    .. versionadded:: 6.1
+    """
+
+    def __init__(self, fail_fast=False):
+        self.fail_fast = fail_fast
+        self.clear()
+
+    def clear(self):
+        """
+        Forget all indexed actions.
+        """
+        #: The indexed list of actions
+        self.actions = None
+        #: Maps discriminators to the position of the action, or a list
+        #: of the positions of the actions, with that discriminator.
+        self.groups = {}
+        #: The positions of the actions without discriminator
+        self.unique = []
+        self._count = 0
+        self._plain = True
+        self._pending = set()
+        self._checked = None
+
+    def matches(self, actions):
+        """
+        Is the list *actions* completely indexed?
+        """
+        return (actions is self.actions and self._plain
+                and len(actions) == self._count)
+
+    def truncate(self, start):
+        """
+        Forget the actions from position *start* on, because they are
+        about to be replaced.
+        """
+        groups = self.groups
+        discriminators = {self._action(i).discriminator
+                          for i in range(start, self._count)}
+        discriminators.discard(None)
+        for discriminator in discriminators:
+            ais = groups.pop(discriminator)
+            if not isinstance(ais, list):
+                ais = [ais]
+            ais = [ai for ai in ais if ai < start]
+            if len(ais) > 1:
+                groups[discriminator] = ais
+            elif ais:
+                groups[discriminator] = ais[0]
+            if len(ais) < 2:
+                self._pending.discard(discriminator)
+        self.unique = [ai for ai in self.unique if ai < start]
+        self._count = min(self._count, start)
+
+    def update(self, actions, includepath=()):
+        """
+        Index the actions added to *actions* since the last update.
+
+        *includepath* is the include path of the file being processed.
+        """
+        count = len(actions)
+        if actions is not self.actions or count < self._count:
+            self.clear()
+            self.actions = actions
+        groups = self.groups
+        for i in range(self._count, count):
+            action = actions[i]
+            if type(action) is not Action:
+                action = self._action(i)
+            discriminator = action.discriminator
+            if discriminator is None:
+                self.unique.append(i)
+                continue
+            ais = groups.setdefault(discriminator, i)
+            if ais == i:
+                continue
+            if isinstance(ais, list):
+                ais.append(i)
+            else:
+                groups[discriminator] = [ais, i]
+            self._pending.add(discriminator)
+            self._checked = None
+        self._count = count
+        if self.fail_fast and self._pending:
+            includepath = _includePath(includepath)
+            if includepath is not self._checked:
+                self._checked = includepath
+                self._check(includepath)
+
+    def _action(self, i):
+        action = self.actions[i]
+        if not isinstance(action, Action):
+            self._plain = False
+            if isinstance(action, Mapping):
+                action = Action(**action)
+            else:
+                # old-style tuple action
+                action = expand_action(*action)
+        return action
+
+    def _check(self, current):
+        for discriminator in list(self._pending):
+            group = [self._action(i) for i in self.groups[discriminator]]
+            paths = [_includePath(action.includepath) for action in group]
+            if not _conflicting(paths):
+                self._pending.discard(discriminator)
+                continue
+            # Find the longest path that actions could still be added
+            # with to override the conflicting actions.
+            common = paths[0]
+            for path in paths[1:]:
+                common = _commonPath(common, path)
+            common = _commonPath(common, current)
+            if any(path is common for path in paths):
+                common = common.parent
+            if common is None or (common.depth == 0 and current.depth):
+                self._pending.discard(discriminator)
+                resolveConflicts(group)
+
+
 ##############################################################################
 # Bootstap code
 
@@ -36,12 +36,14 @@ from zope.configuration.interfaces import InvalidToken
 
 __all__ = [
     'Bool',
+    'DeferredReference',
     'GlobalObject',
     'GlobalInterface',
     'MessageID',
     'Path',
     'PythonIdentifier',
     'Tokens',
+    'resolveDeferred',
 ]
 
 
@@ -94,6 +96,99 @@ class PythonIdentifier(schema_PythonIdentifier):
             raise ValidationError(value).with_field_and_value(self, value)
 
 
+class DeferredReference:
+    """
+    A reference to a module global that hasn't been imported yet.
+
+    These are produced by lazy `GlobalObject` fields. The global is
+    imported and validated by :meth:`resolve`; configuration machines
+    do that right before executing an action that uses it.
+
+    References compare equal if they name the same global, so they
+    can be used in discriminators.
+
+    .. versionadded:: 6.1
+    """
+
+    __slots__ = ('name', '_field', '_context', '_value', '_key')
+
+    def __init__(self, name, field):
+        self.name = name
+        self._field = field
+        # Bound fields may be reused with other contexts
+        self._context = field.context
+        self._key = self._absoluteName()
+
+    def _absoluteName(self):
+        # The absolute dotted name, as far as it can be known without
+        # importing anything.
+        from zope.configuration.config import _absoluteName
+        name = self.name.strip()
+        package = getattr(self._context, 'package', None)
+        if not name.startswith('.') or package is None:
+            return name
+        if name == '.':
+            return package.__name__
+        try:
+            return _absoluteName(package.__name__, name)
+        except ConfigurationError:
+            return name
+
+    def resolve(self):
+        """
+        Return the referenced object, importing it if needed.
+
+        :raises ValidationError: If it can't be found or isn't valid for
+            the field that produced this reference.
+        """
+        try:
+            return self._value
+        except AttributeError:
+            pass
+        field = self._field
+        try:
+            value = self._context.resolve(self.name)
+        except ConfigurationError as v:
+            raise ValidationError(v).with_field_and_value(field, self.name)
+        field.validate(value)
+        self._value = value
+        return value
+
+    def __eq__(self, other):
+        if type(other) is not DeferredReference:
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash((DeferredReference, self._key))
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.name!r}>'
+
+
+def resolveDeferred(value):
+    """
+    Return *value* with the deferred references in it resolved.
+
+    *value* may be a `DeferredReference` or a list, tuple or
+    dictionary containing them; other values are returned unchanged.
+
+    .. versionadded:: 6.1
+    """
+    kind = type(value)
+    if kind is DeferredReference:
+        return value.resolve()
+    if kind is list or kind is tuple:
+        resolved = [resolveDeferred(item) for item in value]
+        if any(new is not old for new, old in zip(resolved, value)):
+            return kind(resolved)
+    elif kind is dict:
+        resolved = {key: resolveDeferred(item) for key, item in value.items()}
+        if any(resolved[key] is not item for key, item in value.items()):
+            return resolved
+    return value
+
+
 @implementer_if_needed(IFromUnicode)
 class GlobalObject(Field):
     """
@@ -101,15 +196,29 @@ class GlobalObject(Field):
 
     The special value ``*`` indicates a value of `None`; this is
     not validated against the *value_type*.
+
+    If *lazy* is true and the configuration machine has
+    :attr:`~zope.configuration.config.ConfigurationMachine.lazy_globals`
+    set, the global isn't imported while the configuration is
+    processed; a `DeferredReference` is returned instead. Only use this
+    for fields whose directive handlers pass the value on to actions
+    without using it.
+
+    .. versionchanged:: 6.1
+       Add the *lazy* argument.
     """
 
     _DOT_VALIDATOR = DottedName()
 
-    def __init__(self, value_type=None, **kw):
+    def __init__(self, value_type=None, lazy=False, **kw):
         self.value_type = value_type
+        self.lazy = lazy
         super().__init__(**kw)
 
     def _validate(self, value):
+        if type(value) is DeferredReference:
+            # Validated when it is resolved
+            return
         super()._validate(value)
         if self.value_type is not None:
             self.value_type.validate(value)
@@ -170,6 +279,13 @@ class GlobalObject(Field):
             v.with_field_and_value(self, name)
             raise
 
+        warmer = getattr(self.context, 'import_warmer', None)
+        if warmer is not None:
+            warmer.add(name, getattr(self.context, 'package', None))
+
+        if self.lazy and getattr(self.context, 'lazy_globals', False):
+            return DeferredReference(name, self)
+
         try:
             value = self.context.resolve(name)
         except ConfigurationError as v:
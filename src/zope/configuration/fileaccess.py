@@ -0,0 +1,191 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Access to configuration files
+
+The ``include`` and ``exclude`` directives find, normalize and open
+the files they name through the ``file_access`` of the configuration
+machine, if it has one. A :class:`FileAccess` does what the directives
+do by default. A :class:`CachingFileAccess` lists each directory it is
+asked about once, and then matches ``files`` patterns, looks for
+files and chooses between a file and its ``.in`` variant using the
+listing, saving most of the file system round trips. This pays off on
+network file systems::
+
+    from zope.configuration.config import ConfigurationMachine
+    from zope.configuration.fileaccess import CachingFileAccess
+    from zope.configuration.xmlconfig import file
+    from zope.configuration.xmlconfig import registerCommonDirectives
+
+    context = ConfigurationMachine()
+    registerCommonDirectives(context)
+    context.file_access = CachingFileAccess()
+    file('site.zcml', context=context)
+
+The listings aren't refreshed, so files created or removed after a
+directory was listed aren't noticed until :meth:`CachingFileAccess.clear`
+is called. A caching file access is meant to be used for a single
+configuration run.
+
+.. versionadded:: 6.1
+"""
+import errno
+import os
+from fnmatch import filter as fnfilter
+from glob import glob
+from glob import has_magic
+
+from zope.configuration.xmlconfig import openInOrPlain
+
+
+__all__ = [
+    'FileAccess',
+    'CachingFileAccess',
+]
+
+_UNLISTED = object()
+
+
+class FileAccess:
+    """
+    Find, normalize and open configuration files.
+
+    This accesses the file system the way the configuration does
+    without a file access. Subclasses can change how it is done.
+    """
+
+    def path(self, basepath, filename):
+        """
+        Return the normalized path of the relative *filename* in the
+        directory *basepath*.
+        """
+        return os.path.normpath(os.path.join(basepath, filename))
+
+    def glob(self, pattern):
+        """
+        Return the paths matching the :mod:`glob` *pattern*, in no
+        particular order.
+        """
+        return glob(pattern)
+
+    def open(self, filename):
+        """
+        Open *filename* for reading, falling back to *filename*
+        with an ``.in`` suffix if *filename* doesn't exist (see
+        :func:`~zope.configuration.xmlconfig.openInOrPlain`).
+        """
+        return openInOrPlain(filename)
+
+
+class CachingFileAccess(FileAccess):
+    """
+    Access files using cached directory listings.
+
+    The ``listings`` attribute counts the directories that were
+    listed, and ``saved`` counts the system calls (like ``stat``,
+    ``open`` or listing a directory) that a :class:`FileAccess` would
+    have made but that were answered from the listings.
+    """
+
+    listings = 0
+    saved = 0
+
+    def __init__(self):
+        # Directory names mapped to the set of names in the directory,
+        # or None if the directory can't be listed
+        self._listings = {}
+        # (basepath, filename) mapped to the normalized path
+        self._paths = {}
+
+    def listdir(self, directory):
+        """
+        Return the set of names in *directory*, or `None` if it can't
+        be listed.
+        """
+        try:
+            return self._listings[directory]
+        except KeyError:
+            pass
+        self.listings += 1
+        try:
+            with os.scandir(directory or os.curdir) as entries:
+                names = frozenset(entry.name for entry in entries)
+        except OSError:
+            names = None
+        self._listings[directory] = names
+        return names
+
+    def path(self, basepath, filename):
+        key = basepath, filename
+        try:
+            return self._paths[key]
+        except KeyError:
+            path = self._paths[key] = super().path(basepath, filename)
+            return path
+
+    def glob(self, pattern):
+        directory, basename = os.path.split(pattern)
+        if not directory or not basename or has_magic(directory):
+            # Leave relative patterns and patterns matching several
+            # directories to glob.
+            return super().glob(pattern)
+
+        cached = directory in self._listings
+        names = self.listdir(directory)
+        if cached:
+            # glob would have listed the directory or looked for the
+            # file.
+            self.saved += 1
+        if names is None:
+            return []
+        if not has_magic(basename):
+            return [pattern] if basename in names else []
+        if basename[0] != '.':
+            # Like glob, don't match hidden files unless asked to.
+            names = [name for name in names if name[0] != '.']
+        return [os.path.join(directory, name)
+                for name in fnfilter(names, basename)]
+
+    def open(self, filename):
+        directory, basename = os.path.split(filename)
+        names = self._listings.get(directory, _UNLISTED)
+        if names is _UNLISTED:
+            try:
+                return open(filename)
+            except FileNotFoundError:
+                pass
+            # Rather than looking for the .in file, list the directory
+            # for the benefit of later lookups.
+            names = self.listdir(directory)
+            if names is None:
+                return openInOrPlain(filename)
+        elif names is None:
+            return openInOrPlain(filename)
+        elif basename in names:
+            return open(filename)
+        else:
+            # The open of the missing file and the check for the .in
+            # file
+            self.saved += 2
+
+        if basename + '.in' in names:
+            return open(filename + '.in')
+        raise FileNotFoundError(
+            errno.ENOENT, os.strerror(errno.ENOENT), filename)
+
+    def clear(self):
+        """
+        Forget the cached listings and paths.
+        """
+        self._listings.clear()
+        self._paths.clear()
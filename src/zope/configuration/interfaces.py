@@ -118,7 +118,8 @@ class IConfigurationContext(Interface):
 
         :keyword str info: Optional source line information
 
-        :keyword includepath: is None (the default) or a tuple of
+        :keyword includepath: is None (the default) or a tuple (or
+            :class:`~zope.configuration.config.IncludePath`) of
             include paths for this action.
         """
 
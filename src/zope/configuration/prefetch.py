@@ -0,0 +1,264 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Parallel parsing of included files
+
+A :class:`Prefetcher` parses configuration files in a pool of workers
+ahead of time. Whenever a file has been parsed, the ``include`` and
+``includeOverrides`` directives in it are inspected and the files they
+name are submitted for parsing too, so the include tree is discovered
+and parsed concurrently.
+
+The configuration itself is still processed sequentially: the
+prefetcher is used as the ``parse_cache`` of the configuration
+machine, and each file's recorded parser events are replayed when the
+normal ``include`` walk reaches it. Which files are processed, and in
+what order, is therefore exactly the same as without prefetching;
+``exclude``, ``includeOverrides`` and ``zcml:condition`` are applied
+during the walk as usual. Files that were prefetched but aren't
+processed (because they are excluded or conditioned away) only cost
+the work of parsing them::
+
+    from zope.configuration.config import ConfigurationMachine
+    from zope.configuration.prefetch import Prefetcher
+    from zope.configuration.xmlconfig import file
+    from zope.configuration.xmlconfig import registerCommonDirectives
+
+    context = ConfigurationMachine()
+    registerCommonDirectives(context)
+    with Prefetcher() as prefetcher:
+        context.parse_cache = prefetcher
+        file('site.zcml', context=context)
+
+Discovery is speculative. Includes naming packages are only followed
+if the package can be located without importing code that the
+configuration itself hasn't imported yet; files that weren't
+prefetched are parsed when they are reached.
+
+.. versionadded:: 6.1
+"""
+import importlib.util
+import os
+import sys
+import threading
+from concurrent.futures import CancelledError
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from xml.sax.handler import ContentHandler
+
+from zope.configuration.cache import END
+from zope.configuration.cache import START
+from zope.configuration.cache import EventRecorder
+from zope.configuration.cache import fingerprint
+from zope.configuration.xmlconfig import _parsers
+from zope.configuration.xmlconfig import openInOrPlain
+
+
+__all__ = [
+    'Prefetcher',
+]
+
+_INCLUDES = ('include', 'includeOverrides')
+
+
+def _parse(path, xml_parser='sax', cache=None):
+    # Parse the file that include() would open for *path*. This runs
+    # in the workers, possibly in another process.
+    with openInOrPlain(path) as f:
+        key = fingerprint(f)
+        events = cache.load(key) if cache is not None else None
+        if events is None:
+            recorder = EventRecorder(ContentHandler())
+            _parsers[xml_parser](f, recorder)
+            events = recorder.events
+            if cache is not None:
+                cache.store(key, events)
+    return key, events
+
+
+def _packageDirectory(name):
+    # Locate a package without importing it. Only parents that are
+    # already imported are used, since importing them could run code
+    # the configuration wouldn't run.
+    module = sys.modules.get(name)
+    if module is None:
+        parent = name.rpartition('.')[0]
+        if parent and parent not in sys.modules:
+            return None
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            return None
+        if spec is None:
+            return None
+        if spec.submodule_search_locations:
+            return list(spec.submodule_search_locations)[0]
+        if spec.origin is None:
+            return None
+        return os.path.dirname(spec.origin)
+    path = getattr(module, '__path__', None)
+    if path:
+        return list(path)[0]
+    file = getattr(module, '__file__', None)
+    return os.path.dirname(file) if file else None
+
+
+def _expand(filename):
+    filename = os.path.expandvars(os.path.expanduser(filename.strip()))
+    return os.path.normpath(filename) if os.path.isabs(filename) else None
+
+
+def _includes(path, events):
+    """
+    Return the files that the include directives in the recorded
+    *events* of *path* would include, as far as they can be known.
+    """
+    found = []
+    # The directory relative paths are resolved against for each open
+    # element, or None if it is unknown.
+    stack = [os.path.dirname(path)]
+    for event in events:
+        if event[0] == START:
+            _, (ns, name), attrs = event[:3]
+            attrs = {key[1]: value for key, value in attrs if key[0] is None}
+            base = stack[-1]
+            package = attrs.get('package')
+            if package is not None:
+                package = package.strip()
+                base = (None if package.startswith('.')
+                        else _packageDirectory(package))
+                if base is not None:
+                    base = os.path.abspath(os.path.normpath(base))
+            if name in _INCLUDES:
+                files = attrs.get('files')
+                filename = attrs.get('file') or 'configure.zcml'
+                pattern = files or filename
+                full = _expand(pattern)
+                if full is None and base is not None:
+                    full = os.path.normpath(os.path.join(base, pattern))
+                if full is not None:
+                    found.extend(sorted(glob(full), key=str.lower)
+                                 if files else [full])
+            stack.append(base if name == 'configure' else stack[-1])
+        elif event[0] == END:
+            stack.pop()
+    return found
+
+
+class Prefetcher:
+    """
+    Parse included files concurrently.
+
+    Use an instance as the ``parse_cache`` of a configuration machine.
+    Files are parsed by *executor*, a :class:`concurrent.futures.Executor`
+    (a process pool can be used); by default, a thread pool with
+    *max_workers* threads is created, and shut down by :meth:`close`.
+    Files are parsed with *xml_parser* (see
+    :attr:`~zope.configuration.config.ConfigurationMachine.xml_parser`).
+    If a *cache* (such as a :class:`~zope.configuration.cache.ParseCache`)
+    is given, the workers consult and fill it.
+
+    The ``hits`` attribute counts files that were served from the
+    workers.
+    """
+
+    hits = 0
+
+    def __init__(self, executor=None, max_workers=None, xml_parser='sax',
+                 cache=None):
+        self._owns_executor = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers)
+        self.executor = executor
+        self.xml_parser = xml_parser
+        self.cache = cache
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def prefetch(self, path):
+        """
+        Start parsing the file that including *path* would process.
+        """
+        with self._lock:
+            if path in self._futures:
+                return
+            try:
+                future = self.executor.submit(
+                    _parse, path, self.xml_parser, self.cache)
+            except RuntimeError:
+                # The executor was shut down.
+                return
+            self._futures[path] = future
+        future.add_done_callback(self._parsed)
+
+    def _parsed(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        key, events = future.result()
+        for path in _includes(key[0], events):
+            self.prefetch(path)
+
+    def fingerprint(self, file):
+        return fingerprint(file)
+
+    def load(self, key):
+        """
+        Return the events of the file identified by *key*.
+
+        Files that haven't been prefetched are parsed in the workers
+        now, so that the files they include are prefetched while the
+        file itself is processed. `None` is returned if the file
+        changed since it was parsed or couldn't be parsed; it is then
+        parsed normally, which reports any errors.
+        """
+        name = key[0]
+        with self._lock:
+            future = self._futures.pop(name, None)
+            if future is None and name.endswith('.in'):
+                future = self._futures.pop(name[:-3], None)
+        if future is None:
+            self.prefetch(name)
+            with self._lock:
+                future = self._futures.pop(name, None)
+            if future is None:
+                return None
+        try:
+            parsed, events = future.result()
+        except (Exception, CancelledError):
+            return None
+        if parsed != key:
+            return None
+        self.hits += 1
+        return events
+
+    def store(self, key, events):
+        if self.cache is not None:
+            self.cache.store(key, events)
+
+    def close(self):
+        """
+        Forget prefetched files and shut down the executor if it was
+        created by the prefetcher.
+        """
+        with self._lock:
+            futures, self._futures = self._futures, {}
+        for future in futures.values():
+            future.cancel()
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,590 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Measuring where configuration time is spent
+
+A :class:`Profiler` set as the ``profiler`` of a configuration machine
+records the wall time spent handling each directive while the
+configuration files are processed, the time spent resolving conflicts,
+and the time spent executing each action. The times are summed up by
+action callable, by directive name and by configuration file::
+
+    from zope.configuration.config import ConfigurationMachine
+    from zope.configuration.profiling import Profiler
+    from zope.configuration.xmlconfig import file
+    from zope.configuration.xmlconfig import registerCommonDirectives
+
+    context = ConfigurationMachine()
+    registerCommonDirectives(context)
+    context.profiler = profiler = Profiler()
+    file('site.zcml', context=context)
+    print(profiler.report())
+    profiler.save('profile.json')
+
+The time of a directive doesn't include the time of the directives
+nested in it (such as the directives of an included file), so the times
+add up to the total. Actions are attributed to the directive that added
+them and to the file their ``info`` names, or else the last file of
+their include path. Batched actions share the time of their batch
+equally.
+
+A :class:`StackSampler` instead samples the stack of the thread
+processing the configuration at regular intervals, and writes the
+samples as collapsed stacks, the input format of flame graph tools such
+as ``flamegraph.pl`` and speedscope. The outer frames of each sample
+are the directives being handled, from the outermost ``configure``
+through the ``include`` directives down to the current directive, as
+``file.zcml:line <ns:directive>``. They are followed by the Python
+frames of the parser handler or action execution underneath, so time
+spent converting arguments, importing modules and executing actions is
+shown below the directive responsible for it::
+
+    with StackSampler(context) as sampler:
+        file('site.zcml', context=context)
+    sampler.save('site.folded')
+
+An :class:`ImportTimer` measures the time spent importing modules,
+whether from resolving global names, evaluating ``installed``
+conditions or executing actions, and attributes it to the directive and
+included file responsible. It can warn when the imports of a single
+file take longer than a budget::
+
+    with ImportTimer(context, budget=0.5) as timer:
+        file('site.zcml', context=context)
+    print(timer.report())
+
+.. versionadded:: 6.1
+"""
+import builtins
+import json
+import sys
+import threading
+import time
+import warnings
+from collections import Counter
+
+from zope.configuration.config import ConfigurationMachine
+from zope.configuration.xmlconfig import ConfigurationHandler
+
+
+__all__ = [
+    'Profiler',
+    'StackSampler',
+    'ImportTimer',
+]
+
+UNKNOWN = '<unknown>'
+
+
+def _directiveName(name):
+    if isinstance(name, tuple):
+        ns, name = name
+        if ns:
+            return '{%s}%s' % (ns, name)
+    return name
+
+
+def _callableName(callable):
+    name = getattr(callable, '__qualname__', None)
+    if name is None:
+        return repr(callable)
+    module = getattr(callable, '__module__', None)
+    return '%s.%s' % (module, name) if module else name
+
+
+def _fileName(action):
+    file = getattr(action.info, 'file', None)
+    if file is None and action.includepath:
+        file = action.includepath[-1]
+    return file or UNKNOWN
+
+
+def _sorted(totals, start=1, stop=None):
+    # Sort by descending total of the times from index *start* to
+    # *stop*, then by name.
+    return sorted(totals.items(),
+                  key=lambda item: (-sum(item[1][start:stop]), item[0]))
+
+
+class Profiler:
+    """
+    Record where the time of a configuration run is spent.
+
+    Times are measured with *clock*, by default
+    :func:`time.perf_counter`.
+
+    The totals are kept in dictionaries. ``callables`` maps the names
+    of action callables to a list of the number of calls and the
+    seconds spent. ``directives`` maps directive names to a list of the
+    number of directives handled, the seconds spent handling them and
+    the seconds spent executing their actions. ``files`` maps file
+    names to a list of the seconds spent handling their directives and
+    executing their actions.
+    """
+
+    #: The seconds spent resolving conflicts.
+    conflict_seconds = 0.0
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.callables = {}
+        self.directives = {}
+        self.files = {}
+        # The name of the directive that created each info
+        self._names = {}
+        # [name, info, start, seconds in nested directives] of the
+        # directives being handled
+        self._stack = []
+        self._lock = threading.Lock()
+
+    def begin(self, name, info):
+        """
+        Note that handling the directive *name* at *info* starts.
+        """
+        self._stack.append([name, info, self.clock(), 0.0])
+
+    def end(self):
+        """
+        Note that handling the innermost directive is done.
+        """
+        name, info, start, nested = self._stack.pop()
+        seconds = self.clock() - start
+        if self._stack:
+            self._stack[-1][3] += seconds
+        seconds -= nested
+        name = _directiveName(name)
+        entry = self.directives.get(name)
+        if entry is None:
+            entry = self.directives[name] = [0, 0.0, 0.0]
+        entry[0] += 1
+        entry[1] += seconds
+        self._file(getattr(info, 'file', None) or UNKNOWN)[0] += seconds
+        try:
+            self._names[info] = name
+        except TypeError:
+            # Unhashable info
+            pass
+
+    def resolved(self, seconds):
+        """
+        Note that resolving conflicts took *seconds*.
+        """
+        self.conflict_seconds += seconds
+
+    def executed(self, actions, seconds):
+        """
+        Note that executing *actions* took *seconds*.
+        """
+        seconds /= len(actions)
+        with self._lock:
+            for action in actions:
+                name = _callableName(action.callable)
+                entry = self.callables.get(name)
+                if entry is None:
+                    self.callables[name] = [1, seconds]
+                else:
+                    entry[0] += 1
+                    entry[1] += seconds
+                try:
+                    name = self._names.get(action.info, UNKNOWN)
+                except TypeError:
+                    name = UNKNOWN
+                entry = self.directives.get(name)
+                if entry is None:
+                    entry = self.directives[name] = [0, 0.0, 0.0]
+                entry[2] += seconds
+                self._file(_fileName(action))[1] += seconds
+
+    def _file(self, file):
+        entry = self.files.get(file)
+        if entry is None:
+            entry = self.files[file] = [0.0, 0.0]
+        return entry
+
+    def asDict(self):
+        """
+        Return the totals as a dictionary of JSON serializable data.
+
+        The callables, directives and files are sorted by descending
+        time.
+        """
+        return {
+            'parse_seconds': sum(entry[0] for entry in self.files.values()),
+            'conflict_seconds': self.conflict_seconds,
+            'execute_seconds': sum(entry[1]
+                                   for entry in self.files.values()),
+            'callables': [{'name': name, 'count': count, 'seconds': seconds}
+                          for name, (count, seconds)
+                          in _sorted(self.callables)],
+            'directives': [{'name': name, 'count': count,
+                            'parse_seconds': parse,
+                            'execute_seconds': execute}
+                           for name, (count, parse, execute)
+                           in _sorted(self.directives)],
+            'files': [{'name': name, 'parse_seconds': parse,
+                       'execute_seconds': execute}
+                      for name, (parse, execute) in _sorted(self.files, 0)],
+        }
+
+    def save(self, path):
+        """
+        Write the totals to the file *path* as JSON.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.asDict(), f, indent=2)
+
+    def report(self, limit=20):
+        """
+        Return a text report of the *limit* most expensive callables,
+        directives and files.
+        """
+        data = self.asDict()
+        lines = [
+            'Handling directives: %.3fs' % data['parse_seconds'],
+            'Resolving conflicts: %.3fs' % data['conflict_seconds'],
+            'Executing actions:   %.3fs' % data['execute_seconds'],
+        ]
+        lines += ['', '%10s %8s  %s' % ('seconds', 'count', 'callables')]
+        lines += ['%10.6f %8d  %s' % (entry['seconds'], entry['count'],
+                                      entry['name'])
+                  for entry in data['callables'][:limit]]
+        lines += ['', '%10s %10s %8s  %s' % ('parse', 'execute', 'count',
+                                             'directives')]
+        lines += ['%10.6f %10.6f %8d  %s' % (entry['parse_seconds'],
+                                             entry['execute_seconds'],
+                                             entry['count'], entry['name'])
+                  for entry in data['directives'][:limit]]
+        lines += ['', '%10s %10s  %s' % ('parse', 'execute', 'files')]
+        lines += ['%10.6f %10.6f  %s' % (entry['parse_seconds'],
+                                         entry['execute_seconds'],
+                                         entry['name'])
+                  for entry in data['files'][:limit]]
+        return '\n'.join(lines)
+
+
+# The frames the Python part of a sample starts with: the handler of
+# parser events and the execution of actions. Each is mapped to the
+# name of the local variable holding the action being executed.
+_BOUNDARIES = {
+    ConfigurationHandler.startElementNS.__code__: None,
+    ConfigurationHandler.endElementNS.__code__: None,
+    ConfigurationMachine._execute.__code__: 'action',
+    ConfigurationMachine._executeGroup.__code__: 'current',
+}
+
+
+def _executingAction(frame):
+    # Return the action being executed by the configuration machine
+    # in the stack of *frame*, if any.
+    while frame is not None:
+        variable = _BOUNDARIES.get(frame.f_code)
+        if variable is not None:
+            return frame.f_locals.get(variable)
+        frame = frame.f_back
+    return None
+
+
+def _directiveFrame(name, info):
+    if isinstance(name, tuple):
+        ns, name = name
+        if ns:
+            name = '%s:%s' % (ns.rstrip('/').rsplit('/', 1)[-1], name)
+    file = getattr(info, 'file', None)
+    if file is None:
+        frame = '<%s>' % name
+    else:
+        frame = '%s:%s <%s>' % (file, getattr(info, 'line', '?'), name)
+    # Semicolons separate the frames of collapsed stacks.
+    return frame.replace(';', ',')
+
+
+def _pythonFrame(frame):
+    code = frame.f_code
+    return ('%s (%s:%d)' % (getattr(code, 'co_qualname', code.co_name),
+                            code.co_filename, frame.f_lineno)
+            ).replace(';', ',')
+
+
+class StackSampler:
+    """
+    Sample where the configuration of *context* spends its time.
+
+    While started, the stack of the thread that started the sampler is
+    sampled every *interval* seconds. Actions executed in other threads
+    (see
+    :attr:`~zope.configuration.config.ConfigurationMachine.action_executor`)
+    aren't sampled.
+
+    The ``samples`` attribute is a :class:`collections.Counter` of
+    stacks, tuples of frame names from the outermost to the innermost
+    frame.
+    """
+
+    def __init__(self, context, interval=0.001):
+        self.context = context
+        self.interval = interval
+        self.samples = Counter()
+        # The directive frames of the directives being handled
+        self._directives = []
+        # The directive frames for each info, to attribute actions
+        self._stacks = {}
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def _started(self, name, info):
+        stack = tuple(self._directives) + (_directiveFrame(name, info),)
+        self._directives.append(stack[-1])
+        try:
+            self._stacks[info] = stack
+        except TypeError:
+            # Unhashable info
+            pass
+
+    def _finished(self, info):
+        self._directives.pop()
+
+    def start(self):
+        """
+        Start sampling.
+        """
+        self.context.subscribe('directiveStarted', self._started)
+        self.context.subscribe('directiveFinished', self._finished)
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(threading.get_ident(),),
+            name='zope.configuration.profiling.StackSampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop sampling.
+        """
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+        self.context.unsubscribe('directiveStarted', self._started)
+        self.context.unsubscribe('directiveFinished', self._finished)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self, ident):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(ident)
+            if frame is not None:
+                self.sample(frame)
+            del frame
+
+    def sample(self, frame):
+        """
+        Record the stack of *frame*, the innermost frame of the sampled
+        thread.
+        """
+        directives = tuple(self._directives)
+        python = []
+        while frame is not None:
+            python.append(_pythonFrame(frame))
+            code = frame.f_code
+            if code in _BOUNDARIES:
+                variable = _BOUNDARIES[code]
+                if variable is not None:
+                    # Executing an action, outside of any directive
+                    action = frame.f_locals.get(variable)
+                    info = getattr(action, 'info', None)
+                    try:
+                        directives = self._stacks.get(info, ())
+                    except TypeError:
+                        directives = ()
+                break
+            frame = frame.f_back
+        python.reverse()
+        self.samples[directives + tuple(python)] += 1
+
+    def collapsed(self):
+        """
+        Return the samples as collapsed stacks, one line per stack.
+        """
+        return ''.join('%s %d\n' % (';'.join(stack), count)
+                       for stack, count in sorted(self.samples.items()))
+
+    def save(self, path):
+        """
+        Write the samples to the file *path* as collapsed stacks.
+        """
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+
+
+class ImportTimer:
+    """
+    Measure the time the configuration of *context* spends importing
+    modules.
+
+    While started, the imports made by the thread that started the
+    timer are timed, replacing :func:`builtins.__import__`. The time of
+    each import statement or call that imports new modules is
+    attributed to the innermost directive being handled and the file
+    it is in. Imports made while executing an action are attributed to
+    the directive that added the action.
+
+    The ``directives`` and ``files`` attributes map directive frames
+    (``file.zcml:line <ns:directive>``) and file names to a list of the
+    seconds spent importing and the names of the modules first imported
+    there.
+
+    If *budget* is given, a warning is issued when importing modules
+    for a single file, not counting the files it includes, takes more
+    than *budget* seconds.
+    """
+
+    def __init__(self, context, budget=None, clock=time.perf_counter):
+        self.context = context
+        self.budget = budget
+        self.clock = clock
+        self.directives = {}
+        self.files = {}
+        # The directive frames and files of the directives being handled
+        self._directives = []
+        # The directive frame of each info, to attribute actions
+        self._frames = {}
+        self._warned = set()
+        self._known = set()
+        self._import = None
+        self._ident = None
+        self._importing = False
+
+    def _started(self, name, info):
+        frame = _directiveFrame(name, info)
+        self._directives.append((frame, getattr(info, 'file', None)))
+        try:
+            self._frames[info] = frame
+        except TypeError:
+            # Unhashable info
+            pass
+
+    def _finished(self, info):
+        self._directives.pop()
+
+    def start(self):
+        """
+        Start timing imports.
+        """
+        self.context.subscribe('directiveStarted', self._started)
+        self.context.subscribe('directiveFinished', self._finished)
+        self._known.update(list(sys.modules))
+        self._ident = threading.get_ident()
+        self._import = builtins.__import__
+        builtins.__import__ = self.__import__
+
+    def stop(self):
+        """
+        Stop timing imports.
+        """
+        builtins.__import__ = self._import
+        self._import = None
+        self.context.unsubscribe('directiveStarted', self._started)
+        self.context.unsubscribe('directiveFinished', self._finished)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def __import__(self, *args, **kw):
+        if self._importing or threading.get_ident() != self._ident:
+            return self._import(*args, **kw)
+        count = len(sys.modules)
+        self._importing = True
+        start = self.clock()
+        try:
+            return self._import(*args, **kw)
+        finally:
+            self._importing = False
+            if len(sys.modules) != count:
+                self._imported(self.clock() - start, sys._getframe(1))
+
+    def _imported(self, seconds, frame):
+        modules = [name for name in list(sys.modules)
+                   if name not in self._known]
+        self._known.update(modules)
+        if self._directives:
+            directive, file = self._directives[-1]
+        else:
+            directive = file = None
+            action = _executingAction(frame)
+            if action is not None:
+                try:
+                    directive = self._frames.get(action.info)
+                except TypeError:
+                    pass
+                file = getattr(action.info, 'file', None)
+        directive = directive or UNKNOWN
+        file = file or UNKNOWN
+        for totals, key in ((self.directives, directive),
+                            (self.files, file)):
+            entry = totals.get(key)
+            if entry is None:
+                entry = totals[key] = [0.0, []]
+            entry[0] += seconds
+            entry[1].extend(modules)
+        if (self.budget is not None and file not in self._warned
+                and self.files[file][0] > self.budget):
+            self._warned.add(file)
+            warnings.warn('Importing modules for %s took %.3fs, more than '
+                          'the budget of %.3fs'
+                          % (file, self.files[file][0], self.budget))
+
+    def asDict(self):
+        """
+        Return the import times as a dictionary of JSON serializable data.
+
+        The directives and files are sorted by descending time.
+        """
+        return {
+            'import_seconds': sum(entry[0] for entry in self.files.values()),
+            'directives': [{'name': name, 'seconds': seconds,
+                            'modules': modules}
+                           for name, (seconds, modules)
+                           in _sorted(self.directives, 0, 1)],
+            'files': [{'name': name, 'seconds': seconds, 'modules': modules}
+                      for name, (seconds, modules)
+                      in _sorted(self.files, 0, 1)],
+        }
+
+    def save(self, path):
+        """
+        Write the import times to the file *path* as JSON.
+        """
+        with open(path, 'w') as f:
+            json.dump(self.asDict(), f, indent=2)
+
+    def report(self, limit=20):
+        """
+        Return a text report of the *limit* directives and files that
+        spent the most time importing modules.
+        """
+        data = self.asDict()
+        lines = ['Importing modules: %.3fs' % data['import_seconds']]
+        for title in ('files', 'directives'):
+            lines += ['', '%10s %8s  %s' % ('seconds', 'modules', title)]
+            lines += ['%10.6f %8d  %s' % (entry['seconds'],
+                                          len(entry['modules']),
+                                          entry['name'])
+                      for entry in data[title][:limit]]
+        return '\n'.join(lines)
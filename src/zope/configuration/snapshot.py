@@ -0,0 +1,255 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Snapshots of resolved configuration actions
+
+Processing the same configuration files usually produces the same
+list of actions. A snapshot stores the conflict-resolved actions of a
+configuration together with a fingerprint of everything that was
+consulted to compute them:
+
+- the included (and excluded) files, and the files matching the
+  ``files`` patterns of ``include`` and ``exclude`` directives,
+
+- the features provided before the configuration was loaded,
+
+- the environment variables and installed packages consulted by
+  ``zcml:condition``.
+
+If the fingerprint still matches, the actions are loaded from the
+snapshot and parsing, argument conversion and conflict resolution are
+skipped entirely. Use it through :func:`zope.configuration.xmlconfig.file`::
+
+    file('site.zcml', snapshot='/var/cache/myapp/site.snapshot')
+
+Callables and other module globals are stored by reference, other
+values by value. Configurations whose actions use callables that
+can't be referenced by name (for example, a bound method of a
+module-level list) are not snapshotted.
+
+Only the features, the processed files and the actions are restored
+from a snapshot. State that is built while the files are processed,
+such as the directives defined with ``meta:directive`` and the
+``i18n_strings`` of the context, is not. A context that was loaded
+from a snapshot can't be used to process further configuration that
+relies on it.
+
+.. caution::
+   The fingerprint doesn't cover Python code. Directive handlers compute
+   actions from the files, so keep snapshots in a location that is
+   cleared whenever the installed software changes.
+
+.. versionadded:: 6.1
+"""
+import importlib
+import io
+import logging
+import os
+import pickle
+import sys
+import types
+from glob import glob
+
+from zope.configuration.config import _isInstalled
+from zope.configuration.config import resolveConflicts
+
+
+__all__ = [
+    'loadSnapshot',
+    'saveSnapshot',
+]
+
+logger = logging.getLogger("config")
+
+# Bump this whenever the format of stored snapshots changes.
+FORMAT = 2
+
+_PLAIN = (str, bytes, int, float, bool, type(None), tuple, list, dict,
+          frozenset, set)
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _key(name, package, features):
+    return {
+        'python': sys.version_info[:2],
+        'name': name,
+        'package': getattr(package, '__name__', None),
+        'features': sorted(features),
+    }
+
+
+def _fingerprint(context, name, package, features):
+    files = {}
+    for path in context._seen_files:
+        files[path] = _stat(path), _stat(path + '.in')
+    fingerprint = _key(name, package, features)
+    fingerprint.update(
+        files=files,
+        patterns=dict(context._consulted_patterns),
+        environ=dict(context._consulted_environ),
+        installed=dict(context._consulted_installed),
+    )
+    return fingerprint
+
+
+def _unchanged(fingerprint):
+    for path, stats in fingerprint['files'].items():
+        if (_stat(path), _stat(path + '.in')) != stats:
+            return False
+    for pattern, paths in fingerprint['patterns'].items():
+        if sorted(glob(pattern)) != sorted(paths):
+            return False
+    for envvar, value in fingerprint['environ'].items():
+        if os.getenv(envvar) != value:
+            return False
+    for package, installed in fingerprint['installed'].items():
+        if _isInstalled(package) != installed:
+            return False
+    return True
+
+
+def _globalName(obj):
+    # Return the (module, qualname) under which obj can be imported.
+    module = getattr(obj, '__module__', None)
+    qualname = getattr(obj, '__qualname__', None)
+    if not isinstance(qualname, str):
+        qualname = getattr(obj, '__name__', None)
+    if not isinstance(module, str) or not isinstance(qualname, str):
+        return None
+    try:
+        found = _lookup(module, qualname)
+    except (ImportError, AttributeError):
+        return None
+    if found is not obj:
+        return None
+    return module, qualname
+
+
+def _lookup(module, qualname):
+    obj = importlib.import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+    return obj
+
+
+class _Pickler(pickle.Pickler):
+
+    def persistent_id(self, obj):
+        if isinstance(obj, _PLAIN):
+            return None
+        if isinstance(obj, types.ModuleType):
+            return ('module', obj.__name__)
+        if isinstance(obj, (types.FunctionType, types.BuiltinFunctionType,
+                            types.MethodType, type)) or callable(obj):
+            name = _globalName(obj)
+            if name is not None:
+                return ('global',) + name
+            self_ = getattr(obj, '__self__', None)
+            if self_ is not None and not isinstance(self_, types.ModuleType):
+                # A bound method. Pickling it by value would copy the
+                # object it is bound to.
+                ref = self.persistent_id(self_)
+                if ref is None:
+                    raise pickle.PicklingError(
+                        "Can't reference %r by name" % (obj,))
+                return ('method', ref, obj.__name__)
+        return None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def persistent_load(self, pid):
+        kind = pid[0]
+        if kind == 'module':
+            return importlib.import_module(pid[1])
+        if kind == 'global':
+            return _lookup(pid[1], pid[2])
+        if kind == 'method':
+            return getattr(self.persistent_load(pid[1]), pid[2])
+        raise pickle.UnpicklingError("Unknown reference %r" % (pid,))
+
+
+def loadSnapshot(path, context, name, package=None):
+    """
+    Load the resolved actions stored in the snapshot at *path*.
+
+    `None` is returned if there is no usable snapshot for including
+    *name* from *package* into *context*. Otherwise, the features
+    provided by the configuration are provided to *context*, its
+    files are marked as processed, and the resolved actions are
+    returned.
+    """
+    try:
+        with open(path, 'rb') as f:
+            format, fingerprint = pickle.load(f)
+            if format != FORMAT:
+                return None
+            key = _key(name, package, context._features)
+            if any(fingerprint[k] != v for k, v in key.items()):
+                return None
+            if not _unchanged(fingerprint):
+                return None
+            features, actions = _Unpickler(f).load()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        # Snapshots are only an optimization. Anything that went wrong
+        # means that the configuration is loaded normally.
+        logger.warning("Ignoring snapshot %s: %s", path, e)
+        return None
+
+    context._seen_files.update(fingerprint['files'])
+    for feature in features:
+        context.provideFeature(feature)
+    return actions
+
+
+def saveSnapshot(path, context, name, package=None, features=()):
+    """
+    Resolve the actions of *context* and store them in a snapshot.
+
+    *features* are the features that were provided before *name* was
+    included. The resolved actions are returned; they are returned
+    even if they couldn't be stored.
+    """
+    actions = resolveConflicts(context.actions,
+                               getattr(context, 'conflict_index', None))
+    fingerprint = _fingerprint(context, name, package, features)
+    data = io.BytesIO()
+    try:
+        _Pickler(data, pickle.HIGHEST_PROTOCOL).dump(
+            (sorted(context._features), actions))
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning("Can't create snapshot %s: %s", path, e)
+        return actions
+
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        with open(tmp, 'wb') as f:
+            pickle.dump((FORMAT, fingerprint), f, pickle.HIGHEST_PROTOCOL)
+            f.write(data.getvalue())
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning("Can't create snapshot %s: %s", path, e)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+    return actions
@@ -0,0 +1,149 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Test zope.configuration.bundle.
+"""
+import unittest
+
+from zope.configuration.tests.zcmltree import ZCMLTreeBase
+from zope.configuration.tests.zcmltree import feature
+
+
+SITE = """\
+<configure xmlns="http://namespaces.zope.org/zope"
+           xmlns:meta="http://namespaces.zope.org/meta">
+  <include files="sub/*.zcml" />
+  <include file="template.zcml" />
+  <include package="zope.configuration.tests.samplepackage" file="foo.zcml" />
+</configure>
+"""
+
+
+FILES = {
+    'app/site.zcml': SITE,
+    'app/sub/a.zcml': feature('a'),
+    'app/sub/b.zcml': feature('b'),
+    'app/template.zcml.in': feature('template'),
+}
+
+
+class BundleTests(ZCMLTreeBase, unittest.TestCase):
+
+    files = FILES
+
+    def setUp(self):
+        super().setUp()
+        self.bundle = self._path('site.bundle')
+
+    def _getTargetClass(self):
+        from zope.configuration.bundle import Bundle
+        return Bundle
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def _save(self, name):
+        from zope.configuration.bundle import saveBundle
+        return saveBundle(self.bundle, name)
+
+    def _load(self, name, bundle=None):
+        from zope.configuration.xmlconfig import file
+        context = self._makeContext()
+        self.included = []
+        context.subscribe('includeStarted', self.included.append)
+        file(name, context=context, execute=False, bundle=bundle)
+        self.assertIsNone(context.file_access)
+        return context
+
+    def test_load_without_files(self):
+        import os
+        import shutil
+        site = os.path.join(self.tmpdir, 'app', 'site.zcml')
+        saved = self._summarize(self._save(site))
+        self.assertEqual(saved[0], ['a', 'b', 'template'])
+        self.assertEqual(saved, self._summarize(self._load(site)))
+
+        shutil.rmtree(os.path.join(self.tmpdir, 'app'))
+        loaded = self._summarize(self._load(site, self.bundle))
+        self.assertEqual(loaded, saved)
+
+    def test_paths_relative_to_sys_path(self):
+        import os
+        import shutil
+        import sys
+
+        from zope.configuration.xmlconfig import ZopeXMLConfigurationError
+        original = os.path.join(self.tmpdir, 'app')
+        sys.path.append(original)
+        try:
+            self._save(os.path.join(original, 'site.zcml'))
+        finally:
+            sys.path.remove(original)
+
+        # The files are installed elsewhere, or not at all.
+        moved = os.path.join(self.tmpdir, 'moved')
+        shutil.move(original, moved)
+        os.remove(os.path.join(moved, 'sub', 'a.zcml'))
+        os.remove(os.path.join(moved, 'template.zcml.in'))
+        site = os.path.join(moved, 'site.zcml')
+        sys.path.append(moved)
+        try:
+            with self.assertRaises(ZopeXMLConfigurationError):
+                self._load(site)
+            context = self._load(site, self.bundle)
+        finally:
+            sys.path.remove(moved)
+
+        self.assertEqual(sorted(context._features), ['a', 'b', 'template'])
+        # The files have the names they would have on disk.
+        self.assertEqual(self.included[:4], [
+            site,
+            os.path.join(moved, 'sub', 'a.zcml'),
+            os.path.join(moved, 'sub', 'b.zcml'),
+            os.path.join(moved, 'template.zcml.in'),
+        ])
+
+    def test_open_and_glob(self):
+        import os
+        site = os.path.join(self.tmpdir, 'app', 'site.zcml')
+        self._save(site)
+        with self._makeOne(self.bundle) as bundle:
+            with bundle.open(site) as f:
+                self.assertEqual(f.name, site)
+                self.assertEqual(f.read().decode('utf-8'), SITE)
+            template = os.path.join(self.tmpdir, 'app', 'template.zcml')
+            with bundle.open(template) as f:
+                self.assertEqual(f.name, template + '.in')
+            pattern = os.path.join(self.tmpdir, 'app', 'sub', '*.zcml')
+            self.assertEqual(
+                sorted(bundle.glob(pattern)),
+                [os.path.join(self.tmpdir, 'app', 'sub', name)
+                 for name in ('a.zcml', 'b.zcml')])
+
+            # Other files are read from disk.
+            self._write('other.zcml', 'other')
+            other = os.path.join(self.tmpdir, 'other.zcml')
+            with bundle.open(other) as f:
+                self.assertEqual(f.read(), 'other')
+            self.assertEqual(bundle.glob(os.path.join(self.tmpdir, '*.zcml')),
+                             [other])
+            with self.assertRaises(FileNotFoundError):
+                bundle.open(os.path.join(self.tmpdir, 'missing.zcml'))
+
+    def test_not_a_bundle(self):
+        from zope.configuration.exceptions import ConfigurationError
+        for data in (b'', b'ZCMLBNDL', b'not a bundle, but long enough'):
+            with open(self.bundle, 'wb') as f:
+                f.write(data)
+            with self.assertRaises(ConfigurationError):
+                self._makeOne(self.bundle)
@@ -0,0 +1,394 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Test zope.configuration.cache.
+"""
+import unittest
+
+
+NS = 'ns'
+FOO = 'foo'
+A = 'a'
+AVALUE = 'avalue'
+
+
+class EventRecorderTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zope.configuration.cache import EventRecorder
+        return EventRecorder
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_records_and_forwards(self):
+        from zope.configuration.cache import CHARACTERS
+        from zope.configuration.cache import END
+        from zope.configuration.cache import START
+        handler = HandlerStub()
+        locator = LocatorStub('f.zcml', 1, 0)
+        recorder = self._makeOne(handler)
+        recorder.setDocumentLocator(locator)
+        recorder.startElementNS((NS, FOO), None, {(None, A): AVALUE})
+        recorder.characters('x')
+        recorder.characters('y')
+        locator.line, locator.column = 2, 4
+        recorder.endElementNS((NS, FOO), None)
+        self.assertEqual(recorder.events, [
+            (START, (NS, FOO), (((None, A), AVALUE),), 1, 0, 2),
+            (CHARACTERS, 'xy'),
+            (END, (NS, FOO), 2, 4),
+        ])
+        self.assertIs(handler.locator, locator)
+        self.assertEqual(handler.calls, [
+            ('start', (NS, FOO), {(None, A): AVALUE}, 1, 0),
+            ('characters', 'x'),
+            ('characters', 'y'),
+            ('end', (NS, FOO), 2, 4),
+        ])
+
+
+class Test_replay(unittest.TestCase):
+
+    def _callFUT(self, *args, **kw):
+        from zope.configuration.cache import replay
+        return replay(*args, **kw)
+
+    def test_replays_positions(self):
+        from zope.configuration.cache import CHARACTERS
+        from zope.configuration.cache import END
+        from zope.configuration.cache import START
+        handler = HandlerStub()
+        self._callFUT([
+            (START, (NS, FOO), (((None, A), AVALUE),), 1, 0),
+            (CHARACTERS, 'xy'),
+            (END, (NS, FOO), 2, 4),
+        ], handler, 'f.zcml')
+        self.assertEqual(handler.locator.getSystemId(), 'f.zcml')
+        self.assertEqual(handler.calls, [
+            ('start', (NS, FOO), {(None, A): AVALUE}, 1, 0),
+            ('characters', 'xy'),
+            ('end', (NS, FOO), 2, 4),
+        ])
+
+    def test_skips_ignored_elements(self):
+        from zope.configuration.cache import EventRecorder
+        recorder = EventRecorder(HandlerStub())
+        recorder.setDocumentLocator(LocatorStub('f.zcml', 1, 0))
+        recorder.startElementNS((NS, 'outer'), None, {})
+        recorder.startElementNS((NS, 'skip'), None, {})
+        recorder.startElementNS((NS, FOO), None, {})
+        recorder.characters('x')
+        recorder.endElementNS((NS, FOO), None)
+        recorder.endElementNS((NS, 'skip'), None)
+        recorder.startElementNS((NS, FOO), None, {})
+        recorder.endElementNS((NS, FOO), None)
+        recorder.endElementNS((NS, 'outer'), None)
+        self.assertEqual([event[-1] for event in recorder.events
+                          if len(event) == 6], [8, 5, 4, 7])
+
+        handler = IgnoringHandlerStub()
+        self._callFUT(recorder.events, handler, 'f.zcml')
+        self.assertEqual([call[:2] for call in handler.calls], [
+            ('start', (NS, 'outer')),
+            ('start', (NS, 'skip')),
+            ('end', (NS, 'skip')),
+            ('start', (NS, FOO)),
+            ('end', (NS, FOO)),
+            ('end', (NS, 'outer')),
+        ])
+        self.assertEqual(handler.ignore_depth, 0)
+
+
+class ParseCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _getTargetClass(self):
+        from zope.configuration.cache import ParseCache
+        return ParseCache
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def _makeFile(self, name, text):
+        import os
+        path = os.path.join(self.tmpdir, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def _fingerprint(self, cache, path):
+        with open(path) as f:
+            return cache.fingerprint(f)
+
+    def test_miss(self):
+        cache = self._makeOne(self.tmpdir)
+        path = self._makeFile('a.zcml', '<configure/>')
+        self.assertIsNone(cache.load(self._fingerprint(cache, path)))
+
+    def test_store_and_load(self):
+        import os
+        cache = self._makeOne(os.path.join(self.tmpdir, 'cache'))
+        path = self._makeFile('a.zcml', '<configure/>')
+        cache.store(self._fingerprint(cache, path), [(2, 'text')])
+        self.assertEqual(cache.load(self._fingerprint(cache, path)),
+                         [(2, 'text')])
+
+    def test_store_failure_is_ignored(self):
+        import os
+        path = self._makeFile('a.zcml', '<configure/>')
+        blocker = self._makeFile('blocker', '')
+        cache = self._makeOne(os.path.join(blocker, 'cache'))
+        cache.store(self._fingerprint(cache, path), [(2, 'text')])
+        self.assertIsNone(cache.load(self._fingerprint(cache, path)))
+
+        # The temporary file is removed if the entry can't be written.
+        cache = self._makeOne(self.tmpdir)
+        cache.store(self._fingerprint(cache, path), [(2, lambda: None)])
+        self.assertIsNone(cache.load(self._fingerprint(cache, path)))
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),
+                         ['a.zcml', 'blocker'])
+
+    def test_unwritable_cache_doesnt_fail_include(self):
+        import os
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.xmlconfig import file
+        from zope.configuration.xmlconfig import registerCommonDirectives
+        path = self._makeFile('a.zcml', """\
+<configure xmlns="http://namespaces.zope.org/zope"
+           xmlns:meta="http://namespaces.zope.org/meta">
+  <meta:provides feature="parsed" />
+</configure>
+""")
+        blocker = self._makeFile('blocker', '')
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        context.parse_cache = self._makeOne(os.path.join(blocker, 'cache'))
+        file(path, context=context)
+        self.assertTrue(context.hasFeature('parsed'))
+
+    def test_changed_file_is_a_miss(self):
+        import os
+        cache = self._makeOne(self.tmpdir)
+        path = self._makeFile('a.zcml', '<configure/>')
+        cache.store(self._fingerprint(cache, path), [(2, 'text')])
+        self._makeFile('a.zcml', '<configure></configure>')
+        self.assertIsNone(cache.load(self._fingerprint(cache, path)))
+        # Same size, different modification time
+        self._makeFile('a.zcml', '<configure/>')
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertIsNone(cache.load(self._fingerprint(cache, path)))
+
+    def test_damaged_entry_is_a_miss(self):
+        import os
+        cache = self._makeOne(self.tmpdir)
+        path = self._makeFile('a.zcml', '<configure/>')
+        cache.store(self._fingerprint(cache, path), [(2, 'text')])
+        for name in os.listdir(self.tmpdir):
+            if name.endswith('.events'):
+                with open(os.path.join(self.tmpdir, name), 'wb') as f:
+                    f.write(b'garbage')
+        self.assertIsNone(cache.load(self._fingerprint(cache, path)))
+
+    def test_unloadable_entry_is_a_miss(self):
+        import operator
+        import os
+        import pickle
+
+        class _Raising:
+            def __init__(self, *args):
+                self.args = args
+
+            def __reduce__(self):
+                return self.args
+
+        cache = self._makeOne(self.tmpdir)
+        path = self._makeFile('a.zcml', '<configure/>')
+        fingerprint = self._fingerprint(cache, path)
+        cache.store(fingerprint, [(2, 'text')])
+        names = [name for name in os.listdir(self.tmpdir)
+                 if name.endswith('.events')]
+        for data in (b'cnonesuch_module\nx\n.',  # ImportError
+                     b'cos\nnonesuch\n.',  # AttributeError
+                     pickle.dumps(_Raising(operator.getitem, ({}, 'x'))),
+                     pickle.dumps(_Raising(operator.getitem, ([], 0)))):
+            with open(os.path.join(self.tmpdir, names[0]), 'wb') as f:
+                f.write(data)
+            self.assertIsNone(cache.load(fingerprint), data)
+
+    def test_fingerprint_wo_real_file(self):
+        import io
+        cache = self._makeOne(self.tmpdir)
+        f = io.StringIO('<configure/>')
+        self.assertIsNone(cache.fingerprint(f))
+        f.name = '<string>'
+        self.assertIsNone(cache.fingerprint(f))
+
+    def test_fingerprint_of_closed_file(self):
+        cache = self._makeOne(self.tmpdir)
+        path = self._makeFile('a.zcml', '<configure/>')
+        with open(path) as f:
+            pass
+        self.assertIsNone(cache.fingerprint(f))
+
+
+class ParseCacheIntegrationTests(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _load(self, parse_cache):
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.tests import samplepackage
+        from zope.configuration.xmlconfig import file
+        from zope.configuration.xmlconfig import registerCommonDirectives
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        context.parse_cache = parse_cache
+        file('configure.zcml', samplepackage, context=context,
+             execute=False)
+        return context
+
+    def _summarize(self, actions):
+        return [(action['discriminator'], repr(action['info']),
+                 action['info'].text, action['includepath'])
+                for action in actions]
+
+    def test_warm_load_does_not_parse(self):
+        from zope.configuration import xmlconfig
+        from zope.configuration.cache import ParseCache
+        from zope.configuration.tests.test_xmlconfig import _Monkey
+        cold = self._load(ParseCache(self.tmpdir))
+
+        def make_parser():
+            raise AssertionError("Should not parse")
+        with _Monkey(xmlconfig, make_parser=make_parser):
+            warm = self._load(ParseCache(self.tmpdir))
+        self.assertEqual(self._summarize(warm.actions),
+                         self._summarize(cold.actions))
+        self.assertEqual(self._summarize(warm.actions),
+                         self._summarize(self._load(None).actions))
+
+    def test_conditions_evaluated_on_replay(self):
+        from zope.configuration import tests
+        from zope.configuration.cache import ParseCache
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.xmlconfig import file
+        from zope.configuration.xmlconfig import registerCommonDirectives
+
+        def load(*features):
+            context = ConfigurationMachine()
+            registerCommonDirectives(context)
+            context.parse_cache = ParseCache(self.tmpdir)
+            for feature in features:
+                context.provideFeature(feature)
+            file('conditions.zcml', tests, context=context, execute=False)
+            return [action['discriminator'] for action in context.actions]
+
+        cold = load()
+        warm = load('undefinedfeature')
+        self.assertNotIn(('Register', 'false.condition.nested.in.true'),
+                         cold)
+        self.assertIn(('Register', 'false.condition.nested.in.true'),
+                      warm)
+
+    def test_replay_skipping_false_conditions_matches_parsing(self):
+        from zope.configuration import tests
+        from zope.configuration.cache import ParseCache
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.xmlconfig import file
+        from zope.configuration.xmlconfig import registerCommonDirectives
+
+        def load(parse_cache):
+            context = ConfigurationMachine()
+            registerCommonDirectives(context)
+            context.parse_cache = parse_cache
+            file('conditions.zcml', tests, context=context, execute=False)
+            return self._summarize(context.actions)
+
+        cold = load(ParseCache(self.tmpdir))
+        warm = load(ParseCache(self.tmpdir))
+        self.assertEqual(warm, cold)
+        self.assertEqual(warm, load(None))
+
+
+class HandlerStub:
+
+    locator = None
+
+    def __init__(self):
+        self.calls = []
+
+    def setDocumentLocator(self, locator):
+        self.locator = locator
+
+    def startElementNS(self, name, qname, attrs):
+        self.calls.append(('start', name, dict(attrs),
+                           self.locator.getLineNumber(),
+                           self.locator.getColumnNumber()))
+
+    def endElementNS(self, name, qname):
+        self.calls.append(('end', name,
+                           self.locator.getLineNumber(),
+                           self.locator.getColumnNumber()))
+
+    def characters(self, text):
+        self.calls.append(('characters', text))
+
+
+class IgnoringHandlerStub(HandlerStub):
+    # Ignores the elements named 'skip' like ConfigurationHandler
+    # ignores elements with false conditions.
+
+    ignore_depth = 0
+
+    def startElementNS(self, name, qname, attrs):
+        super().startElementNS(name, qname, attrs)
+        if self.ignore_depth:
+            self.ignore_depth += 1
+        elif name[1] == 'skip':
+            self.ignore_depth = 1
+
+    def endElementNS(self, name, qname):
+        super().endElementNS(name, qname)
+        if self.ignore_depth:
+            self.ignore_depth -= 1
+
+
+class LocatorStub:
+
+    def __init__(self, file, line, column):
+        self.file, self.line, self.column = file, line, column
+
+    def getSystemId(self):
+        return self.file
+
+    def getLineNumber(self):
+        return self.line
+
+    def getColumnNumber(self):
+        return self.column
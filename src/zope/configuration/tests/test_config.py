@@ -116,6 +116,71 @@ class ConfigurationContextTests(unittest.TestCase):
         with self.assertRaises(ImportError):
             c.resolve('zope.configuration.tests.victim.nosuch')
 
+    def test_resolve_cached(self):
+        import zope.configuration
+        from zope.configuration.config import clearResolveCache
+        from zope.configuration.config import resolveCacheInfo
+        clearResolveCache()
+        c = self._makeOne()
+        c.package = zope.configuration
+        self.assertIs(
+            c.resolve('zope.configuration.config.ConfigurationContext'),
+            self._getTargetClass())
+        self.assertIs(c.resolve('.config.ConfigurationContext'),
+                      self._getTargetClass())
+        self.assertIs(c.resolve('zope.configuration.tests'),
+                      zope.configuration.tests)
+        self.assertIs(c.resolve('..configuration.tests'),
+                      zope.configuration.tests)
+        self.assertEqual(resolveCacheInfo(),
+                         {'hits': 2, 'misses': 2, 'size': 2})
+        clearResolveCache()
+        self.assertEqual(resolveCacheInfo(),
+                         {'hits': 0, 'misses': 0, 'size': 0})
+
+    def test_resolve_cached_w_submodule(self):
+        import zope.configuration.tests as zct
+        from zope.configuration.config import clearResolveCache
+        from zope.configuration.config import resolveCacheInfo
+        clearResolveCache()
+        self.assertNotIn('notyet', zct.__dict__)
+        c = self._makeOne()
+        try:
+            mod = c.resolve('zope.configuration.tests.notyet')
+            self.assertIs(mod, zct.notyet)
+            self.assertIs(c.resolve('zope.configuration.tests.notyet'), mod)
+        finally:
+            del zct.notyet
+            del sys.modules['zope.configuration.tests.notyet']
+        self.assertEqual(resolveCacheInfo()['hits'], 1)
+
+    def test_resolve_cached_w_replaced_global(self):
+        from zope.configuration.tests import samplepackage
+        c = self._makeOne()
+        self.assertIs(c.resolve('zope.configuration.tests.samplepackage.foo'),
+                      samplepackage.foo)
+        orig = samplepackage.foo
+        samplepackage.foo = replacement = object()
+        try:
+            self.assertIs(
+                c.resolve('zope.configuration.tests.samplepackage.foo'),
+                replacement)
+        finally:
+            samplepackage.foo = orig
+
+    def test_resolve_cached_w_replaced_module(self):
+        import types
+        name = 'zope.configuration.tests.resolve_victim'
+        c = self._makeOne()
+        for value in 1, 2:
+            module = sys.modules[name] = types.ModuleType(name)
+            module.value = value
+            try:
+                self.assertIs(c.resolve(name), module)
+                self.assertEqual(c.resolve(name + '.value'), value)
+            finally:
+                del sys.modules[name]
+
     def test_path_w_absolute_filename(self):
         import os
         c = self._makeOne()
@@ -326,6 +391,212 @@ class ConfigurationContextTests(unittest.TestCase):
         c.provideFeature('a.feature')
         self.assertTrue(c.hasFeature('a.feature'))
 
+    def test_isInstalled_does_not_import(self):
+        import zope.configuration.tests as zct
+        c = self._makeOne()
+        try:
+            self.assertTrue(c.isInstalled('zope.configuration.tests.victim'))
+            self.assertNotIn('zope.configuration.tests.victim', sys.modules)
+        finally:
+            zct.__dict__.pop('victim', None)
+        self.assertFalse(c.isInstalled('zope.configuration.tests.nonesuch'))
+        self.assertFalse(c.isInstalled('nonesuch.package'))
+        self.assertEqual(c._consulted_installed,
+                         {'zope.configuration.tests.victim': True,
+                          'zope.configuration.tests.nonesuch': False,
+                          'nonesuch.package': False})
+
+    def test_isInstalled_cached(self):
+        c = self._makeOne()
+        c._installed['nonesuch'] = True
+        self.assertTrue(c.isInstalled('nonesuch'))
+        self.assertEqual(c._consulted_installed, {'nonesuch': True})
+
+    def test_scanInstalled(self):
+        import os
+        import shutil
+        import tempfile
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(tmpdir, 'listed.py'), 'w'):
+                pass
+            c = self._makeOne()
+            c._installed['cached'] = False
+            c.scanInstalled(['listed', 'os', 'nonesuch', 'cached'],
+                            [tmpdir])
+        finally:
+            shutil.rmtree(tmpdir)
+        self.assertEqual(c._installed, {'listed': True, 'os': True,
+                                        'nonesuch': False, 'cached': False})
+        self.assertEqual(c._consulted_installed, {})
+
+
+class Test__listedInstalled(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _callFUT(self, *args, **kw):
+        from zope.configuration.config import _listedInstalled
+        return _listedInstalled(*args, **kw)
+
+    def _write(self, *names):
+        import os
+        path = os.path.join(self.tmpdir, *names)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w'):
+            pass
+
+    def _path(self, *names):
+        import os
+        return os.path.join(self.tmpdir, *names)
+
+    def test_modules_and_packages(self):
+        self._write('one', 'top.py')
+        self._write('one', 'pkg', '__init__.py')
+        self._write('one', 'pkg', 'sub.py')
+        self._write('one', 'pkg', 'subpkg', '__init__.py')
+        self._write('two', 'ns', 'a.py')
+        self._write('three', 'ns', 'b', 'x.txt')
+        names = ['top', 'pkg', 'pkg.sub', 'pkg.subpkg', 'pkg.nonesuch',
+                 'ns', 'ns.a', 'ns.b', 'ns.c', 'nonesuch', 'nonesuch.x']
+        self.assertEqual(
+            self._callFUT(names, [self._path('one'), self._path('two'),
+                                  self._path('three'), self._path('none'),
+                                  None]),
+            ['top', 'pkg', 'pkg.sub', 'pkg.subpkg', 'ns', 'ns.a', 'ns.b'])
+
+    def test_regular_package_hides_later_portions(self):
+        self._write('one', 'reg', '__init__.py')
+        self._write('one', 'mod.py')
+        self._write('two', 'reg', 'x.py')
+        self._write('two', 'mod', 'x.py')
+        self.assertEqual(
+            self._callFUT(['reg.x', 'mod.x'],
+                          [self._path('one'), self._path('two')]),
+            [])
+
+    def test_default_path(self):
+        self.assertEqual(self._callFUT(['zope.configuration', 'nonesuch']),
+                         ['zope.configuration'])
+
+
+class IncludePathTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zope.configuration.config import IncludePath
+        return IncludePath
+
+    def _root(self):
+        return self._getTargetClass().root
+
+    def test_root(self):
+        root = self._root()
+        self.assertEqual(root, ())
+        self.assertEqual(len(root), 0)
+        self.assertFalse(root)
+        self.assertIsNone(root.parent)
+        self.assertEqual(hash(root), hash(()))
+
+    def test_interned(self):
+        root = self._root()
+        path = root + ('a', 'b')
+        self.assertIs(path, root.child('a').child('b'))
+        self.assertIs(path, ('a',) + (root + ('b',)))
+        self.assertIs(path, root + (root + ('a', 'b')))
+        self.assertEqual(path.depth, 2)
+        self.assertIs(path.parent.parent, root)
+        self.assertIn(path, list(root.walk()))
+
+    def test_unused_paths_are_dropped(self):
+        import gc
+        root = self._root()
+        path = root + ('unused', 'b')
+        self.assertIn('unused', root.children)
+        parent = path.parent
+        del path
+        gc.collect()
+        self.assertEqual(list(parent.children), [])
+        del parent
+        gc.collect()
+        self.assertNotIn('unused', root.children)
+
+    def test_resolveConflicts_doesnt_intern_tuples(self):
+        from zope.configuration.config import ConfigurationConflictError
+        from zope.configuration.config import expand_action
+        from zope.configuration.config import resolveConflicts
+        root = self._root()
+        actions = [expand_action('a', includepath=('throwaway', 'b')),
+                   expand_action('a', includepath=('throwaway',))]
+        self.assertEqual(len(resolveConflicts(actions)), 1)
+        actions.append(expand_action('a', includepath=('throwaway',)))
+        self.assertRaises(ConfigurationConflictError,
+                          resolveConflicts, actions)
+        self.assertNotIn('throwaway', root.children)
+
+    def test_sequence(self):
+        path = self._root() + ('a', 'b', 'c')
+        self.assertEqual(path, ('a', 'b', 'c'))
+        self.assertEqual(('a', 'b', 'c'), path)
+        self.assertNotEqual(path, ('a', 'b'))
+        self.assertNotEqual(path, ['a', 'b', 'c'])
+        self.assertEqual(hash(path), hash(('a', 'b', 'c')))
+        self.assertEqual(list(path), ['a', 'b', 'c'])
+        self.assertEqual(path[:2], ('a', 'b'))
+        self.assertEqual(path[-1], 'c')
+        self.assertEqual(repr(path), "('a', 'b', 'c')")
+        self.assertEqual({path: 1}[('a', 'b', 'c')], 1)
+        self.assertRaises(TypeError, lambda: path + ['d'])
+        self.assertRaises(TypeError, lambda: ['d'] + path)
+
+    def test_ordering(self):
+        root = self._root()
+        a, ab, b = root + ('a',), root + ('a', 'b'), root + ('b',)
+        self.assertEqual(sorted([b, ab, ('a', 'a'), a]),
+                         [a, ('a', 'a'), ab, b])
+        self.assertTrue(a <= ab < b)
+        self.assertTrue(b >= ab > a)
+        self.assertTrue(('a',) < b)
+        for op in ('__lt__', '__le__', '__gt__', '__ge__'):
+            self.assertIs(getattr(a, op)(1), NotImplemented)
+
+    def test_isPrefixOf(self):
+        root = self._root()
+        path = root + ('a', 'b')
+        self.assertTrue(root.isPrefixOf(path))
+        self.assertTrue(path.parent.isPrefixOf(path))
+        self.assertTrue(path.isPrefixOf(path))
+        self.assertFalse(path.isPrefixOf(path.parent))
+        self.assertFalse((root + ('b',)).isPrefixOf(path))
+
+    def test_pickle(self):
+        import pickle
+        path = self._root() + ('a', 'b')
+        self.assertIs(pickle.loads(pickle.dumps(path)), path)
+
+    def test_w_include(self):
+        from zope.configuration.tests import samplepackage
+        from zope.configuration.tests.samplepackage import foo
+        from zope.configuration.xmlconfig import file
+        try:
+            context = file('bar.zcml', samplepackage, execute=False)
+        finally:
+            del foo.data[:]
+        paths = [action.includepath for action in context.actions]
+        # bar.zcml includes bar1.zcml and bar2.zcml, which include
+        # configure.zcml
+        self.assertEqual(len(set(map(id, paths))), 4)
+        self.assertEqual(set(map(len, paths)), {2, 3})
+        for path in paths:
+            self.assertEqual(path[0], paths[0][0])
+            self.assertIsInstance(path, self._getTargetClass())
+            self.assertIn(path, list(self._root().walk()))
+
 
 class ConfigurationAdapterRegistryTests(unittest.TestCase):
 
@@ -834,6 +1105,319 @@ class ConfigurationMachineTests(
             }),
         ])
 
+    def _makeBatchable(self, calls, error=None):
+        from zope.configuration.config import batchable
+
+        def _batch(items):
+            batch = []
+            calls.append(batch)
+            for args, kw in items:
+                if args == ('fail',):
+                    raise error
+                batch.append(args)
+
+        @batchable(_batch)
+        def _register(*args):
+            calls.append(args)
+        return _register
+
+    def test_execute_actions_w_batch(self):
+        calls = []
+        _register = self._makeBatchable(calls)
+
+        def _other():
+            calls.append('other')
+
+        cm = self._makeOne()
+        cm.action(None, _register, (1,))
+        cm.action(None, _register, (2,))
+        cm.action(None, _register, (3,), order=1)
+        cm.action(None, _other)
+        cm.action(None, _register, (4,))
+        cm.action(None, _register, (5,), order=1)
+        cm.action(None, _register, (6,), order=1)
+        cm.execute_actions()
+        self.assertEqual(
+            calls, [[(1,), (2,)], 'other', (4,), [(3,), (5,), (6,)]])
+
+    def test_execute_actions_w_batch_errors(self):
+        from zope.configuration.config import ConfigurationExecutionError
+        calls = []
+        _register = self._makeBatchable(calls, ValueError('XXX'))
+        cm = self._makeOne()
+        cm.action(None, _register, (1,), info='one')
+        cm.action(None, _register, ('fail',), info='two')
+        cm.action(None, _register, (3,), info='three')
+        with self.assertRaises(ConfigurationExecutionError) as exc:
+            cm.execute_actions()
+        self.assertEqual(exc.exception.info, 'two')
+        self.assertEqual(str(exc.exception.evalue), 'XXX')
+        self.assertEqual(calls, [[(1,)]])
+
+    def test_execute_actions_w_batch_configuration_error(self):
+        from zope.configuration.exceptions import ConfigurationError
+        error = ConfigurationError('bad')
+        _register = self._makeBatchable([], error)
+        cm = self._makeOne()
+        cm.action(None, _register, ('fail',), info='one')
+        cm.action(None, _register, (2,), info='two')
+        with self.assertRaises(ConfigurationError) as exc:
+            cm.execute_actions()
+        self.assertIs(exc.exception, error)
+        self.assertIn('one', str(error))
+
+    def test_execute_actions_w_batch_and_lazy_globals(self):
+        from zope.configuration.fields import DeferredReference
+        from zope.configuration.fields import GlobalObject
+        calls = []
+        _register = self._makeBatchable(calls)
+        cm = self._makeOne()
+        cm.lazy_globals = True
+        field = GlobalObject().bind(cm)
+        cm.action(None, _register, (DeferredReference('sys.path', field),))
+        cm.action(None, _register, (DeferredReference('sys.argv', field),))
+        cm.execute_actions()
+        self.assertEqual(calls, [[(sys.path,), (sys.argv,)]])
+
+    def test_execute_actions_w_threadsafe_actions(self):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        log = []
+        barrier = threading.Barrier(3, timeout=10)
+
+        def _parallel(name):
+            barrier.wait()
+            log.append(name)
+
+        def _serial(name):
+            log.append(name)
+
+        cm = self._makeOne()
+        cm.action(None, _serial, ('first',), threadsafe=True)
+        cm.action(None, _serial, ('serial',))
+        for name in 'abc':
+            cm.action(None, _parallel, (name,), threadsafe=True)
+        cm.action(None, _serial, ('last',))
+        with ThreadPoolExecutor(3) as executor:
+            cm.action_executor = executor
+            cm.execute_actions()
+        self.assertEqual(log[:2], ['first', 'serial'])
+        self.assertEqual(sorted(log[2:5]), ['a', 'b', 'c'])
+        self.assertEqual(log[5:], ['last'])
+
+    def test_execute_actions_w_threadsafe_actions_by_order(self):
+        from concurrent.futures import ThreadPoolExecutor
+        log = []
+        cm = self._makeOne()
+        cm.action(None, log.append, (2,), order=2, threadsafe=True)
+        cm.action(None, log.append, (1,), order=1, threadsafe=True)
+        cm.action(None, log.append, (3,), order=2, threadsafe=True)
+        with ThreadPoolExecutor(1) as executor:
+            cm.action_executor = executor
+            cm.execute_actions()
+        self.assertEqual(log, [1, 2, 3])
+
+    def test_execute_actions_w_threadsafe_actions_errors(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        from zope.configuration.config import ConfigurationExecutionError
+
+        def _err(message):
+            raise ValueError(message)
+
+        cm = self._makeOne()
+        cm.action(None, _err, ('one',), info='one', threadsafe=True)
+        cm.action(None, _err, ('two',), info='two', threadsafe=True)
+        with ThreadPoolExecutor(2) as executor:
+            cm.action_executor = executor
+            with self.assertRaises(ConfigurationExecutionError) as exc:
+                cm.execute_actions()
+        self.assertEqual(exc.exception.info, 'one')
+        self.assertEqual(str(exc.exception.evalue), 'one')
+
+    def test_subscribe_events(self):
+        from zope.configuration.config import batchable
+        from zope.configuration.tests import samplepackage
+        from zope.configuration.xmlconfig import file
+        from zope.configuration.xmlconfig import registerCommonDirectives
+
+        events = []
+
+        def _subscriber(event):
+            def subscriber(*args):
+                events.append((event,) + args)
+            return subscriber
+
+        cm = self._makeOne()
+        registerCommonDirectives(cm)
+        for event in ('directiveStarted', 'directiveFinished',
+                      'includeStarted', 'includeFinished', 'actionAdded',
+                      'conflictsResolved', 'actionExecuted'):
+            cm.subscribe(event, _subscriber(event))
+        file('configure.zcml', samplepackage, context=cm, execute=False)
+        batched = []
+
+        @batchable(batched.extend)
+        def _batched(name):
+            raise AssertionError("Not batched")
+
+        cm.action('x', _batched, ('x',))
+        cm.action('y', _batched, ('y',))
+        actions = list(cm.actions)
+        cm.execute_actions()
+
+        self.assertEqual(events[0][0], 'includeStarted')
+        self.assertTrue(events[0][1].endswith('configure.zcml'))
+        self.assertEqual(events[1][0], 'directiveStarted')
+        self.assertEqual(events[1][1],
+                         ('http://namespaces.zope.org/zope', 'configure'))
+        started = [event for event in events
+                   if event[0] == 'directiveStarted']
+        finished = [event for event in events
+                    if event[0] == 'directiveFinished']
+        self.assertEqual(len(started), len(finished))
+        self.assertEqual([event[1] for event in finished][-1],
+                         events[1][2])
+        self.assertEqual([event[1] for event in events
+                          if event[0] == 'actionAdded'], actions)
+        self.assertEqual(events.index(('conflictsResolved', actions)),
+                         len(events) - len(actions) - 1)
+        self.assertEqual(events[-len(actions):],
+                         [('actionExecuted', action) for action in actions])
+        self.assertEqual(batched, [(('x',), {}), (('y',), {})])
+
+    def test_failed_directives_keep_stacks_balanced(self):
+        from zope.interface import Interface
+
+        from zope.configuration.config import ConfigurationError
+        from zope.configuration.config import defineSimpleDirective
+        from zope.configuration.profiling import Profiler
+
+        def _handler(_context):
+            raise ValueError('failed')
+
+        NS = 'http://namespaces.zope.org/test'
+        events = []
+        cm = self._makeOne()
+        cm.profiler = Profiler()
+        defineSimpleDirective(cm, 'fail', Interface, _handler, namespace=NS)
+        cm.subscribe('directiveStarted',
+                     lambda name, info: events.append(('started', info)))
+        cm.subscribe('directiveFinished',
+                     lambda info: events.append(('finished', info)))
+        self.assertRaises(ConfigurationError, cm.begin, (NS, 'nonesuch'),
+                          None, 'unknown')
+        cm.begin((NS, 'fail'), None, 'handler')
+        self.assertRaises(ValueError, cm.end)
+        self.assertEqual(len(cm.stack), 1)
+        self.assertEqual(cm.profiler._stack, [])
+        self.assertEqual(events, [('started', 'unknown'),
+                                  ('finished', 'unknown'),
+                                  ('started', 'handler'),
+                                  ('finished', 'handler')])
+
+    def test_unsubscribe(self):
+        events = []
+        cm = self._makeOne()
+        cm.subscribe('actionAdded', events.append)
+        cm.subscribe('actionExecuted', events.append)
+        cm.action(None, events.append, ('called',))
+        cm.unsubscribe('actionAdded', events.append)
+        cm.unsubscribe('actionAdded', events.append)
+        cm.unsubscribe('nonesuch', events.append)
+        self.assertEqual(list(cm._subscribers), ['actionExecuted'])
+        cm.action(None, events.append, ('called',))
+        actions = list(cm.actions)
+        cm.unsubscribe('actionExecuted', events.append)
+        self.assertEqual(cm._subscribers, {})
+        cm.execute_actions()
+        self.assertEqual(events, [actions[0], 'called', 'called'])
+
+    def test_subscribe_unknown_event(self):
+        cm = self._makeOne()
+        self.assertRaises(ValueError, cm.subscribe, 'nonesuch', print)
+
+    def test_execute_actions_w_lazy_globals(self):
+        from zope.interface import Interface
+
+        from zope.configuration.config import ConfigurationExecutionError
+        from zope.configuration.config import defineSimpleDirective
+        from zope.configuration.fields import GlobalObject
+        from zope.configuration.xmlconfig import string
+
+        class ISchema(Interface):
+            target = GlobalObject(lazy=True)
+
+        _called_with = []
+
+        def _handler(_context, target):
+            _context.action(None, _called_with.append, (target,))
+
+        cm = self._makeOne()
+        cm.lazy_globals = True
+        defineSimpleDirective(cm, 'lazy', ISchema, _handler,
+                              namespace='http://namespaces.zope.org/test')
+        sys.modules.pop('zope.configuration.tests.notyet', None)
+        try:
+            string('<lazy xmlns="http://namespaces.zope.org/test"'
+                   ' target="zope.configuration.tests.notyet" />',
+                   context=cm, execute=False)
+            self.assertNotIn('zope.configuration.tests.notyet', sys.modules)
+            cm.execute_actions()
+            self.assertEqual(_called_with,
+                             [sys.modules['zope.configuration.tests.notyet']])
+        finally:
+            import zope.configuration.tests as zct
+            zct.__dict__.pop('notyet', None)
+            sys.modules.pop('zope.configuration.tests.notyet', None)
+
+        string('<lazy xmlns="http://namespaces.zope.org/test"'
+               ' target="zope.configuration.tests.nonesuch" />',
+               context=cm, execute=False)
+        with self.assertRaises(ConfigurationExecutionError) as exc:
+            cm.execute_actions()
+        self.assertIn('line 1.0', repr(exc.exception.info))
+
+    def test_execute_actions_w_lazy_globals_conflicts(self):
+        import os
+
+        from zope.interface import Interface
+
+        from zope.configuration.config import ConfigurationConflictError
+        from zope.configuration.config import defineSimpleDirective
+        from zope.configuration.fields import GlobalObject
+        from zope.configuration.xmlconfig import string
+
+        class ISchema(Interface):
+            target = GlobalObject(lazy=True)
+
+        _called_with = []
+
+        def _handler(_context, target):
+            _context.action(('thing', target), _called_with.append, (target,))
+
+        def _load(*includepaths):
+            cm = self._makeOne()
+            cm.lazy_globals = True
+            defineSimpleDirective(cm, 'thing', ISchema, _handler,
+                                  namespace='http://namespaces.zope.org/test')
+            for includepath, target in zip(includepaths,
+                                           ('os.path.join', '.path.join')):
+                cm.includepath = includepath
+                cm.package = os
+                string('<thing xmlns="http://namespaces.zope.org/test"'
+                       ' target="%s" />' % target,
+                       context=cm, execute=False)
+            return cm
+
+        cm = _load((), ())
+        self.assertRaises(ConfigurationConflictError, cm.execute_actions)
+        self.assertEqual(_called_with, [])
+
+        cm = _load(('other.zcml',), ())
+        cm.execute_actions()
+        self.assertEqual(_called_with, [os.path.join])
+
     def test_execute_actions_w_errors_w_testing(self):
 
         def _err(*args, **kw):
@@ -2102,6 +2686,200 @@ class Test_toargs(unittest.TestCase):
             self.assertIn("TooSmall: (-1, 0)", exception_str)
 
 
+class Test_toargs_converters(unittest.TestCase):
+
+    def _callFUT(self, *args, **kw):
+        from zope.configuration.config import toargs
+        return toargs(*args, **kw)
+
+    def _makeSchema(self, calls, recurse=None):
+        from zope.interface import Interface
+        from zope.schema import Text
+
+        class Recording(Text):
+            def fromUnicode(self, value):
+                calls.append((self, self.context))
+                if recurse is not None and value == 'outer':
+                    recurse()
+                    calls.append((self, self.context))
+                return value
+
+        class ISchema(Interface):
+            a = Recording()
+        return ISchema
+
+    def test_reuses_bound_fields_with_current_context(self):
+        calls = []
+        ISchema = self._makeSchema(calls)
+        contexts = [FauxContext(), FauxContext()]
+        for context in contexts:
+            self.assertEqual(self._callFUT(context, ISchema, {'a': 'x'}),
+                             {'a': 'x'})
+        self.assertIs(calls[0][0], calls[1][0])
+        self.assertIsNot(calls[0][0], ISchema['a'])
+        self.assertEqual([context for _, context in calls], contexts)
+
+    def test_reentrant(self):
+        calls = []
+        inner = FauxContext()
+        ISchema = self._makeSchema(
+            calls, lambda: self._callFUT(inner, ISchema, {'a': 'inner'}))
+        outer = FauxContext()
+        self._callFUT(outer, ISchema, {'a': 'outer'})
+        self.assertIsNot(calls[0][0], calls[1][0])
+        self.assertIs(calls[0][0], calls[2][0])
+        self.assertEqual([context for _, context in calls],
+                         [outer, inner, outer])
+
+    def test_pooled_fields_dont_keep_context(self):
+        import gc
+        import weakref
+
+        from zope.configuration import tests
+        from zope.configuration.xmlconfig import file
+
+        context = file('simple.zcml', tests, execute=False)
+        ref = weakref.ref(context)
+        del context
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_custom_bind_bound_per_call(self):
+        from zope.interface import Interface
+
+        from zope.configuration.fields import GlobalObject
+        from zope.configuration.fields import Tokens
+
+        class ISchema(Interface):
+            names = Tokens(value_type=GlobalObject())
+
+        class Context(FauxContext):
+            def resolve(self, name):
+                return (self, name)
+
+        first, second = Context(), Context()
+        self.assertEqual(self._callFUT(first, ISchema, {'names': 'x'}),
+                         {'names': [(first, 'x')]})
+        self.assertEqual(self._callFUT(second, ISchema, {'names': 'x'}),
+                         {'names': [(second, 'x')]})
+
+    def test_keyword_arguments_read_when_needed(self):
+        from zope.interface import Interface
+
+        from zope.configuration.exceptions import ConfigurationError
+
+        class ISchema(Interface):
+            pass
+
+        context = FauxContext()
+        self.assertRaises(ConfigurationError,
+                          self._callFUT, context, ISchema, {'a': 'b'})
+        ISchema.setTaggedValue('keyword_arguments', True)
+        self.assertEqual(self._callFUT(context, ISchema, {'a': 'b'}),
+                         {'a': 'b'})
+
+    def test_schemas_with_same_name(self):
+        from zope.interface import Interface
+        from zope.schema import Text
+
+        class ISchema(Interface):
+            a = Text()
+
+        other = ISchema
+
+        class ISchema(Interface):
+            b = Text()
+
+        context = FauxContext()
+        self.assertEqual(self._callFUT(context, other, {'a': 'x'}),
+                         {'a': 'x'})
+        self.assertEqual(self._callFUT(context, ISchema, {'b': 'x'}),
+                         {'b': 'x'})
+
+    def test_compiled_when_defined(self):
+        from zope.interface import Interface
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.config import _converters
+        from zope.configuration.config import defineSimpleDirective
+
+        class ISchema(Interface):
+            pass
+
+        defineSimpleDirective(ConfigurationMachine(), 'x', ISchema,
+                              lambda context: None, namespace='ns')
+        self.assertIs(_converters[id(ISchema)][0], ISchema)
+
+
+class ActionTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zope.configuration.config import Action
+        return Action
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_attributes_and_keys(self):
+        action = self._makeOne(('a', 1), None, (1,), includepath=('p',),
+                               info='INFO', order=2)
+        self.assertEqual(action.discriminator, ('a', 1))
+        self.assertEqual(action.kw, {})
+        self.assertEqual(action['includepath'], ('p',))
+        action['callable'] = len
+        self.assertIs(action.callable, len)
+        self.assertEqual(len(action), 7)
+        self.assertEqual(list(action), ['discriminator', 'callable', 'args',
+                                        'kw', 'includepath', 'info', 'order'])
+        self.assertNotIn('extra', action)
+        self.assertRaises(KeyError, action.__getitem__, 'extra')
+        self.assertIsNone(action.get('extra'))
+        self.assertRaises(TypeError, action.__delitem__, 'info')
+        self.assertRaises(KeyError, action.__delitem__, 'extra')
+        self.assertFalse(hasattr(action, '__dict__'))
+
+    def test_extra(self):
+        action = self._makeOne(None, extra=1)
+        self.assertEqual(action['extra'], 1)
+        self.assertIn('extra', action)
+        action['more'] = 2
+        action['extra'] = 3
+        self.assertEqual(len(action), 9)
+        self.assertEqual(list(action)[7:], ['extra', 'more'])
+        del action['extra']
+        del action['more']
+        self.assertNotIn('more', action)
+        self.assertIsNone(action._extra)
+        action['new'] = 4
+        self.assertEqual(dict(action)['new'], 4)
+
+    def test_as_keywords_and_copy(self):
+        action = self._makeOne(('a',), order=1, extra=1)
+
+        def _action(**kw):
+            return kw
+        self.assertEqual(_action(**action), dict(action))
+        copy = action.copy()
+        self.assertIsNot(copy, action)
+        self.assertEqual(copy, action)
+        self.assertEqual(dict(action), copy)
+        self.assertNotEqual(action, self._makeOne(('a',), order=1))
+        self.assertNotEqual(action, ('a',))
+
+    def test_pickle(self):
+        import pickle
+        action = self._makeOne(('a',), order=1, extra=1)
+        self.assertEqual(pickle.loads(pickle.dumps(action)), action)
+
+    def test_repr(self):
+        action = self._makeOne(('a',), extra=1)
+        self.assertEqual(
+            repr(action),
+            "{'args': (), 'callable': None, 'discriminator': ('a',), "
+            "'extra': 1, 'includepath': (), 'info': None, 'kw': {}, "
+            "'order': 0}")
+
+
 class Test_expand_action(unittest.TestCase):
 
     def _callFUT(self, *args, **kw):
@@ -2201,6 +2979,16 @@ class Test_resolveConflicts(unittest.TestCase):
             'order': 0,
         }])
 
+    def test_converts_dict_actions(self):
+        from zope.configuration.config import Action
+        result = self._callFUT([
+            {'discriminator': 'a', 'callable': None, 'order': 1},
+            {'discriminator': None, 'callable': None, 'extra': 1},
+        ])
+        self.assertTrue(all(isinstance(a, Action) for a in result))
+        self.assertEqual([a.discriminator for a in result], [None, 'a'])
+        self.assertEqual(result[0]['extra'], 1)
+
     def test_wo_discriminator_clash(self):
         from zope.configuration.config import expand_action
 
@@ -2328,6 +3116,224 @@ class Test_resolveConflicts(unittest.TestCase):
         self.assertEqual([x['callable'] for x in self._callFUT(actions)],
                          [_b, _d, _c, _a])
 
+    def test_final_order_w_none_and_negative_orders(self):
+        from zope.configuration.config import expand_action
+        actions = [
+            expand_action(None, args=(0,), order=None),
+            expand_action(('a',), args=(1,), order=0),
+            expand_action(None, args=(2,), order=-1),
+            expand_action(None, args=(3,)),
+            expand_action(('b',), args=(4,), order=None),
+            expand_action(('b',), args=(5,), includepath=('x',), order=-1),
+        ]
+        self.assertEqual([x.args for x in self._callFUT(actions)],
+                         [(2,), (0,), (1,), (3,), (4,)])
+
+    def test_final_order_single_order(self):
+        from zope.configuration.config import expand_action
+        actions = [expand_action(None, args=(i,), order=3)
+                   for i in range(3)]
+        self.assertEqual([x.args for x in self._callFUT(actions)],
+                         [(0,), (1,), (2,)])
+
+
+CONFLICT_ZCML = """\
+<configure xmlns="http://namespaces.zope.org/zope"
+           xmlns:meta="http://namespaces.zope.org/meta"
+           xmlns:test="http://namespaces.zope.org/test">
+  <meta:directive
+      namespace="http://namespaces.zope.org/test"
+      name="foo"
+      schema="zope.configuration.tests.samplepackage.foo.S1"
+      handler="zope.configuration.tests.samplepackage.foo.handler"
+      />
+  %s
+</configure>
+"""
+
+FOO = '<test:foo x="x" y="1" />'
+
+
+class ConflictIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+
+        from zope.configuration.tests.samplepackage import foo
+        shutil.rmtree(self.tmpdir)
+        del foo.data[:]
+
+    def _getTargetClass(self):
+        from zope.configuration.config import ConflictIndex
+        return ConflictIndex
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def _write(self, name, *body):
+        import os
+        with open(os.path.join(self.tmpdir, name), 'w') as f:
+            f.write(CONFLICT_ZCML % '\n'.join(body))
+
+    def _load(self, name, context=None, index=None):
+        import os
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.xmlconfig import file
+        from zope.configuration.xmlconfig import registerCommonDirectives
+        if context is None:
+            context = ConfigurationMachine()
+            registerCommonDirectives(context)
+            context.conflict_index = (
+                self._makeOne() if index is None else index)
+        file(os.path.join(self.tmpdir, name), context=context,
+             execute=False)
+        return context
+
+    def test_fails_fast_in_same_file(self):
+        from zope.configuration.config import ConfigurationConflictError
+        self._write('site.zcml', FOO, FOO, '<test:nonesuch />')
+        self.assertRaises(ConfigurationConflictError, self._load, 'site.zcml',
+                          index=self._makeOne(fail_fast=True))
+
+    def test_wo_fail_fast(self):
+        from zope.configuration.config import ConfigurationConflictError
+        index = self._makeOne()
+        self.assertFalse(index.fail_fast)
+        self._write('site.zcml', FOO, FOO)
+        context = self._load('site.zcml', index=index)
+        self.assertTrue(index.matches(context.actions))
+        self.assertRaises(ConfigurationConflictError,
+                          context.execute_actions)
+        self.assertIsNone(index.actions)
+
+    def test_fails_fast_across_top_level_files(self):
+        from zope.configuration.config import ConfigurationConflictError
+        self._write('a.zcml', FOO)
+        self._write('b.zcml', FOO, '<test:nonesuch />')
+        context = self._load('a.zcml', index=self._makeOne(fail_fast=True))
+        self.assertRaises(ConfigurationConflictError,
+                          self._load, 'b.zcml', context)
+
+    def test_resolved_by_python_level_overrides(self):
+        import os
+
+        from zope.configuration.config import ConfigurationConflictError
+        from zope.configuration.tests.samplepackage import foo
+        from zope.configuration.xmlconfig import includeOverrides
+        self._write('a.zcml', FOO)
+        self._write('o.zcml', FOO)
+        context = self._load('a.zcml')
+        includeOverrides(context, os.path.join(self.tmpdir, 'o.zcml'))
+        context.execute_actions()
+        self.assertEqual(len(foo.data), 1)
+        # The action of o.zcml won.
+        self.assertEqual(foo.data[0].includepath,
+                         (os.path.join(self.tmpdir, 'o.zcml'),))
+
+        # Failing fast can't anticipate this override.
+        context = self._load('a.zcml', index=self._makeOne(fail_fast=True))
+        self.assertRaises(ConfigurationConflictError, includeOverrides,
+                          context, os.path.join(self.tmpdir, 'o.zcml'))
+
+    def test_resolved_by_including_file(self):
+        from zope.configuration.tests.samplepackage import foo
+        self._write('a.zcml', FOO)
+        self._write('b.zcml', FOO)
+        self._write('site.zcml', '<include file="a.zcml" />',
+                    '<include file="b.zcml" />', FOO)
+        context = self._load('site.zcml')
+        context.execute_actions()
+        self.assertEqual(len(foo.data), 1)
+        self.assertEqual(len(foo.data[0].includepath), 1)
+
+    def test_resolved_by_overrides(self):
+        from zope.configuration.tests.samplepackage import foo
+        self._write('a.zcml', FOO)
+        self._write('b.zcml', FOO)
+        self._write('over.zcml', FOO, '<include file="b.zcml" />')
+        self._write('site.zcml', '<include file="a.zcml" />',
+                    '<includeOverrides file="over.zcml" />')
+        index = self._makeOne()
+        context = self._load('site.zcml', index=index)
+        self.assertTrue(index.matches(context.actions))
+        context.execute_actions()
+        self.assertEqual(len(foo.data), 1)
+        self.assertEqual(len(foo.data[0].includepath), 2)
+
+    def test_unresolved_reported_at_end(self):
+        from zope.configuration.config import ConfigurationConflictError
+        self._write('a.zcml', FOO)
+        self._write('b.zcml', FOO)
+        self._write('site.zcml', '<include file="a.zcml" />',
+                    '<include file="b.zcml" />')
+        context = self._load('site.zcml')
+        self.assertRaises(ConfigurationConflictError,
+                          context.execute_actions)
+
+    def test_groups_used_by_resolveConflicts(self):
+        from zope.configuration.config import expand_action
+        from zope.configuration.config import resolveConflicts
+        index = self._makeOne()
+        actions = [expand_action(None, order=1),
+                   expand_action('a', includepath=('x',)),
+                   expand_action('a', includepath=('x', 'y')),
+                   expand_action('b')]
+        index.update(actions)
+        self.assertEqual(index.groups, {'a': [1, 2], 'b': 3})
+        self.assertEqual(index.unique, [0])
+        self.assertEqual(resolveConflicts(actions, index),
+                         resolveConflicts(actions))
+        # The groups weren't changed
+        self.assertEqual(index.groups, {'a': [1, 2], 'b': 3})
+
+    def test_truncate(self):
+        from zope.configuration.config import expand_action
+        index = self._makeOne(fail_fast=False)
+        actions = [expand_action('a'), expand_action('b'),
+                   expand_action('a', includepath=('x',)),
+                   expand_action('a', includepath=('y',)),
+                   expand_action(None)]
+        index.update(actions)
+        self.assertEqual(index.groups, {'a': [0, 2, 3], 'b': 1})
+        index.truncate(3)
+        del actions[3:]
+        self.assertEqual(index.groups, {'a': [0, 2], 'b': 1})
+        self.assertEqual(index.unique, [])
+        self.assertTrue(index.matches(actions))
+        index.truncate(1)
+        del actions[1:]
+        self.assertEqual(index.groups, {'a': 0})
+        self.assertTrue(index.matches(actions))
+        actions.extend([expand_action('a'), expand_action('a')])
+        index.update(actions)
+        index.truncate(1)
+        del actions[1:]
+        self.assertEqual(index.groups, {'a': 0})
+
+    def test_other_lists_and_actions(self):
+        from zope.configuration.config import expand_action
+        index = self._makeOne()
+        actions = [expand_action('a')]
+        index.update(actions)
+        other = [expand_action('b')]
+        self.assertFalse(index.matches(other))
+        index.update(other)
+        self.assertEqual(index.groups, {'b': 0})
+        other.append(('c', None))
+        other.append({'discriminator': 'd'})
+        index.update(other)
+        self.assertEqual(index.groups, {'b': 0, 'c': 1, 'd': 2})
+        self.assertFalse(index.matches(other))
+        del other[:]
+        index.update(other)
+        self.assertTrue(index.matches(other))
+        self.assertEqual(index.groups, {})
+
 
 class FauxContext:
 
@@ -152,6 +152,124 @@ class GlobalObjectTests(unittest.TestCase, _ConformsToIFromUnicode):
         self.assertIs(ex.field, field)
         self.assertEqual(ex.value, 'foo/bar')
 
+    def test_fromUnicode_lazy_wo_lazy_globals(self):
+        _target = object()
+
+        class Context:
+            def resolve(self, name):
+                return _target
+        go = self._makeOne(lazy=True)
+        bound = go.bind(Context())
+        self.assertIs(bound.fromUnicode('tried'), _target)
+
+    def test_fromUnicode_lazy_w_lazy_globals(self):
+        from zope.configuration.fields import DeferredReference
+        _target = object()
+
+        class Context:
+            lazy_globals = True
+            _resolved = None
+
+            def resolve(self, name):
+                self._resolved = name
+                return _target
+        context = Context()
+        # Fields have to opt in
+        bound = self._makeOne().bind(context)
+        self.assertIs(bound.fromUnicode('tried'), _target)
+        context = Context()
+        bound = self._makeOne(lazy=True).bind(context)
+        found = bound.fromUnicode(' tried ')
+        self.assertIsInstance(found, DeferredReference)
+        self.assertIsNone(context._resolved)
+        self.assertEqual(repr(found), "<DeferredReference 'tried'>")
+        self.assertIs(found.resolve(), _target)
+        self.assertEqual(context._resolved, 'tried')
+        # The result is remembered
+        context._resolved = None
+        self.assertIs(found.resolve(), _target)
+        self.assertIsNone(context._resolved)
+
+
+class DeferredReferenceTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zope.configuration.fields import DeferredReference
+        return DeferredReference
+
+    def _makeOne(self, name, field, resolved=None, error=None):
+        class Context:
+            lazy_globals = True
+
+            def resolve(self, name):
+                if error is not None:
+                    raise error
+                return resolved
+        return self._getTargetClass()(name, field.bind(Context()))
+
+    def test_resolve_fails(self):
+        from zope.schema import ValidationError
+
+        from zope.configuration.config import ConfigurationError
+        from zope.configuration.fields import GlobalObject
+        ref = self._makeOne('tried', GlobalObject(),
+                            error=ConfigurationError('nope'))
+        with self.assertRaises(ValidationError) as exc:
+            ref.resolve()
+        self.assertEqual(exc.exception.value, 'tried')
+
+    def test_resolve_validation_fails(self):
+        from zope.interface.exceptions import Invalid
+
+        from zope.configuration.fields import GlobalInterface
+        ref = self._makeOne('tried', GlobalInterface(), resolved=object())
+        self.assertRaises(Invalid, ref.resolve)
+
+    def test_equality_by_absolute_name(self):
+        import os
+
+        from zope.configuration.fields import GlobalObject
+
+        class Context:
+            package = os
+        field = GlobalObject().bind(Context())
+        ref = self._getTargetClass()('os.path.join', field)
+        relative = self._getTargetClass()(' .path.join', field)
+        other = self._getTargetClass()('os.path.split', field)
+        self.assertEqual(ref, relative)
+        self.assertEqual(hash(ref), hash(relative))
+        self.assertNotEqual(ref, other)
+        self.assertNotEqual(ref, 'os.path.join')
+        self.assertEqual(len({ref, relative, other}), 2)
+
+
+class Test_resolveDeferred(unittest.TestCase):
+
+    def _callFUT(self, *args, **kw):
+        from zope.configuration.fields import resolveDeferred
+        return resolveDeferred(*args, **kw)
+
+    def _makeRef(self, value):
+        from zope.configuration.fields import DeferredReference
+        from zope.configuration.fields import GlobalObject
+
+        class Context:
+            def resolve(self, name):
+                return value
+        return DeferredReference('name', GlobalObject().bind(Context()))
+
+    def test_plain_values_unchanged(self):
+        value = (1, [2, {'a': 3}], 'x')
+        self.assertIs(self._callFUT(value), value)
+
+    def test_nested(self):
+        one, two, three = object(), object(), object()
+        value = (self._makeRef(one),
+                 [self._makeRef(two), 'x'],
+                 {'a': self._makeRef(three)})
+        self.assertEqual(self._callFUT(value),
+                         (one, [two, 'x'], {'a': three}))
+
 
 class GlobalInterfaceTests(unittest.TestCase, _ConformsToIFromUnicode):
 
@@ -0,0 +1,171 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Test zope.configuration.fileaccess.
+"""
+import unittest
+
+from zope.configuration.tests.zcmltree import ZCMLTreeBase
+from zope.configuration.tests.zcmltree import feature
+
+
+SITE = """\
+<configure xmlns="http://namespaces.zope.org/zope"
+           xmlns:meta="http://namespaces.zope.org/meta">
+  <exclude file="excluded.zcml" />
+  <include files="sub/*.zcml" />
+  <include file="plain.zcml" />
+  <include file="template.zcml" />
+  <include file="other.zcml" />
+  <include file="excluded.zcml" />
+  <include package="zope.configuration.tests.samplepackage" file="foo.zcml" />
+</configure>
+"""
+
+
+FILES = {
+    'site.zcml': SITE,
+    'sub/a.zcml': feature('a'),
+    'sub/B.zcml': feature('b'),
+    'sub/.hidden.zcml': feature('hidden'),
+    'sub/c.txt': feature('c'),
+    'plain.zcml': feature('plain'),
+    'plain.zcml.in': feature('plain.in'),
+    'template.zcml.in': feature('template'),
+    'other.zcml.in': feature('other'),
+    'excluded.zcml': feature('excluded'),
+}
+
+
+class FileAccessTests(ZCMLTreeBase, unittest.TestCase):
+
+    files = FILES
+
+    def _getTargetClass(self):
+        from zope.configuration.fileaccess import FileAccess
+        return FileAccess
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_path(self):
+        import os
+        access = self._makeOne()
+        self.assertEqual(access.path(self.tmpdir, 'sub/../plain.zcml'),
+                         self._path('plain.zcml'))
+        self.assertEqual(access.path(self.tmpdir, './sub/a.zcml'),
+                         os.path.normpath(self._path('sub', 'a.zcml')))
+
+    def test_glob(self):
+        access = self._makeOne()
+        self.assertEqual(sorted(access.glob(self._path('sub', '*.zcml'))),
+                         [self._path('sub', 'B.zcml'),
+                          self._path('sub', 'a.zcml')])
+
+    def test_open_falls_back_to_in(self):
+        access = self._makeOne()
+        with access.open(self._path('plain.zcml')) as f:
+            self.assertEqual(f.name, self._path('plain.zcml'))
+        with access.open(self._path('template.zcml')) as f:
+            self.assertEqual(f.name, self._path('template.zcml.in'))
+        with self.assertRaises(FileNotFoundError):
+            access.open(self._path('missing.zcml'))
+
+
+class CachingFileAccessTests(ZCMLTreeBase, unittest.TestCase):
+
+    files = FILES
+
+    def _getTargetClass(self):
+        from zope.configuration.fileaccess import CachingFileAccess
+        return CachingFileAccess
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_listdir(self):
+        access = self._makeOne()
+        names = access.listdir(self._path('sub'))
+        self.assertEqual(names, {'a.zcml', 'B.zcml', '.hidden.zcml',
+                                 'c.txt'})
+        self.assertIs(access.listdir(self._path('sub')), names)
+        self.assertIsNone(access.listdir(self._path('missing')))
+        self.assertEqual(access.listings, 2)
+
+    def test_path_memoized(self):
+        access = self._makeOne()
+        path = access.path(self.tmpdir, 'sub/../plain.zcml')
+        self.assertEqual(path, self._path('plain.zcml'))
+        self.assertIs(access.path(self.tmpdir, 'sub/../plain.zcml'), path)
+
+    def test_glob_matches_glob(self):
+        from glob import glob
+        access = self._makeOne()
+        for pattern in ['sub/*.zcml', 'sub/*', 'sub/.*', 'sub/[ab].zcml',
+                        'sub/?.txt', 'sub/a.zcml', 'sub/missing.zcml',
+                        'missing/*.zcml', '*/*.zcml', 'sub/']:
+            pattern = self._path(pattern)
+            self.assertEqual(sorted(access.glob(pattern)),
+                             sorted(glob(pattern)), pattern)
+
+    def test_glob_counts_saved(self):
+        access = self._makeOne()
+        access.glob(self._path('sub', '*.zcml'))
+        self.assertEqual((access.listings, access.saved), (1, 0))
+        access.glob(self._path('sub', '*.txt'))
+        access.glob(self._path('sub', 'a.zcml'))
+        self.assertEqual((access.listings, access.saved), (1, 2))
+
+    def test_open(self):
+        access = self._makeOne()
+        with access.open(self._path('plain.zcml')) as f:
+            self.assertEqual(f.name, self._path('plain.zcml'))
+        # The directory isn't listed until a file is missing.
+        self.assertEqual(access.listings, 0)
+        with access.open(self._path('template.zcml')) as f:
+            self.assertEqual(f.name, self._path('template.zcml.in'))
+        self.assertEqual((access.listings, access.saved), (1, 0))
+
+        with access.open(self._path('plain.zcml')) as f:
+            self.assertEqual(f.name, self._path('plain.zcml'))
+        with access.open(self._path('template.zcml')) as f:
+            self.assertEqual(f.name, self._path('template.zcml.in'))
+        with self.assertRaises(FileNotFoundError) as exc:
+            access.open(self._path('missing.zcml'))
+        self.assertEqual(exc.exception.filename, self._path('missing.zcml'))
+        self.assertEqual((access.listings, access.saved), (1, 4))
+
+    def test_open_missing_directory(self):
+        access = self._makeOne()
+        for _ in range(2):
+            with self.assertRaises(FileNotFoundError):
+                access.open(self._path('missing', 'x.zcml'))
+        self.assertEqual(access.listings, 1)
+
+    def test_clear(self):
+        import os
+        access = self._makeOne()
+        self.assertEqual(access.glob(self._path('*.py')), [])
+        self._write('new.py', '')
+        self.assertEqual(access.glob(self._path('*.py')), [])
+        access.clear()
+        self.assertEqual(access.glob(self._path('*.py')),
+                         [os.path.join(self.tmpdir, 'new.py')])
+
+    def test_same_result_as_without(self):
+        access = self._makeOne()
+        cached = self._summarize(self._load(file_access=access))
+        self.assertEqual(cached, self._summarize(self._load()))
+        self.assertEqual(cached[0], ['a', 'b', 'other', 'plain', 'template'])
+        # other.zcml.in was found in the listing made for template.zcml.
+        self.assertEqual(access.saved, 2)
@@ -0,0 +1,158 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Test zope.configuration.prefetch.
+"""
+import unittest
+
+from zope.configuration.tests.zcmltree import ZCMLTreeBase
+from zope.configuration.tests.zcmltree import feature
+
+
+SITE = """\
+<configure xmlns="http://namespaces.zope.org/zope"
+           xmlns:meta="http://namespaces.zope.org/meta"
+           xmlns:zcml="http://namespaces.zope.org/zcml">
+  <meta:provides feature="site" />
+  <exclude file="excluded.zcml" />
+  <include file="a.zcml" />
+  <include files="sub/*.zcml" />
+  <include file="excluded.zcml" />
+  <include file="conditioned.zcml" zcml:condition="have nonesuch" />
+  <includeOverrides file="overrides.zcml" />
+  <include package="zope.configuration.tests.samplepackage" />
+</configure>
+"""
+
+
+FILES = {
+    'site.zcml': SITE,
+    'a.zcml': feature('a', '<include file="b.zcml" />'),
+    'b.zcml': feature('b'),
+    'sub/c.zcml': feature('c'),
+    'sub/d.zcml': feature('d'),
+    'excluded.zcml': feature('excluded'),
+    'conditioned.zcml': feature('conditioned'),
+    'overrides.zcml': feature('overrides'),
+}
+
+
+class Test_includes(unittest.TestCase):
+
+    def _callFUT(self, *args, **kw):
+        from zope.configuration.prefetch import _includes
+        return _includes(*args, **kw)
+
+    def _events(self, text):
+        import io
+        from xml.sax.handler import ContentHandler
+
+        from zope.configuration.cache import EventRecorder
+        from zope.configuration.xmlconfig import _parsers
+        recorder = EventRecorder(ContentHandler())
+        _parsers['sax'](io.StringIO(text), recorder)
+        return recorder.events
+
+    def test_files_and_packages(self):
+        import os
+
+        from zope.configuration.tests import samplepackage
+        here = os.path.dirname(samplepackage.__file__)
+        events = self._events("""\
+<configure xmlns="http://namespaces.zope.org/zope">
+  <include file="a.zcml" />
+  <include package="zope.configuration.tests.samplepackage"
+           file="foo.zcml" />
+  <include package=".relative" />
+  <include package="nonesuch.module" />
+  <configure package="zope.configuration.tests.samplepackage">
+    <include file="bar.zcml" />
+  </configure>
+  <include files="configure.*" />
+  <include file="/abs/x.zcml" />
+</configure>
+""")
+        self.assertEqual(
+            self._callFUT(os.path.join('/base', 'site.zcml'), events),
+            [os.path.normpath('/base/a.zcml'),
+             os.path.join(here, 'foo.zcml'),
+             os.path.join(here, 'bar.zcml'),
+             os.path.normpath('/abs/x.zcml')])
+
+
+class PrefetcherTests(ZCMLTreeBase, unittest.TestCase):
+
+    files = FILES
+
+    def _getTargetClass(self):
+        from zope.configuration.prefetch import Prefetcher
+        return Prefetcher
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_same_result_as_sequential(self):
+        with self._makeOne(max_workers=2) as prefetcher:
+            prefetched = self._load(parse_cache=prefetcher)
+        sequential = self._load()
+        self.assertEqual(self._summarize(prefetched),
+                         self._summarize(sequential))
+        features = self._summarize(prefetched)[0]
+        self.assertIn('b', features)
+        self.assertIn('overrides', features)
+        self.assertNotIn('excluded', features)
+        self.assertNotIn('conditioned', features)
+        # site, a, b, c, d, overrides and the sample package
+        self.assertEqual(prefetcher.hits, 7)
+
+    def test_w_expat_and_cache(self):
+        import os
+
+        from zope.configuration.cache import ParseCache
+        cache = ParseCache(os.path.join(self.tmpdir, 'cache'))
+        with self._makeOne(xml_parser='expat', cache=cache) as prefetcher:
+            prefetched = self._load(parse_cache=prefetcher)
+        self.assertEqual(self._summarize(prefetched),
+                         self._summarize(self._load()))
+        self.assertTrue(os.listdir(os.path.join(self.tmpdir, 'cache')))
+
+    def test_changed_after_prefetch(self):
+        import os
+        path = os.path.join(self.tmpdir, 'b.zcml')
+        with self._makeOne() as prefetcher:
+            prefetcher.prefetch(path)
+            prefetcher._futures[path].result()
+            self._write('b.zcml', feature('changed'))
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            context = self._load(parse_cache=prefetcher)
+        self.assertIn('changed', context._features)
+
+    def test_parse_error_reported_by_walk(self):
+        from zope.configuration.xmlconfig import ZopeSAXParseException
+        self._write('b.zcml', '<configure')
+        with self._makeOne() as prefetcher:
+            self.assertRaises(ZopeSAXParseException,
+                              self._load, parse_cache=prefetcher)
+
+    def test_close_w_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(1)
+        prefetcher = self._makeOne(executor)
+        prefetcher.close()
+        # The executor belongs to the caller
+        self.assertIsNone(executor.submit(lambda: None).result())
+        executor.shutdown()
+        # Prefetching after shutdown does nothing
+        prefetcher.prefetch('a.zcml')
+        self.assertEqual(prefetcher._futures, {})
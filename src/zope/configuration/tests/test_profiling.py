@@ -0,0 +1,422 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Test zope.configuration.profiling.
+"""
+import unittest
+
+
+NS = 'http://namespaces.zope.org/test'
+
+ZCML = """\
+<configure xmlns="%s">
+  <register name="a" />
+  <register name="b" />
+</configure>
+""" % NS
+
+
+class _Clock:
+    # A clock advancing one second each time it is read.
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+class _Info:
+    file = 'test.zcml'
+
+
+def register(name):
+    pass
+
+
+class ProfilerTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zope.configuration.profiling import Profiler
+        return Profiler
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def _action(self, callable, info=None, includepath=()):
+        from zope.configuration.config import Action
+        return Action(None, callable, info=info, includepath=includepath)
+
+    def test_nested_directives(self):
+        profiler = self._makeOne(_Clock())
+        outer, inner = _Info(), _Info()
+        profiler.begin((NS, 'outer'), outer)  # 1
+        profiler.begin((NS, 'inner'), inner)  # 2
+        profiler.end()  # 3
+        profiler.begin('plain', 'string info')  # 4
+        profiler.end()  # 5
+        profiler.end()  # 6
+        self.assertEqual(profiler.directives,
+                         {'{%s}outer' % NS: [1, 3.0, 0.0],
+                          '{%s}inner' % NS: [1, 1.0, 0.0],
+                          'plain': [1, 1.0, 0.0]})
+        self.assertEqual(profiler.files,
+                         {'test.zcml': [4.0, 0.0], '<unknown>': [1.0, 0.0]})
+
+    def test_executed(self):
+        profiler = self._makeOne()
+        info = _Info()
+        profiler.begin((NS, 'register'), info)
+        profiler.end()
+        profiler.executed((self._action(register, info),
+                           self._action(register, {})), 2.0)
+        profiler.executed((self._action(len, includepath=('x.zcml',)),), 4.0)
+        profiler.executed((self._action(object()),), 1.0)
+        self.assertEqual(
+            profiler.callables,
+            {__name__ + '.register': [2, 2.0], 'builtins.len': [1, 4.0],
+             [name for name in profiler.callables
+              if name.startswith('<object')][0]: [1, 1.0]})
+        self.assertEqual(profiler.directives['{%s}register' % NS][2], 1.0)
+        self.assertEqual(profiler.directives['<unknown>'], [0, 0.0, 6.0])
+        self.assertEqual(profiler.files['test.zcml'][1], 1.0)
+        self.assertEqual(profiler.files['x.zcml'], [0.0, 4.0])
+        self.assertEqual(profiler.files['<unknown>'], [0.0, 2.0])
+
+    def test_w_configuration_machine(self):
+        import json
+        import os
+        import tempfile
+
+        from zope.interface import Interface
+        from zope.schema import TextLine
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.config import batchable
+        from zope.configuration.config import defineSimpleDirective
+        from zope.configuration.xmlconfig import registerCommonDirectives
+        from zope.configuration.xmlconfig import string
+
+        class ISchema(Interface):
+            name = TextLine()
+
+        registered = []
+
+        @batchable(lambda calls: registered.extend(calls))
+        def _register(name):
+            raise AssertionError("Not batched")
+
+        def _handler(_context, name):
+            _context.action(('register', name), _register, (name,), order=1)
+            _context.action(None, register, (name,))
+
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        defineSimpleDirective(context, 'register', ISchema, _handler,
+                              namespace=NS)
+        profiler = context.profiler = self._makeOne(_Clock())
+        string(ZCML, context=context)
+
+        self.assertEqual(len(registered), 2)
+        self.assertEqual(profiler.conflict_seconds, 1.0)
+        data = profiler.asDict()
+        self.assertEqual(data['parse_seconds'], 5.0)
+        self.assertEqual(data['execute_seconds'], 3.0)
+        self.assertEqual(
+            [(entry['name'], entry['count']) for entry in data['callables']],
+            [(__name__ + '.register', 2),
+             (_register.__module__ + '.' + _register.__qualname__, 2)])
+        self.assertEqual(
+            [(entry['name'], entry['count'], entry['parse_seconds'],
+              entry['execute_seconds']) for entry in data['directives']],
+            [('{%s}register' % NS, 2, 2.0, 3.0),
+             ('{%s}configure' % NS, 1, 3.0, 0.0)])
+        self.assertEqual(len(data['files']), 1)
+
+        report = profiler.report()
+        self.assertIn('Executing actions:   3.000s', report)
+        self.assertIn(' 2.000000   3.000000        2  {%s}register' % NS,
+                      report)
+        self.assertEqual(len(profiler.report(limit=0).splitlines()), 9)
+
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            profiler.save(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f), data)
+        finally:
+            os.remove(path)
+
+
+class StackSamplerTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zope.configuration.profiling import StackSampler
+        return StackSampler
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def _context(self, handler):
+        from zope.interface import Interface
+        from zope.schema import TextLine
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.config import defineSimpleDirective
+        from zope.configuration.xmlconfig import registerCommonDirectives
+
+        class ISchema(Interface):
+            name = TextLine()
+
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        defineSimpleDirective(context, 'register', ISchema, handler,
+                              namespace=NS)
+        return context
+
+    def test_samples_attributed_to_directives(self):
+        import sys
+
+        from zope.configuration.xmlconfig import string
+
+        def _action(name):
+            sampler.sample(sys._getframe())
+
+        def _handler(_context, name):
+            sampler.sample(sys._getframe())
+            _context.action(None, _action, (name,))
+
+        context = self._context(_handler)
+        with self._makeOne(context, interval=60) as sampler:
+            string(ZCML, context=context)
+        self.assertEqual(context._subscribers, {})
+
+        stacks = sorted(sampler.samples)
+        self.assertEqual(len(stacks), 4)
+        self.assertEqual(set(sampler.samples.values()), {1})
+        for stack in stacks:
+            self.assertEqual(stack[0], '<string>:1 <test:configure>')
+            self.assertIn(stack[1], ('<string>:2 <test:register>',
+                                     '<string>:3 <test:register>'))
+        parsing = [stack for stack in stacks if '_handler' in stack[-1]]
+        executing = [stack for stack in stacks if '_action' in stack[-1]]
+        self.assertEqual(len(parsing), 2)
+        self.assertEqual(len(executing), 2)
+        for stack in parsing:
+            self.assertTrue(
+                stack[2].startswith('ConfigurationHandler.endElementNS ('))
+        for stack in executing:
+            self.assertTrue(
+                stack[2].startswith('ConfigurationMachine._execute ('))
+
+    def test_sample_outside_configuration(self):
+        import sys
+        context = self._context(None)
+        sampler = self._makeOne(context)
+        frame = sys._getframe()
+        sampler.sample(frame)
+        stack, = sampler.samples
+        self.assertIn(__name__.rpartition('.')[2], stack[-1])
+        self.assertIn('test_sample_outside_configuration', stack[-1])
+
+    def test_collapsed_and_save(self):
+        import os
+        import tempfile
+        sampler = self._makeOne(None)
+        sampler.samples[('a.zcml:1 <configure>', 'f (x.py:1)')] += 2
+        sampler.samples[('a.zcml:1 <configure>',)] += 1
+        expected = ('a.zcml:1 <configure> 1\n'
+                    'a.zcml:1 <configure>;f (x.py:1) 2\n')
+        self.assertEqual(sampler.collapsed(), expected)
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            sampler.save(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), expected)
+        finally:
+            os.remove(path)
+
+    def test_sampling_thread(self):
+        import time
+
+        from zope.configuration.xmlconfig import string
+
+        def _busy(name):
+            end = time.perf_counter() + 0.1
+            while time.perf_counter() < end:
+                pass
+
+        def _handler(_context, name):
+            _context.action(None, _busy, (name,))
+
+        context = self._context(_handler)
+        with self._makeOne(context, interval=0.001) as sampler:
+            string(ZCML, context=context)
+        self.assertTrue(any('_busy' in stack[-1]
+                            for stack in sampler.samples))
+
+
+NOTYET = 'zope.configuration.tests.notyet'
+
+
+class ImportTimerTests(unittest.TestCase):
+
+    def setUp(self):
+        self._forget()
+
+    def tearDown(self):
+        self._forget()
+
+    def _forget(self):
+        import sys
+
+        import zope.configuration.tests as zct
+        zct.__dict__.pop('notyet', None)
+        sys.modules.pop(NOTYET, None)
+
+    def _getTargetClass(self):
+        from zope.configuration.profiling import ImportTimer
+        return ImportTimer
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def _context(self, lazy=False):
+        from zope.interface import Interface
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.config import defineSimpleDirective
+        from zope.configuration.fields import GlobalObject
+        from zope.configuration.xmlconfig import registerCommonDirectives
+
+        class ISchema(Interface):
+            target = GlobalObject(lazy=lazy)
+
+        def _handler(_context, target):
+            _context.action(None, self.targets.append, (target,))
+
+        self.targets = []
+        context = ConfigurationMachine()
+        context.lazy_globals = lazy
+        registerCommonDirectives(context)
+        defineSimpleDirective(context, 'resolve', ISchema, _handler,
+                              namespace=NS)
+        return context
+
+    def _zcml(self, target=NOTYET):
+        return """\
+<configure xmlns="%s">
+  <resolve target="zope.configuration.config" />
+  <resolve target="%s" />
+</configure>
+""" % (NS, target)
+
+    def test_imports_while_handling_directives(self):
+        import builtins
+
+        from zope.configuration.xmlconfig import string
+
+        context = self._context()
+        original = builtins.__import__
+        with self._makeOne(context) as timer:
+            self.assertIsNot(builtins.__import__, original)
+            string(self._zcml(), context=context)
+        self.assertIs(builtins.__import__, original)
+        self.assertEqual(context._subscribers, {})
+
+        self.assertEqual(list(timer.directives),
+                         ['<string>:3 <test:resolve>'])
+        seconds, modules = timer.directives['<string>:3 <test:resolve>']
+        self.assertEqual(modules, [NOTYET])
+        self.assertGreater(seconds, 0)
+        self.assertEqual(timer.files, {'<string>': [seconds, [NOTYET]]})
+
+    def test_imports_while_executing_actions(self):
+        from zope.configuration.xmlconfig import string
+
+        context = self._context(lazy=True)
+        with self._makeOne(context) as timer:
+            string(self._zcml(), context=context, execute=False)
+            self.assertEqual(timer.files, {})
+            context.execute_actions()
+        self.assertEqual(self.targets[1].__name__, NOTYET)
+        self.assertEqual(timer.directives['<string>:3 <test:resolve>'][1],
+                         [NOTYET])
+        self.assertEqual(timer.files['<string>'][1], [NOTYET])
+
+    def test_imports_outside_configuration(self):
+        import threading
+
+        context = self._context()
+        with self._makeOne(context) as timer:
+            # Other threads aren't timed
+            thread = threading.Thread(target=__import__, args=(NOTYET,))
+            thread.start()
+            thread.join()
+            self._forget()
+            __import__(NOTYET)
+        self.assertEqual(timer.files, {'<unknown>': [timer.files[
+            '<unknown>'][0], [NOTYET]]})
+        self.assertEqual(list(timer.directives), ['<unknown>'])
+
+    def test_budget(self):
+        import warnings
+
+        from zope.configuration.xmlconfig import string
+
+        context = self._context()
+        clock = _Clock()
+        with warnings.catch_warnings(record=True) as warned:
+            warnings.simplefilter('always')
+            with self._makeOne(context, budget=0.5, clock=clock) as timer:
+                string(self._zcml(), context=context)
+                self._forget()
+                string(self._zcml(), context=context)
+        self.assertEqual(timer.files['<string>'], [2.0, [NOTYET]])
+        self.assertEqual(len(warned), 1)
+        self.assertEqual(str(warned[0].message),
+                         'Importing modules for <string> took 1.000s, more '
+                         'than the budget of 0.500s')
+
+    def test_report_and_save(self):
+        import json
+        import os
+        import tempfile
+
+        timer = self._makeOne(None)
+        timer.files = {'a.zcml': [2.0, ['a', 'b']], 'b.zcml': [1.0, ['c']]}
+        timer.directives = {'a.zcml:1 <x>': [2.0, ['a', 'b']]}
+        data = timer.asDict()
+        self.assertEqual(data['import_seconds'], 3.0)
+        self.assertEqual([entry['name'] for entry in data['files']],
+                         ['a.zcml', 'b.zcml'])
+        self.assertEqual(
+            timer.report(limit=1).splitlines(),
+            ['Importing modules: 3.000s',
+             '',
+             '   seconds  modules  files',
+             '  2.000000        2  a.zcml',
+             '',
+             '   seconds  modules  directives',
+             '  2.000000        2  a.zcml:1 <x>'])
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            timer.save(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f), data)
+        finally:
+            os.remove(path)
@@ -0,0 +1,281 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Test zope.configuration.snapshot.
+"""
+import unittest
+
+from zope.interface import Interface
+from zope.schema import TextLine
+
+
+ENVVAR = 'ZOPE_CONFIGURATION_SNAPSHOT_TEST'
+
+SITE = """\
+<configure xmlns="http://namespaces.zope.org/zope"
+           xmlns:meta="http://namespaces.zope.org/meta"
+           xmlns:test="http://namespaces.zope.org/test"
+           xmlns:zcml="http://namespaces.zope.org/zcml">
+  <meta:directive
+      namespace="http://namespaces.zope.org/test"
+      name="record"
+      schema="zope.configuration.tests.test_snapshot.IRecord"
+      handler="zope.configuration.tests.test_snapshot.register"
+      />
+  <meta:provides feature="recorded" />
+  <test:record value="one" />
+  <include file="other.zcml" />
+  <include files="extra*.zcml" />
+  <test:record value="env" zcml:condition="envvar %s" />
+</configure>
+""" % ENVVAR
+
+OTHER = """\
+<configure xmlns="http://namespaces.zope.org/test">
+  <record value="two" />
+</configure>
+"""
+
+executed = []
+
+
+class IRecord(Interface):
+
+    value = TextLine()
+
+
+def record(value):
+    executed.append(value)
+
+
+def register(_context, value):
+    _context.action(('record', value), record, (value,))
+
+
+class Test_file_w_snapshot(unittest.TestCase):
+
+    def setUp(self):
+        import os
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+        self.snapshot = os.path.join(self.tmpdir, 'site.snapshot')
+        self._write('site.zcml', SITE)
+        self._write('other.zcml', OTHER)
+        os.environ.pop(ENVVAR, None)
+        del executed[:]
+
+    def tearDown(self):
+        import os
+        import shutil
+        shutil.rmtree(self.tmpdir)
+        os.environ.pop(ENVVAR, None)
+        del executed[:]
+
+    def _write(self, name, text):
+        import os
+        with open(os.path.join(self.tmpdir, name), 'w') as f:
+            f.write(text)
+
+    def _touch(self, name):
+        import os
+        path = os.path.join(self.tmpdir, name)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    def _callFUT(self, parse=True, **kw):
+        import os
+
+        from zope.configuration import xmlconfig
+        from zope.configuration.tests.test_xmlconfig import _Monkey
+
+        def make_parser():
+            raise AssertionError("Should not parse")
+        replacements = {} if parse else {'make_parser': make_parser}
+        kw.setdefault('snapshot', self.snapshot)
+        with _Monkey(xmlconfig, **replacements):
+            return xmlconfig.file(os.path.join(self.tmpdir, 'site.zcml'),
+                                  **kw)
+
+    def test_first_run_writes_snapshot(self):
+        import os
+        self._callFUT()
+        self.assertTrue(os.path.exists(self.snapshot))
+        self.assertEqual(executed, ['one', 'two'])
+
+    def test_second_run_uses_snapshot(self):
+        import os
+        self._callFUT()
+        del executed[:]
+        context = self._callFUT(parse=False)
+        self.assertEqual(executed, ['one', 'two'])
+        self.assertTrue(context.hasFeature('recorded'))
+        self.assertIn(os.path.join(self.tmpdir, 'other.zcml'),
+                      context._seen_files)
+        self.assertEqual(context.actions, [])
+
+    def test_snapshot_doesnt_restore_parse_state(self):
+        from zope.configuration.exceptions import ConfigurationError
+        from zope.configuration.xmlconfig import string
+        directive = ('<record xmlns="http://namespaces.zope.org/test"'
+                     ' value="more" />')
+        context = self._callFUT()
+        string(directive, context)
+        self.assertEqual(executed, ['one', 'two', 'more'])
+
+        # Directives defined by the configuration are unknown after
+        # loading a snapshot.
+        context = self._callFUT(parse=False)
+        self.assertRaises(ConfigurationError, string, directive, context)
+        self.assertEqual(context.i18n_strings, {})
+
+    def test_wo_execute(self):
+        self._callFUT()
+        context = self._callFUT(parse=False, execute=False)
+        self.assertEqual(executed, ['one', 'two'])
+        self.assertEqual([action['args'] for action in context.actions],
+                         [('one',), ('two',)])
+        self.assertTrue(repr(context.actions[0]['info']).endswith(
+            'site.zcml", line 12.2-12.29'))
+
+    def test_changed_file_invalidates(self):
+        self._callFUT()
+        self._write('other.zcml', OTHER.replace('two', 'three'))
+        self._touch('other.zcml')
+        del executed[:]
+        self._callFUT()
+        self.assertEqual(executed, ['one', 'three'])
+        # and the snapshot was refreshed
+        del executed[:]
+        self._callFUT(parse=False)
+        self.assertEqual(executed, ['one', 'three'])
+
+    def test_new_dot_in_file_invalidates(self):
+        self._callFUT()
+        self._write('site.zcml.in', SITE)
+        self.assertRaises(AssertionError, self._callFUT, parse=False)
+
+    def test_new_file_matching_pattern_invalidates(self):
+        self._callFUT()
+        self._write('extra1.zcml', OTHER.replace('two', 'extra'))
+        del executed[:]
+        self._callFUT()
+        self.assertEqual(executed, ['one', 'two', 'extra'])
+
+    def test_changed_environment_invalidates(self):
+        import os
+        self._callFUT()
+        os.environ[ENVVAR] = '1'
+        del executed[:]
+        self._callFUT()
+        self.assertEqual(executed, ['one', 'two', 'env'])
+
+    def test_different_features_invalidate(self):
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.xmlconfig import registerCommonDirectives
+        self._callFUT()
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        context.provideFeature('other')
+        self.assertRaises(AssertionError,
+                          self._callFUT, parse=False, context=context)
+
+    def test_damaged_snapshot_is_ignored(self):
+        from zope.configuration import snapshot
+        from zope.configuration.tests.test_xmlconfig import LoggerStub
+        from zope.configuration.tests.test_xmlconfig import _Monkey
+        with open(self.snapshot, 'wb') as f:
+            f.write(b'garbage')
+        logger = LoggerStub()
+        with _Monkey(snapshot, logger=logger):
+            self._callFUT()
+        self.assertEqual(executed, ['one', 'two'])
+        self.assertEqual(len(logger.warnings), 1)
+
+    def test_unwritable_snapshot_is_skipped(self):
+        import os
+
+        from zope.configuration import snapshot
+        from zope.configuration.tests.test_xmlconfig import LoggerStub
+        from zope.configuration.tests.test_xmlconfig import _Monkey
+        path = os.path.join(self.tmpdir, 'nonesuch', 'site.snapshot')
+        logger = LoggerStub()
+        with _Monkey(snapshot, logger=logger):
+            self._callFUT(snapshot=path)
+        self.assertEqual(executed, ['one', 'two'])
+        self.assertEqual(len(logger.warnings), 1)
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
+
+        # The temporary file is removed if it can't be renamed.
+        os.mkdir(self.snapshot)
+        with _Monkey(snapshot, logger=logger):
+            self._callFUT()
+        # Reading it and writing it failed.
+        self.assertEqual(len(logger.warnings), 3)
+        self.assertEqual(sorted(os.listdir(self.tmpdir)),
+                         ['other.zcml', 'site.snapshot', 'site.zcml'])
+
+    def test_unreferenceable_callable_is_not_snapshotted(self):
+        import os
+
+        from zope.configuration import snapshot
+        from zope.configuration import xmlconfig
+        from zope.configuration.tests import samplepackage
+        from zope.configuration.tests.samplepackage import foo
+        from zope.configuration.tests.test_xmlconfig import LoggerStub
+        from zope.configuration.tests.test_xmlconfig import _Monkey
+        logger = LoggerStub()
+        with _Monkey(snapshot, logger=logger):
+            xmlconfig.file('configure.zcml', samplepackage,
+                           snapshot=self.snapshot)
+        self.assertFalse(os.path.exists(self.snapshot))
+        self.assertEqual(len(logger.warnings), 1)
+        self.assertEqual(len(foo.data), 1)
+        del foo.data[:]
+
+
+class PicklerTests(unittest.TestCase):
+
+    def _roundtrip(self, obj):
+        import io
+
+        from zope.configuration.snapshot import _Pickler
+        from zope.configuration.snapshot import _Unpickler
+        f = io.BytesIO()
+        _Pickler(f).dump(obj)
+        f.seek(0)
+        return _Unpickler(f).load()
+
+    def test_globals_by_reference(self):
+        import os.path
+
+        from zope.configuration.interfaces import IConfigurationContext
+        loaded = self._roundtrip((record, IRecord, IConfigurationContext,
+                                  os.path, len, dict.fromkeys))
+        self.assertIs(loaded[0], record)
+        self.assertIs(loaded[1], IRecord)
+        self.assertIs(loaded[2], IConfigurationContext)
+        self.assertIs(loaded[3], os.path)
+        self.assertIs(loaded[4], len)
+        self.assertEqual(loaded[5], dict.fromkeys)
+
+    def test_data_by_value(self):
+        from zope.configuration.xmlconfig import ParserInfo
+        info = ParserInfo('a.zcml', 1, 2)
+        loaded = self._roundtrip({'info': info, 'args': ('a', 1, [2])})
+        self.assertEqual(repr(loaded['info']), repr(info))
+        self.assertEqual(loaded['args'], ('a', 1, [2]))
+
+    def test_bound_method_of_unnamed_object(self):
+        import pickle
+        self.assertRaises(pickle.PicklingError,
+                          self._roundtrip, executed.append)
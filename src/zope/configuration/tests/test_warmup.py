@@ -0,0 +1,122 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Test zope.configuration.warmup.
+"""
+import sys
+import unittest
+
+
+NOTYET = 'zope.configuration.tests.notyet'
+
+
+class ImportWarmerTests(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+        self._forget()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+        self._forget()
+
+    def _forget(self):
+        import zope.configuration.tests as zct
+        zct.__dict__.pop('notyet', None)
+        for name in (NOTYET,
+                     'zope.configuration.tests.victim',
+                     'zope.configuration.tests.bad'):
+            sys.modules.pop(name, None)
+
+    def _getTargetClass(self):
+        from zope.configuration.warmup import ImportWarmer
+        return ImportWarmer
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def test_add_imports_module_of_global(self):
+        with self._makeOne() as warmer:
+            warmer.add(NOTYET + '.nonesuch')
+            warmer.wait()
+        self.assertIn(NOTYET, sys.modules)
+        self.assertEqual(warmer.names, {NOTYET + '.nonesuch'})
+
+    def test_add_relative(self):
+        import zope.configuration
+        with self._makeOne() as warmer:
+            warmer.add('.tests.notyet', zope.configuration)
+            warmer.add('.tests.notyet')
+            warmer.add('.', zope.configuration)
+            warmer.add('.....toomany', zope.configuration)
+            warmer.wait()
+        self.assertIn(NOTYET, sys.modules)
+        self.assertEqual(warmer.names, {NOTYET})
+
+    def test_add_already_imported(self):
+        with self._makeOne() as warmer:
+            warmer.add('zope.configuration.config.ConfigurationMachine')
+            warmer.add('zope.configuration.config.ConfigurationMachine')
+        self.assertEqual(warmer._futures, [])
+
+    def test_add_broken_module(self):
+        with self._makeOne() as warmer:
+            warmer.add('zope.configuration.tests.victim.nosuch')
+            warmer.add('zope.configuration.tests.nosuch')
+            warmer.wait()
+        self.assertNotIn('zope.configuration.tests.victim', sys.modules)
+
+    def test_manifest(self):
+        import os
+        manifest = os.path.join(self.tmpdir, 'manifest')
+        with self._makeOne(manifest=manifest) as warmer:
+            self.assertEqual(warmer.names, set())
+            warmer.add(NOTYET + '.nonesuch')
+            warmer.add('zope.configuration.config.ConfigurationMachine')
+            warmer.add('nonesuch')
+            warmer.save()
+        with open(manifest) as f:
+            self.assertEqual(f.read().split(),
+                             ['zope.configuration.config', NOTYET])
+        self._forget()
+        with self._makeOne(manifest=manifest) as warmer:
+            warmer.wait()
+        self.assertIn(NOTYET, sys.modules)
+
+    def test_w_configuration_machine(self):
+        from zope.interface import Interface
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.config import defineSimpleDirective
+        from zope.configuration.fields import GlobalObject
+        from zope.configuration.xmlconfig import string
+
+        class ISchema(Interface):
+            target = GlobalObject(lazy=True)
+
+        def _handler(_context, target):
+            pass
+
+        context = ConfigurationMachine()
+        context.lazy_globals = True
+        defineSimpleDirective(context, 'lazy', ISchema, _handler,
+                              namespace='http://namespaces.zope.org/test')
+        with self._makeOne() as warmer:
+            context.import_warmer = warmer
+            string('<lazy xmlns="http://namespaces.zope.org/test"'
+                   ' target="zope.configuration.tests.notyet" />',
+                   context=context)
+        self.assertEqual(warmer.names, {NOTYET})
+        self.assertIn(NOTYET, sys.modules)
@@ -109,6 +109,114 @@ class ParserInfoTests(unittest.TestCase):
             'File "tests//sample.zcml", line 3.2-3.57\n'
             '    <directives namespace="http://namespaces.zope.org/zope">')
 
+    def test_no_instance_dict(self):
+        pi = self._makeOne('filename.xml', 24, 32)
+        self.assertFalse(hasattr(pi, '__dict__'))
+        self.assertEqual(pi.text, '')
+
+    def test_shares_file_names(self):
+        pi1 = self._makeOne(''.join(['filename', '.xml']), 1000, 32)
+        pi2 = self._makeOne(''.join(['filename', '.xml']), 1000, 32)
+        self.assertIs(pi1.file, pi2.file)
+
+    def test_pickle(self):
+        import pickle
+        pi = self._makeOne('filename.xml', 24, 32)
+        pi.end(33, 21)
+        pi.characters('text')
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            loaded = pickle.loads(pickle.dumps(pi, proto))
+            self.assertEqual(repr(loaded), repr(pi))
+            self.assertEqual(loaded.text, 'text')
+            self.assertIs(loaded.file, pi.file)
+
+    def test___setstate___w_instance_dict(self):
+        pi = self._getTargetClass().__new__(self._getTargetClass())
+        pi.__setstate__({'file': 'filename.xml', 'line': 24, 'column': 32,
+                         'eline': 24, 'ecolumn': 32})
+        self.assertEqual(repr(pi), 'File "filename.xml", line 24.32')
+        self.assertEqual(pi.text, '')
+
+    def test___str___reads_file_once(self):
+        import builtins
+
+        from zope.configuration import xmlconfig
+        sample = path('sample.zcml')
+        xmlconfig._source_lines.clear()
+        opened = []
+
+        def _open(name, *args, **kw):
+            opened.append(name)
+            return builtins.open(name, *args, **kw)
+        infos = [self._makeOne(sample, line, 2) for line in (3, 4, 5)]
+        for info in infos:
+            info.end(info.line, 57)
+        with _Monkey(xmlconfig, open=_open):
+            rendered = [str(info) for info in infos]
+        self.assertEqual(opened, [sample])
+        self.assertTrue(rendered[0].endswith(
+            '    <directives namespace="http://namespaces.zope.org/zope">'))
+
+
+class SourceLinesTests(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tmpdir)
+
+    def _getTargetClass(self):
+        from zope.configuration.xmlconfig import _SourceLines
+        return _SourceLines
+
+    def _makeOne(self, *args, **kw):
+        return self._getTargetClass()(*args, **kw)
+
+    def _makeFile(self, name, text):
+        import os
+        fn = os.path.join(self.tmpdir, name)
+        with open(fn, 'w') as f:
+            f.write(text)
+        return fn
+
+    def test_cached(self):
+        cache = self._makeOne()
+        fn = self._makeFile('a.zcml', 'a\nb\n')
+        lines = cache.getlines(fn)
+        self.assertEqual(lines, ['a\n', 'b\n'])
+        self.assertIs(cache.getlines(fn), lines)
+
+    def test_changed_file(self):
+        import os
+        cache = self._makeOne()
+        fn = self._makeFile('a.zcml', 'a\nb\n')
+        cache.getlines(fn)
+        self._makeFile('a.zcml', 'c\nd\n')
+        st = os.stat(fn)
+        os.utime(fn, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(cache.getlines(fn), ['c\n', 'd\n'])
+
+    def test_missing_file(self):
+        import os
+        cache = self._makeOne()
+        self.assertRaises(OSError, cache.getlines,
+                          os.path.join(self.tmpdir, 'nonesuch.zcml'))
+
+    def test_bounded(self):
+        cache = self._makeOne(maxsize=2)
+        a = self._makeFile('a.zcml', 'a\n')
+        b = self._makeFile('b.zcml', 'b\n')
+        c = self._makeFile('c.zcml', 'c\n')
+        lines_a = cache.getlines(a)
+        cache.getlines(b)
+        self.assertIs(cache.getlines(a), lines_a)
+        cache.getlines(c)
+        # b was least recently used
+        self.assertEqual(sorted(cache._files), sorted([a, c]))
+
 
 class ConfigurationHandlerTests(unittest.TestCase):
 
@@ -365,6 +473,41 @@ class ConfigurationHandlerTests(unittest.TestCase):
         self.assertEqual(str(exc.exception.args[0]),
                          "Invalid ZCML condition: 'nonesuch'")
 
+    def test_evaluateCondition_compiled_once(self):
+        from zope.configuration.xmlconfig import _compileCondition
+        condition = _compileCondition('not-installed  a.b')
+        self.assertIs(_compileCondition('not-installed  a.b'), condition)
+        self.assertEqual((condition.verb, condition.name, condition.negated),
+                         ('installed', 'a.b', True))
+
+    def test_evaluateCondition_memoized_per_machine(self):
+        import os
+
+        from zope.configuration.config import ConfigurationMachine
+        envvar = 'ZOPE_CONFIGURATION_TEST_CONDITION'
+        context = ConfigurationMachine()
+        handler = self._makeOne(context)
+        os.environ[envvar] = '1'
+        try:
+            self.assertTrue(handler.evaluateCondition('envvar ' + envvar))
+            del os.environ[envvar]
+            self.assertTrue(handler.evaluateCondition('envvar ' + envvar))
+            self.assertFalse(
+                handler.evaluateCondition('not-envvar ' + envvar))
+        finally:
+            os.environ.pop(envvar, None)
+        self.assertFalse(handler.evaluateCondition('have feature'))
+        context.provideFeature('feature')
+        self.assertTrue(handler.evaluateCondition('have feature'))
+        self.assertEqual(context._consulted_conditions,
+                         {'envvar ' + envvar: True,
+                          'not-envvar ' + envvar: False,
+                          'have feature': True})
+        self.assertEqual(context._consulted_environ, {envvar: '1'})
+        # Another machine sees the current environment
+        self.assertFalse(self._makeOne(ConfigurationMachine())
+                         .evaluateCondition('envvar ' + envvar))
+
     def test_endElementNS_normal(self):
         class Info:
             _line = _col = None
@@ -428,6 +571,99 @@ class Test_processxmlfile(unittest.TestCase):
         self.assertEqual(data.package, None)
         self.assertEqual(data.basepath, None)
 
+    def test_w_unknown_parser(self):
+        from io import StringIO
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.exceptions import ConfigurationError
+
+        context = ConfigurationMachine()
+        context.xml_parser = 'nonesuch'
+        self.assertRaises(ConfigurationError,
+                          self._callFUT, StringIO('<configure/>'), context)
+
+
+class Test_processxmlfile_w_expat(unittest.TestCase):
+
+    def _callFUT(self, *args, **kw):
+        from zope.configuration.xmlconfig import processxmlfile
+        return processxmlfile(*args, **kw)
+
+    def _makeContext(self, xml_parser='expat'):
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.xmlconfig import registerCommonDirectives
+
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        context.xml_parser = xml_parser
+        return context
+
+    def _summarize(self, actions):
+        return [(action['discriminator'], str(action['info']),
+                 action['info'].text, action['includepath'])
+                for action in actions]
+
+    def test_w_empty_xml(self):
+        from io import StringIO
+
+        from zope.configuration.xmlconfig import ZopeSAXParseException
+
+        with self.assertRaises(ZopeSAXParseException) as exc:
+            self._callFUT(StringIO(), self._makeContext())
+        self.assertEqual(str(exc.exception.evalue),
+                         '<string>:1:0: no element found')
+
+    def test_w_malformed_xml(self):
+        from io import StringIO
+
+        from zope.configuration.xmlconfig import ZopeSAXParseException
+
+        with self.assertRaises(ZopeSAXParseException) as exc:
+            self._callFUT(StringIO('<configure>\n  </include>'),
+                          self._makeContext())
+        self.assertEqual(str(exc.exception.evalue),
+                         '<string>:2:4: mismatched tag')
+
+    def test_closes_file(self):
+        from io import StringIO
+
+        from zope.configuration.xmlconfig import ZopeSAXParseException
+
+        for xml_parser in 'sax', 'expat':
+            f = StringIO('<configure xmlns="http://namespaces.zope.org/zope"'
+                         ' />')
+            self._callFUT(f, self._makeContext(xml_parser))
+            self.assertTrue(f.closed, xml_parser)
+            f = StringIO('<configure>')
+            with self.assertRaises(ZopeSAXParseException):
+                self._callFUT(f, self._makeContext(xml_parser))
+            self.assertTrue(f.closed, xml_parser)
+
+    def test_same_actions_as_sax(self):
+        from zope.configuration.tests.samplepackage import foo
+        from zope.configuration.xmlconfig import include
+
+        results = []
+        for xml_parser in 'sax', 'expat':
+            context = self._makeContext(xml_parser)
+            include(context, path("samplepackage", "configure.zcml"))
+            results.append(self._summarize(context.actions))
+            context.execute_actions()
+            data = foo.data.pop()
+            self.assertEqual(data.args, (('x', (b'blah')), ('y', 0)))
+        self.assertEqual(results[0], results[1])
+
+    def test_conditions_and_text(self):
+        from zope.configuration import tests
+        from zope.configuration.xmlconfig import file
+
+        results = []
+        for xml_parser in 'sax', 'expat':
+            context = self._makeContext(xml_parser)
+            file('conditions.zcml', tests, context=context, execute=False)
+            results.append(self._summarize(context.actions))
+        self.assertEqual(results[0], results[1])
+
 
 class Test_openInOrPlain(unittest.TestCase):
 
@@ -458,6 +694,49 @@ class Test_openInOrPlain(unittest.TestCase):
         self.assertEqual(exc.exception.errno, errno.ENOENT)
 
 
+class Test_scanInstalled(unittest.TestCase):
+
+    def _callFUT(self, *args, **kw):
+        from zope.configuration.xmlconfig import scanInstalled
+        return scanInstalled(*args, **kw)
+
+    def test_conditions_in_files(self):
+        import os
+        import shutil
+        import tempfile
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.xmlconfig import registerCommonDirectives
+        from zope.configuration.xmlconfig import string
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'site.zcml')
+            with open(path, 'w') as f:
+                f.write("""\
+<configure xmlns="http://namespaces.zope.org/zope"
+           xmlns:zcml="http://namespaces.zope.org/zcml">
+  <configure zcml:condition="installed zope.interface" />
+  <configure zcml:condition = 'not-installed  nonesuch.package' />
+  <configure zcml:condition="have installed" />
+</configure>
+""")
+            context = ConfigurationMachine()
+            registerCommonDirectives(context)
+            self._callFUT(context, [path])
+            self.assertEqual(context._installed,
+                             {'zope.interface': True,
+                              'nonesuch.package': False})
+            self.assertEqual(context._consulted_installed, {})
+            context._installed['nonesuch.package'] = True
+            with open(path) as f:
+                string(f.read(), context=context)
+            self.assertEqual(context._consulted_installed,
+                             {'zope.interface': True,
+                              'nonesuch.package': True})
+        finally:
+            shutil.rmtree(tmpdir)
+
+
 class Test_include(unittest.TestCase):
 
     def _callFUT(self, *args, **kw):
@@ -584,6 +863,42 @@ class Test_include(unittest.TestCase):
         self.assertIn(fqn2, context._seen_files)
         self.assertIn(fqn3, context._seen_files)
 
+    def test_failure_finishes_open_directives_and_files(self):
+        import os
+        import shutil
+        import tempfile
+
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.exceptions import ConfigurationError
+        from zope.configuration.profiling import Profiler
+        from zope.configuration.xmlconfig import registerCommonDirectives
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        for name, body in (('site.zcml', '<include file="a.zcml" />'),
+                           ('a.zcml', '<configure><nonesuch /></configure>')):
+            with open(os.path.join(tmpdir, name), 'w') as f:
+                f.write('<configure xmlns="http://namespaces.zope.org/zope">'
+                        '%s</configure>' % body)
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        context.profiler = Profiler()
+        before_stack = context.stack[:]
+        events = []
+        for event in ('directiveStarted', 'directiveFinished',
+                      'includeStarted', 'includeFinished'):
+            context.subscribe(
+                event, lambda *args, event=event: events.append(event))
+        with self.assertRaises(ConfigurationError):
+            self._callFUT(context, os.path.join(tmpdir, 'site.zcml'))
+        self.assertEqual(events, [
+            'includeStarted', 'directiveStarted', 'directiveStarted',
+            'includeStarted', 'directiveStarted', 'directiveStarted',
+            'directiveStarted', 'directiveFinished', 'directiveFinished',
+            'directiveFinished', 'includeFinished', 'directiveFinished',
+            'directiveFinished', 'includeFinished'])
+        self.assertEqual(context.stack, before_stack)
+        self.assertEqual(context.profiler._stack, [])
+
 
 class Test_exclude(unittest.TestCase):
 
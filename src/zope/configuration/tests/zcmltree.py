@@ -0,0 +1,81 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Trees of configuration files written for tests
+"""
+import os
+import shutil
+import tempfile
+
+
+def feature(name, include=''):
+    """Return a configuration file providing the feature *name*.
+    """
+    return """\
+<configure xmlns="http://namespaces.zope.org/zope"
+           xmlns:meta="http://namespaces.zope.org/meta">
+  <meta:provides feature="%s" />
+  %s
+</configure>
+""" % (name, include)
+
+
+class ZCMLTreeBase:
+    """Mixin writing the ``files`` mapping to a temporary directory.
+
+    The keys are paths relative to the directory, using ``/``.
+    """
+
+    files = {}
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        for name, text in self.files.items():
+            self._write(name, text)
+
+    def tearDown(self):
+        from zope.configuration.tests.samplepackage import foo
+        shutil.rmtree(self.tmpdir)
+        del foo.data[:]
+
+    def _path(self, *names):
+        return os.path.join(self.tmpdir, *names)
+
+    def _write(self, name, text):
+        path = self._path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def _makeContext(self, **attrs):
+        from zope.configuration.config import ConfigurationMachine
+        from zope.configuration.xmlconfig import registerCommonDirectives
+        context = ConfigurationMachine()
+        registerCommonDirectives(context)
+        for name, value in attrs.items():
+            setattr(context, name, value)
+        return context
+
+    def _load(self, name='site.zcml', **attrs):
+        """Include *name* into a new machine with *attrs*, unexecuted.
+        """
+        from zope.configuration.xmlconfig import file
+        context = self._makeContext(**attrs)
+        file(self._path(name), context=context, execute=False)
+        return context
+
+    def _summarize(self, context):
+        return (sorted(context._features),
+                [(action['discriminator'], repr(action['info']),
+                  action['includepath'])
+                 for action in context.actions])
@@ -0,0 +1,172 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Importing referenced modules in the background
+
+Configuration files name many globals through
+:class:`~zope.configuration.fields.GlobalObject` fields. An
+:class:`ImportWarmer` set as the ``import_warmer`` of a configuration
+machine is told about each of these names while the files are
+processed, and imports the modules in a pool of threads. This is most
+useful together with lazy globals (see
+:attr:`~zope.configuration.config.ConfigurationMachine.lazy_globals`),
+where parsing continues while the modules are imported.
+
+The warmer can record the modules in a manifest file. On later
+startups, the modules listed in the manifest are imported as soon as
+the warmer is created, before any file is parsed::
+
+    from zope.configuration.config import ConfigurationMachine
+    from zope.configuration.warmup import ImportWarmer
+    from zope.configuration.xmlconfig import file
+    from zope.configuration.xmlconfig import registerCommonDirectives
+
+    context = ConfigurationMachine()
+    registerCommonDirectives(context)
+    with ImportWarmer(manifest='/var/cache/myapp/imports.txt') as warmer:
+        context.import_warmer = warmer
+        file('site.zcml', context=context)
+        warmer.save()
+
+Errors raised while importing in the background are ignored; the
+import is tried again, and the error reported, when the global is
+resolved.
+
+.. versionadded:: 6.1
+"""
+import importlib
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+
+from zope.configuration.config import _absoluteName
+
+
+__all__ = [
+    'ImportWarmer',
+]
+
+
+def _import(name):
+    # Import the module that the global *name* is found in.
+    names = name.split('.')
+    for end in range(len(names), 0, -1):
+        try:
+            importlib.import_module('.'.join(names[:end]))
+        except ImportError:
+            continue
+        except Exception:
+            # The module is broken. Leave it to the configuration to
+            # report that.
+            return
+        return
+
+
+def _moduleName(name):
+    # Return the longest imported module prefix of *name*.
+    names = name.split('.')
+    for end in range(len(names), 0, -1):
+        mname = '.'.join(names[:end])
+        if mname in sys.modules:
+            return mname
+    return None
+
+
+class ImportWarmer:
+    """
+    Import the modules of referenced globals in a pool of threads.
+
+    *max_workers* is the number of threads. If *manifest* names an
+    existing file, the modules listed in it are imported immediately;
+    :meth:`save` writes the modules imported by the current
+    configuration to it.
+    """
+
+    def __init__(self, max_workers=None, manifest=None):
+        self.manifest = manifest
+        self.executor = ThreadPoolExecutor(max_workers)
+        self.names = set()
+        self._futures = []
+        self._lock = threading.Lock()
+        if manifest is not None:
+            try:
+                with open(manifest) as f:
+                    names = f.read().split()
+            except FileNotFoundError:
+                names = ()
+            for name in names:
+                self._submit(name)
+
+    def _submit(self, name):
+        with self._lock:
+            if name in self.names:
+                return
+            self.names.add(name)
+            mname, _, oname = name.rpartition('.')
+            if name in sys.modules or hasattr(sys.modules.get(mname), oname):
+                # Already imported
+                return
+            self._futures.append(self.executor.submit(_import, name))
+
+    def add(self, name, package=None):
+        """
+        Start importing the module of the global *name*.
+
+        Relative names are resolved against *package*.
+        """
+        if name.startswith('.'):
+            if package is None or name == '.':
+                return
+            try:
+                name = _absoluteName(package.__name__, name)
+            except Exception:
+                # Invalid names are reported by the configuration
+                return
+        self._submit(name)
+
+    def wait(self):
+        """
+        Wait until the imports started so far are done.
+        """
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+
+    def save(self, manifest=None):
+        """
+        Write the imported modules to *manifest*, by default the
+        manifest the warmer was created with.
+        """
+        manifest = manifest or self.manifest
+        self.wait()
+        with self._lock:
+            modules = {_moduleName(name) for name in self.names}
+        modules.discard(None)
+        tmp = '%s.%d.tmp' % (manifest, os.getpid())
+        with open(tmp, 'w') as f:
+            f.writelines(name + '\n' for name in sorted(modules))
+        os.replace(tmp, manifest)
+
+    def close(self):
+        """
+        Wait for the imports and shut down the threads.
+        """
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
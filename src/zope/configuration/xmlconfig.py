@@ -20,11 +20,16 @@ test_includeOverrides in tests/test_xmlconfig.py
 __docformat__ = 'restructuredtext'
 
 import errno
+import functools
 import io
 import logging
 import os
+import re
 import sys
+import threading
+from collections import OrderedDict
 from glob import glob
+from xml.parsers import expat
 from xml.sax import SAXParseException
 from xml.sax import make_parser
 from xml.sax.handler import ContentHandler
@@ -34,9 +39,12 @@ from xml.sax.xmlreader import InputSource
 from zope.interface import Interface
 from zope.schema import NativeStringLine
 
+from zope.configuration.cache import EventRecorder
+from zope.configuration.cache import replay
 from zope.configuration.config import ConfigurationMachine
 from zope.configuration.config import GroupingContextDecorator
 from zope.configuration.config import GroupingStackItem
+from zope.configuration.config import _isInstalled
 from zope.configuration.config import defineGroupingDirective
 from zope.configuration.config import defineSimpleDirective
 from zope.configuration.config import resolveConflicts
@@ -52,6 +60,7 @@ __all__ = [
     'ConfigurationHandler',
     'processxmlfile',
     'openInOrPlain',
+    'scanInstalled',
     'IInclude',
     'include',
     'exclude',
@@ -104,6 +113,58 @@ class ZopeSAXParseException(ConfigurationWrapperError):
     """
 
 
+class _SourceLines:
+    """
+    A bounded, least recently used cache of the lines of source files.
+
+    Rendering many infos from the same file (for example, in a conflict
+    error) then reads the file only once. Entries are validated against
+    the modification time and size of the file.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+
+    def getlines(self, file):
+        """
+        Return the lines of *file*.
+
+        :raises OSError: If the file can't be read.
+        """
+        st = os.stat(file)
+        stamp = st.st_mtime_ns, st.st_size
+        with self._lock:
+            entry = self._files.get(file)
+            if entry is not None and entry[0] == stamp:
+                self._files.move_to_end(file)
+                return entry[1]
+
+        with open(file) as f:
+            lines = f.readlines()
+
+        with self._lock:
+            self._files[file] = stamp, lines
+            self._files.move_to_end(file)
+            while len(self._files) > self.maxsize:
+                self._files.popitem(last=False)
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+
+
+_source_lines = _SourceLines()
+
+
+def _interned(file):
+    # Infos for the same file share one file name string, no matter how
+    # often the file is included.
+    return sys.intern(file) if type(file) is str else file
+
+
 class ParserInfo:
     r"""
     Information about a directive based on parser data
@@ -140,15 +201,30 @@ class ParserInfo:
             </directives>
           </configure>
     """
-    text = ''
+    # There is one info per directive, and actions keep them alive, so
+    # keep them small.
+    __slots__ = ('file', 'line', 'column', 'eline', 'ecolumn', 'text')
 
     def __init__(self, file, line, column):
-        self.file, self.line, self.column = file, line, column
-        self.eline, self.ecolumn = line, column
+        self.file = _interned(file)
+        self.line, self.column = line, column
+        self.eline, self.ecolumn = self.line, self.column
+        self.text = ''
 
     def end(self, line, column):
         self.eline, self.ecolumn = line, column
 
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        # This also accepts the instance dictionaries of infos pickled
+        # before they had slots.
+        self.text = state.get('text', '')
+        for name in ('line', 'column', 'eline', 'ecolumn'):
+            setattr(self, name, state[name])
+        self.file = _interned(state['file'])
+
     def __repr__(self):
         if (self.line, self.column) == (self.eline, self.ecolumn):
             return 'File "{}", line {}.{}'.format(
@@ -169,8 +245,7 @@ class ParserInfo:
                                 'tests', 'sample.zcml')
 
         try:
-            with open(file) as f:
-                lines = f.readlines()[self.line - 1:self.eline]
+            lines = _source_lines.getlines(file)[self.line - 1:self.eline]
         except OSError:
             src = "  Could not read source."
         else:
@@ -208,6 +283,74 @@ class ParserInfo:
         self.text += characters
 
 
+class _Condition:
+    # A compiled ZCML condition, called with the configuration context
+    # to evaluate it.
+
+    __slots__ = ('verb', 'name', 'negated', 'key')
+
+    def __init__(self, verb, name, negated):
+        self.verb = verb
+        self.name = name
+        self.negated = negated
+        self.key = (verb, name)
+
+    def __call__(self, context):
+        if self.verb == 'have':
+            result = context.hasFeature(self.name)
+        else:
+            # Only features change while a configuration is processed,
+            # so other answers can be remembered.
+            memo = getattr(context, '_conditions', None)
+            result = memo.get(self.key) if memo is not None else None
+            if result is None:
+                if self.verb == 'installed':
+                    result = getattr(context, 'isInstalled', _isInstalled)(
+                        self.name)
+                else:
+                    result = context.hasEnvironmentVariable(self.name)
+                result = bool(result)
+                if memo is not None:
+                    memo[self.key] = result
+        return result != self.negated
+
+
+@functools.lru_cache(maxsize=None)
+def _compileCondition(expression):
+    # Parse and check a ZCML condition once.
+    arguments = expression.split(None)
+    verb = arguments.pop(0)
+
+    if verb in ('have', 'not-have'):
+        if not arguments:
+            raise ValueError("Feature name missing: %r" % expression)
+        if len(arguments) > 1:
+            raise ValueError("Only one feature allowed: %r" % expression)
+
+    elif verb in ('installed', 'not-installed'):
+        if not arguments:
+            raise ValueError("Package name missing: %r" % expression)
+        if len(arguments) > 1:
+            raise ValueError("Only one package allowed: %r" % expression)
+
+    elif verb in ('envvar', 'not-envvar'):
+        if not arguments:
+            raise ValueError(
+                "Environment variable name missing: %r" % expression
+            )
+        if len(arguments) > 1:
+            raise ValueError(
+                "Only one environment variable name allowed: %r"
+                % expression
+            )
+
+    else:
+        raise ValueError("Invalid ZCML condition: %r" % expression)
+
+    negated = verb.startswith('not-')
+    return _Condition(verb[4:] if negated else verb, arguments[0], negated)
+
+
 class ConfigurationHandler(ContentHandler):
     """
     Interface to the XML parser
@@ -220,11 +363,16 @@ class ConfigurationHandler(ContentHandler):
         self.context = context
         self.testing = testing
         self.ignore_depth = 0
+        self._consulted_conditions = getattr(
+            context, '_consulted_conditions', None)
 
     def setDocumentLocator(self, locator):
         self.locator = locator
 
     def characters(self, text):
+        if self.ignore_depth:
+            # Text in ignored elements belongs to no directive
+            return
         self.context.getInfo().characters(text)
 
     def _handle_exception(self, ex, info):
@@ -280,6 +428,14 @@ class ConfigurationHandler(ContentHandler):
         Currently the supported verbs are ``have``, ``not-have``,
         ``installed``, ``not-installed``, ``envvar`` and ``not-envvar``.
 
+        Each distinct expression is parsed and checked only once. The
+        results are recorded in the context's ``_consulted_conditions``.
+        A configuration machine also remembers the results of the
+        ``installed`` and ``envvar`` conditions, so that all of its
+        configuration sees the same answers; ``have`` conditions are
+        always evaluated, as features are provided while the
+        configuration is processed.
+
         The ``have`` and ``not-have`` verbs each take one argument:
         the name of a feature:
 
@@ -317,8 +473,9 @@ class ConfigurationHandler(ContentHandler):
         The ``installed`` and ``not-installed`` verbs each take one
         argument: the dotted name of a pacakge.
 
-        If the pacakge is found, in other words, can be imported, then
-        the condition will return true / false:
+        If the pacakge is found by :func:`importlib.util.find_spec`
+        (without executing it), then the condition will return true /
+        false. The answer is remembered by the configuration context:
 
             >>> context = ConfigurationContext()
             >>> c = ConfigurationHandler(context, testing=True)
@@ -381,55 +538,10 @@ class ConfigurationHandler(ContentHandler):
             ValueError: Environment variable name missing: 'envvar'
 
         """
-        arguments = expression.split(None)
-        verb = arguments.pop(0)
-
-        if verb in ('have', 'not-have'):
-            if not arguments:
-                raise ValueError("Feature name missing: %r" % expression)
-            if len(arguments) > 1:
-                raise ValueError("Only one feature allowed: %r" % expression)
-
-            if verb == 'have':
-                return self.context.hasFeature(arguments[0])
-            elif verb == 'not-have':
-                return not self.context.hasFeature(arguments[0])
-
-        elif verb in ('installed', 'not-installed'):
-            if not arguments:
-                raise ValueError("Package name missing: %r" % expression)
-            if len(arguments) > 1:
-                raise ValueError("Only one package allowed: %r" % expression)
-
-            try:
-                __import__(arguments[0])
-                installed = True
-            except ImportError:
-                installed = False
-
-            if verb == 'installed':
-                return installed
-            elif verb == 'not-installed':
-                return not installed
-
-        elif verb in ('envvar', 'not-envvar'):
-            if not arguments:
-                raise ValueError(
-                    "Environment variable name missing: %r" % expression
-                )
-            if len(arguments) > 1:
-                raise ValueError(
-                    "Only one environment variable name allowed: %r"
-                    % expression
-                )
-
-            if verb == 'envvar':
-                return self.context.hasEnvironmentVariable(arguments[0])
-            elif verb == 'not-envvar':
-                return not self.context.hasEnvironmentVariable(arguments[0])
-
-        else:
-            raise ValueError("Invalid ZCML condition: %r" % expression)
+        result = _compileCondition(expression)(self.context)
+        if self._consulted_conditions is not None:
+            self._consulted_conditions[expression] = result
+        return result
 
     def endElementNS(self, name, qname):
         # If ignore_depth is set, this element will be ignored, even
@@ -453,12 +565,47 @@ class ConfigurationHandler(ContentHandler):
 def processxmlfile(file, context, testing=False):
     """Process a configuration file
 
+    If the context has a ``parse_cache`` (see
+    :mod:`zope.configuration.cache`), previously recorded parser
+    events are replayed instead of parsing the file, and files that
+    had to be parsed are recorded.
+
     See examples in tests/test_xmlconfig.py
     """
+    handler = ConfigurationHandler(context, testing=testing)
+    parser = getattr(context, 'xml_parser', 'sax')
+    try:
+        parse = _parsers[parser]
+    except KeyError:
+        raise ConfigurationError("Unknown XML parser", parser)
+
+    depth = len(context.stack)
+    try:
+        cache = getattr(context, 'parse_cache', None)
+        fingerprint = cache.fingerprint(file) if cache is not None else None
+        if fingerprint is None:
+            parse(file, handler)
+            return
+
+        events = cache.load(fingerprint)
+        if events is not None:
+            replay(events, handler, getattr(file, 'name', '<string>'))
+            return
+
+        recorder = EventRecorder(handler)
+        parse(file, recorder)
+        cache.store(fingerprint, recorder.events)
+    except BaseException:
+        # The directives enclosing the failed one never see their end.
+        context._abandon(depth)
+        raise
+
+
+def _saxparse(file, handler):
     src = InputSource(getattr(file, 'name', '<string>'))
     src.setByteStream(file)
     parser = make_parser()
-    parser.setContentHandler(ConfigurationHandler(context, testing=testing))
+    parser.setContentHandler(handler)
     parser.setFeature(feature_namespaces, True)
     try:
         parser.parse(src)
@@ -466,6 +613,79 @@ def processxmlfile(file, context, testing=False):
         raise ZopeSAXParseException(file, sys.exc_info()[1])
 
 
+# Maps the names reported by expat ("namespace name") to the
+# (namespace, name) pairs used by the SAX interface. ZCML uses a small
+# vocabulary of names, so this and the intern table of the parsers are
+# shared by all parses.
+_expat_names = {}
+_expat_intern = {}
+
+
+def _expatname(name):
+    try:
+        return _expat_names[name]
+    except KeyError:
+        ns, sep, local = name.rpartition(' ')
+        pair = _expat_names[name] = (ns, local) if sep else (None, local)
+        return pair
+
+
+class _ExpatLocator:
+    """Locator reporting the current position of an expat parser."""
+
+    def __init__(self, parser, systemId):
+        self._parser = parser
+        self._systemId = systemId
+
+    def getSystemId(self):
+        return self._systemId
+
+    def getLineNumber(self):
+        return self._parser.CurrentLineNumber
+
+    def getColumnNumber(self):
+        return self._parser.CurrentColumnNumber
+
+
+def _expatparse(file, handler):
+    # Drive the handler straight from pyexpat callbacks, avoiding the
+    # SAX reader, its attribute wrappers and locator indirection.
+    parser = expat.ParserCreate(namespace_separator=' ',
+                                intern=_expat_intern)
+    parser.buffer_text = True
+    locator = _ExpatLocator(parser, getattr(file, 'name', '<string>'))
+    handler.setDocumentLocator(locator)
+
+    startElementNS = handler.startElementNS
+    endElementNS = handler.endElementNS
+
+    def start(name, attrs):
+        startElementNS(
+            _expatname(name), None,
+            {_expatname(aname): value for aname, value in attrs.items()})
+
+    def end(name):
+        endElementNS(_expatname(name), None)
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = handler.characters
+    try:
+        parser.Parse(file.read(), True)
+    except expat.ExpatError as e:
+        raise ZopeSAXParseException(
+            file, SAXParseException(expat.ErrorString(e.code), e, locator))
+    finally:
+        # Like the SAX reader, which closes the byte stream it read.
+        file.close()
+
+
+_parsers = {
+    'sax': _saxparse,
+    'expat': _expatparse,
+}
+
+
 def openInOrPlain(filename):
     """
     Open a file, falling back to filename.in.
@@ -527,6 +747,33 @@ def openInOrPlain(filename):
         raise
 
 
+# The packages named by ``installed`` and ``not-installed`` conditions
+_INSTALLED_CONDITION = re.compile(
+    r"""condition\s*=\s*["']\s*(?:not-)?installed\s+([^\s"']+)""")
+
+
+def scanInstalled(context, files):
+    """
+    Find out whether the packages named by the ``installed`` and
+    ``not-installed`` conditions in *files* are installed at once.
+
+    The files are searched for the conditions without parsing them,
+    and the packages are looked up with
+    :meth:`~zope.configuration.config.ConfigurationContext.scanInstalled`,
+    listing each directory of :data:`sys.path` only once. The answers
+    are remembered by *context* for when the conditions are evaluated.
+
+    .. versionadded:: 6.1
+    """
+    access = getattr(context, 'file_access', None)
+    names = set()
+    for filename in files:
+        with (access.open(filename) if access is not None
+              else openInOrPlain(filename)) as f:
+            names.update(_INSTALLED_CONDITION.findall(f.read()))
+    context.scanInstalled(sorted(names))
+
+
 class IInclude(Interface):
     """The `include`, `includeOverrides` and `exclude`
     directives.
@@ -578,6 +825,18 @@ class IInclude(Interface):
     )
 
 
+def _glob(context, pattern):
+    # Return the paths matching pattern, sorted without regard to case.
+    access = getattr(context, 'file_access', None)
+    paths = access.glob(pattern) if access is not None else glob(pattern)
+    paths = sorted(zip([path.lower() for path in paths], paths))
+    paths = [path for (l, path) in paths]
+    consulted = getattr(context, '_consulted_patterns', None)
+    if consulted is not None:
+        consulted[pattern] = paths
+    return paths
+
+
 def include(_context, file=None, package=None, files=None):
     """Include a zcml file
     """
@@ -596,24 +855,31 @@ def include(_context, file=None, package=None, files=None):
         context.basepath = None
 
     if files:
-        paths = glob(context.path(files))
-        paths = sorted(zip([path.lower() for path in paths], paths))
-        paths = [path for (l, path) in paths]
+        paths = _glob(context, context.path(files))
     else:
         paths = [context.path(file)]
 
+    access = getattr(context, 'file_access', None)
     for path in paths:
         if context.processFile(path):
-            with openInOrPlain(path) as f:
+            with (access.open(path) if access is not None
+                  else openInOrPlain(path)) as f:
                 logger.debug("include %s", f.name)
 
                 context.basepath = os.path.dirname(path)
                 context.includepath = _context.includepath + (f.name, )
                 _context.stack.append(GroupingStackItem(context))
 
-                processxmlfile(f, context)
-            assert _context.stack[-1].context is context
-            _context.stack.pop()
+                subscribers = getattr(_context, '_subscribers', None)
+                if subscribers:
+                    _context.notify('includeStarted', f.name)
+                try:
+                    processxmlfile(f, context)
+                finally:
+                    if subscribers:
+                        _context.notify('includeFinished', f.name)
+                    assert _context.stack[-1].context is context
+                    _context.stack.pop()
 
 
 def exclude(_context, file=None, package=None, files=None):
@@ -635,9 +901,7 @@ def exclude(_context, file=None, package=None, files=None):
         context.basepath = None
 
     if files:
-        paths = glob(context.path(files))
-        paths = sorted(zip([path.lower() for path in paths], paths))
-        paths = [path for (l, path) in paths]
+        paths = _glob(context, context.path(files))
     else:
         paths = [context.path(file)]
 
@@ -677,10 +941,15 @@ def includeOverrides(_context, file=None, package=None, files=None):
     newactions = []
 
     for action in resolveConflicts(_context.actions[nactions:]):
-        action['includepath'] = includepath
+        action.includepath = includepath
         newactions.append(action)
 
+    index = getattr(_context, 'conflict_index', None)
+    if index is not None:
+        index.truncate(nactions)
     _context.actions[nactions:] = newactions
+    if index is not None:
+        index.update(_context.actions, includepath)
 
 
 def registerCommonDirectives(context):
@@ -705,8 +974,24 @@ def registerCommonDirectives(context):
     )
 
 
-def file(name, package=None, context=None, execute=True):
+def file(name, package=None, context=None, execute=True, snapshot=None,
+         bundle=None):
     """Execute a zcml file
+
+    If *snapshot* is the path of a snapshot file (see
+    :mod:`zope.configuration.snapshot`) that is still valid, the
+    resolved actions are loaded from it instead of processing the
+    file. Otherwise, the file is processed and the snapshot is
+    written. A context loaded from a snapshot doesn't know about the
+    directives defined by the configuration, so it can't be used to
+    process more configuration that uses them.
+
+    If *bundle* is the path of a bundle (see
+    :mod:`zope.configuration.bundle`), the included files are read
+    from it.
+
+    .. versionchanged:: 6.1
+       Add the *snapshot* and *bundle* arguments.
     """
 
     if context is None:
@@ -714,9 +999,37 @@ def file(name, package=None, context=None, execute=True):
         registerCommonDirectives(context)
         context.package = package
 
-    include(context, name, package)
+    if bundle is not None:
+        from zope.configuration.bundle import Bundle
+
+        file_access = context.file_access
+        with Bundle(bundle) as context.file_access:
+            try:
+                return file(name, package, context, execute, snapshot)
+            finally:
+                context.file_access = file_access
+
+    if snapshot is None:
+        include(context, name, package)
+        if execute:
+            context.execute_actions()
+        return context
+
+    from zope.configuration.snapshot import loadSnapshot
+    from zope.configuration.snapshot import saveSnapshot
+
+    actions = loadSnapshot(snapshot, context, name, package)
+    if actions is None:
+        features = set(context._features)
+        include(context, name, package)
+        actions = saveSnapshot(snapshot, context, name, package, features)
+
+    # The actions are already resolved.
     if execute:
-        context.execute_actions()
+        del context.actions[:]
+        context._execute(actions)
+    else:
+        context.actions[:] = actions
 
     return context
 